@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import glob
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+EVENT_SUFFIXES = {".json", ".jsonl", ".csv"}
+INDEX_NAME = "batch_index.json"
+
+
+def discover_event_files(spec: str) -> List[Path]:
+    """
+    Directory -> its event files (non-recursive); anything else is treated as a glob.
+    """
+    p = Path(spec)
+    if p.is_dir():
+        cands = [c for c in p.iterdir() if c.is_file()]
+    else:
+        cands = [Path(c) for c in glob.glob(spec, recursive=True)]
+    return sorted(c for c in cands if c.suffix.lower() in EVENT_SUFFIXES and c.is_file())
+
+
+def _match_names(paths: List[Path]) -> List[str]:
+    # one output dir per match; disambiguate equal stems from different folders, never
+    # reusing a name already taken (a suffixed name can equal another file's stem)
+    used: set = set()
+    nxt: Dict[str, int] = {}
+    names = []
+    for p in paths:
+        name = p.stem
+        while name in used:
+            nxt[p.stem] = n = nxt.get(p.stem, 0) + 1
+            name = f"{p.stem}__{n}"
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def _init_worker() -> None:
+    # warm the per-process artifact caches once; every match in this worker reuses them
+    from hp_motor.config_reader import read_spec
+    from hp_motor.library import library_health, load_registry_index
+    from hp_motor.library.loader import _vendor_mappings
+
+    read_spec()
+    load_registry_index()
+    _vendor_mappings()
+    library_health()
+
+
+def _run_one(events_path: str, report_path: str, vendor: str) -> Dict[str, Any]:
+    from hp_motor.pipeline_single import run_pipeline
+
+    t0 = time.perf_counter()
+    rec: Dict[str, Any] = {"events_path": events_path, "report_path": report_path}
+    try:
+        report = run_pipeline(Path(events_path), vendor=vendor)
+        out = Path(report_path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        rec.update(
+            {
+                "status": "OK",
+                "popper_status": report.get("popper", {}).get("status"),
+                "events_summary": report.get("events_summary", {}),
+            }
+        )
+    except Exception as e:
+        rec.update(
+            {
+                "status": "FAILED",
+                "report_path": None,
+                "error": f"{type(e).__name__}: {e}",
+                "traceback": traceback.format_exc(limit=5),
+            }
+        )
+    rec["elapsed_sec"] = round(time.perf_counter() - t0, 4)
+    return rec
+
+
+def run_batch(
+    events: str,
+    out_dir: Path,
+    vendor: str = "generic",
+    workers: Optional[int] = None,
+) -> Tuple[Dict[str, Any], Path]:
+    """
+    Run the single-match pipeline for every event file matched by `events`.
+    Writes <out_dir>/<match>/hp_report.json per match and <out_dir>/batch_index.json.
+    A failing match is recorded in the index; the rest of the batch still runs.
+    """
+    paths = discover_event_files(events)
+    names = _match_names(paths)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    workers = max(1, int(workers or os.cpu_count() or 1))
+
+    jobs = [
+        (name, str(p), str(out_dir / name / "hp_report.json"))
+        for name, p in zip(names, paths)
+    ]
+    results: Dict[str, Dict[str, Any]] = {}
+    t0 = time.perf_counter()
+
+    if workers == 1 or len(jobs) <= 1:
+        _init_worker()
+        for name, ep, rp in jobs:
+            results[name] = _run_one(ep, rp, vendor)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_init_worker) as ex:
+            futs = {ex.submit(_run_one, ep, rp, vendor): (name, ep) for name, ep, rp in jobs}
+            for fut in as_completed(futs):
+                name, ep = futs[fut]
+                try:
+                    results[name] = fut.result()
+                except Exception as e:  # worker crashed / result not transferable
+                    results[name] = {
+                        "events_path": ep,
+                        "report_path": None,
+                        "status": "FAILED",
+                        "error": f"{type(e).__name__}: {e}",
+                    }
+
+    matches = []
+    for name, _, _ in jobs:
+        matches.append({"match": name, **results[name]})
+
+    n_failed = sum(1 for m in matches if m["status"] != "OK")
+    index = {
+        "run_ts": datetime.now(timezone.utc).isoformat(),
+        "events": events,
+        "vendor_key": vendor,
+        "workers": workers,
+        "n_matches": len(matches),
+        "n_ok": len(matches) - n_failed,
+        "n_failed": n_failed,
+        "elapsed_sec": round(time.perf_counter() - t0, 4),
+        "matches": matches,
+    }
+    index_path = out_dir / INDEX_NAME
+    index_path.write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
+    return index, index_path
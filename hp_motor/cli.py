@@ -4,9 +4,15 @@ import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
-from hp_motor.pipeline.run_pipeline import run as run_pipeline
-from hp_motor.library import library_health
-from hp_motor.library.loader import _resolve
+# subcommand modules are imported in main(): match-pack runs on a python-only install
+# (README / Termux bootstrap), run / batch / live need numpy, pandas and yaml
+
+
+def _positive_int(text: str) -> int:
+    v = int(text)
+    if v <= 0:
+        raise argparse.ArgumentTypeError(f"must be > 0: {text}")
+    return v
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -18,6 +24,32 @@ def build_parser() -> argparse.ArgumentParser:
     r.add_argument("--out", required=True, help="Output report path (json)")
     r.add_argument("--run-dir", default=None, help="Run directory (writes hp_report.json inside)")
     r.add_argument("--vendor", default="generic", help="Vendor mapping key")
+
+    b = sub.add_parser("batch", help="Run lite-core pipeline over many event files (process pool)")
+    b.add_argument("--events", required=True, help="Directory or glob of event files (.json/.jsonl/.csv)")
+    b.add_argument("--out-dir", required=True, help="Output dir (<match>/hp_report.json + batch_index.json)")
+    b.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    b.add_argument("--vendor", default="generic", help="Vendor mapping key")
+
+    m = sub.add_parser("match-pack", help="STEP12 -> STEP13 -> STEP14 over match packs in one interpreter")
+    m.add_argument("--match-pack", required=True, nargs="+", help="Match pack dir(s) (events.csv, out/)")
+    m.add_argument("--workers", type=int, default=None, help="Worker processes for many packs (default: CPU count)")
+    m.add_argument("--n-trans", type=int, default=6, help="STEP12 transition window (events)")
+    m.add_argument("--window-sec", type=_positive_int, nargs="+", default=[60], help="STEP13 tempo window(s)")
+    m.add_argument("--step-sec", type=_positive_int, default=10, help="STEP13 step")
+    m.add_argument("--emit-png", action="store_true", help="STEP13 tempo.png")
+
+    lv = sub.add_parser("live", help="Incremental pipeline over a live event feed, publishing report snapshots")
+    src = lv.add_mutually_exclusive_group(required=True)
+    src.add_argument("--events", help="Append-only .jsonl file to follow")
+    src.add_argument("--socket", help="HOST:PORT of a local JSON-lines feed")
+    lv.add_argument("--out", required=True, help="Snapshot path (json, replaced at each publish)")
+    lv.add_argument("--vendor", default="generic", help="Vendor mapping key")
+    lv.add_argument("--every", type=int, default=100, help="Publish every N events")
+    lv.add_argument("--interval-sec", type=float, default=None, help="Also publish once N seconds passed since the last snapshot")
+    lv.add_argument("--window-sec", type=_positive_int, default=60, help="Tempo window (game seconds)")
+    lv.add_argument("--poll-sec", type=float, default=0.5, help="--events: poll interval")
+    lv.add_argument("--idle-timeout", type=float, default=None, help="--events: stop after N seconds without new lines")
     return p
 
 
@@ -25,6 +57,10 @@ def main() -> int:
     args = build_parser().parse_args()
 
     if args.cmd == "run":
+        from hp_motor.library import library_health
+        from hp_motor.library.loader import _resolve
+        from hp_motor.pipeline_single import run_pipeline
+
         events_path = Path(args.events)
         report = run_pipeline(events_path, vendor=args.vendor)
 
@@ -65,6 +101,56 @@ def main() -> int:
         print(f"OK: wrote {vout}")
         return 0
 
+    if args.cmd == "batch":
+        from hp_motor.batch import run_batch
+
+        index, index_path = run_batch(
+            args.events, Path(args.out_dir), vendor=args.vendor, workers=args.workers
+        )
+        for m in index["matches"]:
+            if m["status"] != "OK":
+                print(f"FAILED: {m['events_path']}: {m.get('error')}")
+        print(f"OK: {index['n_ok']}/{index['n_matches']} matches, wrote {index_path}")
+        return 0 if index["n_failed"] == 0 else 1
+
+    if args.cmd == "match-pack":
+        from hp_motor.match_pack import run_match_packs
+
+        recs = run_match_packs(
+            args.match_pack, workers=args.workers, n_trans=args.n_trans,
+            window_sec=args.window_sec, step_sec=args.step_sec, emit_png=args.emit_png,
+        )
+        for rec in recs:
+            for msg in rec.get("messages", []):
+                print(f"[{rec['match_pack']}] {msg}")
+            if rec["status"] == "FAILED":
+                print(f"FAILED: {rec['match_pack']}: {rec.get('error')}")
+        if any(r["status"] == "FAILED" for r in recs):
+            return 1
+        return 2 if any(r["status"] == "STOP" for r in recs) else 0
+
+    if args.cmd == "live":
+        from hp_motor.live import LiveEngine, iter_socket, tail_jsonl, write_snapshot
+
+        engine = LiveEngine(
+            vendor=args.vendor, every=args.every, interval_sec=args.interval_sec,
+            window_sec=args.window_sec, publish=write_snapshot(args.out),
+        )
+        bad: list = []
+        if args.events:
+            source = tail_jsonl(args.events, poll_sec=args.poll_sec, idle_timeout=args.idle_timeout, bad=bad)
+        else:
+            host, _, port = args.socket.rpartition(":")
+            source = iter_socket(host or "127.0.0.1", int(port), bad=bad)
+        try:
+            engine.run(source)
+        except KeyboardInterrupt:
+            engine.publish()
+        if bad:
+            print(f"WARN: skipped {len(bad)} malformed feed lines (first: {bad[0][:80]!r})")
+        print(f"OK: {engine.n_events} events, {engine.n_snapshots} snapshots, wrote {args.out}")
+        return 0
+
     return 0
 
 
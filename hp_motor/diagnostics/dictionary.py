@@ -1,6 +1,14 @@
 from __future__ import annotations
+import hashlib
 import pandas as pd
 import re
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Tuple
+
+from hp_motor.library.loader import cached_artifact
+from hp_motor.semantics.substring_index import SubstringIndex
 
 def _norm(s: str) -> str:
     s = str(s).strip().lower()
@@ -8,19 +16,66 @@ def _norm(s: str) -> str:
     s = s.replace("%", " %")
     return s
 
-def load_dictionary(path: str) -> pd.DataFrame:
+@dataclass(frozen=True)
+class AliasMatcher:
+    """
+    Compiled dictionary side of build_alias_map.
+    dict_norm: metric_name_norm -> metric_name (last row wins); index: contains lookup over its keys.
+    """
+    dict_norm: Dict[str, str]
+    index: SubstringIndex
+
+    @classmethod
+    def from_frame(cls, dict_df: pd.DataFrame) -> "AliasMatcher":
+        dict_norm = dict(zip(dict_df["metric_name_norm"], dict_df["metric_name"]))
+        return cls(dict_norm=dict_norm, index=SubstringIndex(list(dict_norm)))
+
+def _fingerprint(dict_df: pd.DataFrame) -> str:
+    # content of the columns a matcher is built from
+    cols = dict_df[["metric_name_norm", "metric_name"]]
+    return hashlib.sha1(pd.util.hash_pandas_object(cols, index=False).values.tobytes()).hexdigest()
+
+# id(dict_df) -> (weakref to the frame, content fingerprint, matcher)
+_MATCHERS: Dict[int, Tuple[weakref.ref, str, AliasMatcher]] = {}
+
+def _register(dict_df: pd.DataFrame, matcher: AliasMatcher, fp: str) -> None:
+    key = id(dict_df)
+    _MATCHERS[key] = (weakref.ref(dict_df, lambda _r, k=key: _MATCHERS.pop(k, None)), fp, matcher)
+
+def _matcher_for(dict_df: pd.DataFrame) -> AliasMatcher:
+    # reused while the frame's metric_name / metric_name_norm are unchanged; an edited
+    # frame gets a fresh matcher
+    fp = _fingerprint(dict_df)
+    hit = _MATCHERS.get(id(dict_df))
+    if hit is not None and hit[0]() is dict_df and hit[1] == fp:
+        return hit[2]
+    matcher = AliasMatcher.from_frame(dict_df)
+    _register(dict_df, matcher, fp)
+    return matcher
+
+def _read_dictionary(path: Path) -> Tuple[pd.DataFrame, AliasMatcher, str]:
     df = pd.read_csv(path)
     # boş/satır başlığı gibi satırlar varsa tutalım ama normalize kolonunu ekleyelim
     df["metric_name_norm"] = df["metric_name"].astype(str).map(_norm)
-    return df
+    return df, AliasMatcher.from_frame(df), _fingerprint(df)
+
+def load_dictionary(path: str) -> pd.DataFrame:
+    # parsed frame + compiled matcher are cached per file version; callers get their own copy
+    df, matcher, fp = cached_artifact(Path(path), "alias_dictionary", _read_dictionary)
+    out = df.copy()
+    _register(out, matcher, fp)
+    return out
 
 def build_alias_map(columns: list[str], dict_df: pd.DataFrame) -> dict[str, str]:
     """
     Returns: {original_col: canonical_metric_name}
     Eşleşme stratejisi: normalize edilmiş tam eşleşme + basit contains fallback.
+    The contains fallback runs on the compiled matcher (automaton + n-gram index),
+    not a scan of the dictionary per column.
     """
     col_norm = {_norm(c): c for c in columns}
-    dict_norm = dict(zip(dict_df["metric_name_norm"], dict_df["metric_name"]))
+    matcher = _matcher_for(dict_df)
+    dict_norm = matcher.dict_norm
 
     alias = {}
     # 1) exact match
@@ -29,12 +84,12 @@ def build_alias_map(columns: list[str], dict_df: pd.DataFrame) -> dict[str, str]
             alias[orig] = dict_norm[cn]
 
     # 2) contains fallback (riskli -> WEAK olarak kullanılacak; burada sadece map üretiyoruz)
-    dict_keys = list(dict_norm.keys())
+    keys = matcher.index.keys
     for cn, orig in col_norm.items():
         if orig in alias:
             continue
-        hits = [k for k in dict_keys if (cn in k) or (k in cn)]
-        if len(hits) == 1:
-            alias[orig] = dict_norm[hits[0]]
+        kid = matcher.index.single_hit(cn)
+        if kid is not None:
+            alias[orig] = dict_norm[keys[kid]]
 
     return alias
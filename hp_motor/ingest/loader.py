@@ -1,22 +1,69 @@
 from __future__ import annotations
+import io
+from typing import Dict, Optional
+
 import pandas as pd
 
-def _detect_sep(path: str) -> str:
+from hp_motor.ingest.table_cache import cached_frame
+
+# Known event exports: exact header -> read_csv dtypes (skips per-column type inference)
+EVENT_SCHEMAS: Dict[tuple, Dict[str, str]] = {
+    ("ID", "start", "end", "code", "team", "action", "half", "pos_x", "pos_y"): {
+        "ID": "int64", "start": "float64", "end": "float64", "code": "str", "team": "str",
+        "action": "str", "half": "int64", "pos_x": "float64", "pos_y": "float64",
+    },
+}
+
+def _sniff_sep(first: str) -> str:
     # Basit ve etkili: ilk satıra bak, noktalı virgül yoğun ise ';' kullan
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
-        first = f.readline()
     if first.count(";") >= first.count(","):
         return ";"
     return ","
 
-def load_table(path: str) -> pd.DataFrame:
+def _schema_dtypes(first: str, sep: str) -> Optional[Dict[str, str]]:
+    header = tuple(first.lstrip("\ufeff").rstrip("\r\n").split(sep))
+    return EVENT_SCHEMAS.get(header)
+
+def read_csv_fast(data: bytes) -> pd.DataFrame:
+    """
+    CSV bytes -> DataFrame with the C parser: separator sniffed from the buffer's first
+    line, explicit dtypes when the header is a known event schema, round-trip float
+    parsing (may differ from the python engine in the last ulp). The python engine is used
+    only when the C parser rejects the input.
+    """
+    first = data.split(b"\n", 1)[0].decode("utf-8", errors="ignore")
+    sep = _sniff_sep(first)
+    dtypes = _schema_dtypes(first, sep)
+    attempts = ([dtypes] if dtypes else []) + [None]
+    for dtype in attempts:
+        try:
+            return pd.read_csv(io.BytesIO(data), sep=sep, encoding="utf-8", dtype=dtype, float_precision="round_trip")
+        except (pd.errors.ParserError, ValueError, TypeError, OverflowError):
+            # e.g. a blank ID/half cell under the int schema: retry inferred, then python
+            continue
+    return pd.read_csv(io.BytesIO(data), sep=sep, encoding="utf-8", engine="python")
+
+def _read_table(path: str) -> pd.DataFrame:
     p = path.lower()
 
     if p.endswith(".xlsx") or p.endswith(".xls"):
         return pd.read_excel(path)
 
     if p.endswith(".csv"):
-        sep = _detect_sep(path)
-        return pd.read_csv(path, sep=sep, encoding="utf-8", engine="python")
+        with open(path, "rb") as f:
+            return read_csv_fast(f.read())
+
+    if p.endswith(".xml"):
+        from hp_motor.ingestion.sportscode import read_xml_core
+        return read_xml_core(path)
 
     raise ValueError(f"Unsupported file type: {path}")
+
+def load_table(path: str, cache: bool = True) -> pd.DataFrame:
+    """
+    xlsx/xls/csv -> DataFrame; .xml (SportsCode-style instance export) -> core event rows. With cache, a parsed copy is kept on disk (table_cache)
+    and reused until the file's content changes.
+    """
+    if not cache or not path.lower().endswith((".xlsx", ".xls", ".csv", ".xml")):
+        return _read_table(path)
+    return cached_frame(path, "load_table", _read_table)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+
+from hp_motor.library.loader import user_cache_dir
+
+# bump when a reader's output changes, so older sidecars are not served
+# (2: Feather only, pickle sidecars are never read)
+_VERSION = 2
+
+def _enabled() -> bool:
+    return os.environ.get("HP_MOTOR_TABLE_CACHE", "1") not in ("0", "false", "no")
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow.feather  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _write(df: pd.DataFrame, stem: Path) -> Optional[Path]:
+    # Feather (memory-mapped on read) only, and only when the frame round-trips exactly;
+    # anything else (mixed-type columns, non-default index) is not cached
+    if not (isinstance(df.index, pd.RangeIndex) and df.index.start == 0 and df.index.step == 1):
+        return None
+    out = stem.with_suffix(".feather")
+    try:
+        df.to_feather(out)
+        back = pd.read_feather(out, memory_map=True)
+        if back.equals(df) and (back.dtypes == df.dtypes).all():
+            return out
+    except Exception:
+        pass
+    out.unlink(missing_ok=True)
+    return None
+
+def _read(data: Path) -> pd.DataFrame:
+    if data.suffix != ".feather":
+        raise ValueError(f"not a feather sidecar: {data.name}")
+    return pd.read_feather(data, memory_map=True)
+
+def _evict(root: Path, data_name: str, meta_path: Path) -> None:
+    # drop a replaced sidecar unless another file's stamp (same content) still points at it
+    for other in root.glob("*.json"):
+        if other == meta_path:
+            continue
+        try:
+            if json.loads(other.read_text(encoding="utf-8")).get("data") == data_name:
+                return
+        except (OSError, ValueError, AttributeError):
+            continue
+    (root / data_name).unlink(missing_ok=True)
+
+def cached_frame(path: str | Path, kind: str, read: Callable[[str], pd.DataFrame]) -> pd.DataFrame:
+    """
+    read(path), with the parsed table kept as an on-disk sidecar under
+    user_cache_dir("tables"). kind names the reader and its options.
+
+    Sidecars are keyed by the source's sha256. A per-file stamp (size, mtime_ns) skips
+    hashing when the file is untouched; a touched file is re-hashed and only re-parsed
+    when its content changed. Every call returns a new frame. Sidecars are Feather only
+    (no pickle is ever written or loaded): without pyarrow, or for a frame Feather cannot
+    round-trip, nothing is cached (pyarrow: pip install "hp-motor[cache]"). When a file's
+    content changes, its previous sidecar is removed unless another file still uses it.
+    HP_MOTOR_TABLE_CACHE=0 turns the cache off; a cache dir that cannot be written just
+    means no cache.
+    """
+    src = Path(path)
+    if not _enabled() or not _has_pyarrow():
+        return read(str(path))
+    try:
+        rp = src.resolve()
+        st = rp.stat()
+    except OSError:
+        return read(str(path))
+
+    root = user_cache_dir("tables")
+    key = hashlib.sha1(f"{_VERSION}\0{kind}\0{rp}".encode("utf-8")).hexdigest()
+    meta_path = root / f"{key}.json"
+    stamp = [st.st_size, st.st_mtime_ns]
+
+    meta = None
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass
+    if isinstance(meta, dict) and meta.get("stamp") == stamp:
+        try:
+            return _read(root / meta["data"])
+        except Exception:
+            meta = None  # sidecar gone or unreadable: rebuild below
+
+    digest = _sha256(rp)
+    stem = root / hashlib.sha1(f"{_VERSION}\0{kind}\0{digest}".encode("utf-8")).hexdigest()
+    data = stem.with_suffix(".feather")
+    df = None
+    if data.exists():
+        try:
+            df = _read(data)
+        except Exception:
+            data.unlink(missing_ok=True)
+    if df is None:
+        df = read(str(path))
+        try:
+            root.mkdir(parents=True, exist_ok=True)
+            written = _write(df, stem)
+        except Exception:
+            return df
+        if written is None:
+            return df
+    try:
+        tmp = meta_path.with_name(f"{meta_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"path": str(rp), "stamp": stamp, "sha256": digest, "data": data.name}), encoding="utf-8")
+        os.replace(tmp, meta_path)
+        old = meta.get("data") if isinstance(meta, dict) else None
+        if isinstance(old, str) and old != data.name:
+            _evict(root, old, meta_path)
+    except OSError:
+        pass
+    return df
@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import chain, compress, repeat
+from operator import is_, is_not
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Columns stored as integer codes into a per-column category tuple.
+CATEGORICAL_COLUMNS = frozenset(
+    {
+        "match_id",
+        "team_id",
+        "player_id",
+        "possession_id",
+        "sequence_id",
+        "event_type",
+        "outcome",
+        "set_piece_state",
+        "phase",
+        "sot",
+    }
+)
+
+_MISSING = object()
+
+_NUMERIC_TYPES = {int: np.int64, float: np.float64, bool: np.bool_}
+
+
+_SEQUENCE_TYPES = frozenset({list, tuple, np.ndarray})
+
+
+def _typed_keys(values: Sequence[Any]) -> Optional[List[Tuple[type, Any]]]:
+    """
+    (type, value) keys when values mix types, else None. 1, 1.0 and True hash equal, so a
+    plain dict index would merge them into one category; str(v) keeps them apart.
+    """
+    if len(set(map(type, values))) < 2:
+        return None
+    return list(zip(map(type, values), values))
+
+
+def _object_array(values: Sequence[Any]) -> np.ndarray:
+    arr = np.empty(len(values), dtype=object)
+    if _SEQUENCE_TYPES.isdisjoint(map(type, values)):
+        arr[:] = values
+        return arr
+    # numpy would broadcast nested lists/tuples; fill element-wise instead.
+    for i, v in enumerate(values):
+        arr[i] = v
+    return arr
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    One event column.
+
+    values:     numeric array, object array, or int32 codes (categorical)
+    present:    bool mask; False where the source event had no such key
+    categories: category values for categorical columns (codes index into it, -1 = absent)
+    """
+
+    values: np.ndarray
+    present: np.ndarray
+    categories: Optional[Tuple[Any, ...]] = None
+
+    @property
+    def is_categorical(self) -> bool:
+        return self.categories is not None
+
+    @property
+    def any_present(self) -> bool:
+        return bool(self.present.any())
+
+    def __len__(self) -> int:
+        return int(self.present.shape[0])
+
+    # ---- construction ----
+    @classmethod
+    def from_values(cls, values: Sequence[Any], present: np.ndarray, categorical: bool = False) -> "Column":
+        """
+        Build a column from python values (entries where present is False are ignored).
+        """
+        n = len(values)
+        full = bool(present.all())
+        if categorical:
+            try:
+                return cls._factorize(values, present, full)
+            except TypeError:
+                pass  # unhashable values -> plain object column
+
+        present_vals = values if full else list(compress(values, present.tolist()))
+        kinds = set(map(type, present_vals))
+        if len(kinds) == 1:
+            dtype = _NUMERIC_TYPES.get(next(iter(kinds)))
+            if dtype is not None:
+                try:
+                    if full:
+                        return cls(values=np.asarray(present_vals, dtype=dtype), present=present)
+                    arr = np.zeros(n, dtype=dtype)
+                    arr[present] = np.asarray(present_vals, dtype=dtype)
+                    return cls(values=arr, present=present)
+                except (OverflowError, ValueError):
+                    pass
+        arr = _object_array(values)
+        if not full:
+            arr[~present] = None
+        return cls(values=arr, present=present)
+
+    @classmethod
+    def _factorize(cls, values: Sequence[Any], present: np.ndarray, full: bool) -> "Column":
+        keys = _typed_keys(values if full else list(compress(values, present.tolist())))
+        if keys is not None and not full:
+            keys = list(zip(map(type, values), values))  # one key per row, absent rows included
+        rows = values if keys is None else keys
+        index = {v: i for i, v in enumerate(dict.fromkeys(compress(rows, present.tolist()) if not full else rows))}
+        if full:
+            codes = np.fromiter(map(index.__getitem__, rows), dtype=np.int32, count=len(rows))
+        else:
+            get = index.get
+            codes = np.fromiter(map(get, rows, repeat(-1)), dtype=np.int32, count=len(rows))
+            codes[~present] = -1
+        categories = tuple(index) if keys is None else tuple(v for _, v in index)
+        return cls(values=codes, present=present, categories=categories)
+
+    @classmethod
+    def constant(cls, value: Any, n: int, categorical: bool = False) -> "Column":
+        present = np.ones(n, dtype=bool)
+        if categorical:
+            return cls(values=np.zeros(n, dtype=np.int32), present=present, categories=(value,))
+        return cls.from_values([value] * n, present)
+
+    # ---- access ----
+    def tolist(self) -> List[Any]:
+        """
+        Python values per row (absent rows yield None).
+        """
+        if self.is_categorical:
+            lookup = _object_array(list(self.categories) + [None])  # type: ignore[arg-type]
+            return lookup[self.values].tolist()
+        return self.values.tolist()
+
+    def decode(self) -> np.ndarray:
+        return _object_array(self.tolist())
+
+    def as_categorical(self) -> "Column":
+        if self.is_categorical:
+            return self
+        return Column.from_values(self.tolist(), self.present, categorical=True)
+
+    def as_float(self) -> np.ndarray:
+        """
+        float64 view of the column; NaN where absent or not convertible by float().
+        """
+        if self.is_categorical:
+            out = self.category_lookup(_float_or_nan, None, dtype=np.float64)
+        else:
+            out = self.try_float()
+            if out is None:
+                out = self.map_values(_float_or_nan, dtype=np.float64)
+        out[~self.present] = np.nan
+        return out
+
+    def try_float(self) -> Optional[np.ndarray]:
+        """
+        Bulk float() conversion of the present rows; None if any present value fails it
+        (callers then fall back to per-row conversion with their own default).
+        """
+        if self.is_categorical:
+            return None
+        if self.values.dtype.kind in "biuf":
+            return self.values.astype(np.float64)
+        vals = self.values[self.present]
+        if any(map(is_, vals.tolist(), repeat(None))):
+            return None  # numpy would turn None into NaN; float(None) raises
+        out = np.full(len(self), np.nan)
+        try:
+            out[self.present] = vals.astype(np.float64)
+        except (TypeError, ValueError, OverflowError):
+            return None
+        return out
+
+    def map_values(self, fn: Callable[[Any], Any], dtype: Any = object) -> np.ndarray:
+        """
+        Apply fn to every row value (absent rows see None). Prefer category_lookup for
+        low-cardinality columns; this is for near-unique values such as coordinates.
+        """
+        return np.fromiter(map(fn, self.tolist()), dtype=dtype, count=len(self))
+
+    def category_lookup(self, fn: Callable[[Any], Any], default: Any, dtype: Any = object) -> np.ndarray:
+        """
+        Evaluate fn once per distinct value and gather the results per row.
+        Absent rows receive fn(default).
+        """
+        col = self.as_categorical()
+        if not col.is_categorical:
+            # unhashable values: per-row evaluation
+            vals = col.tolist()
+            return np.asarray(
+                [fn(v) if p else fn(default) for v, p in zip(vals, col.present.tolist())], dtype=dtype
+            )
+        table = np.empty(len(col.categories) + 1, dtype=dtype)  # type: ignore[arg-type]
+        for i, c in enumerate(col.categories):  # type: ignore[arg-type]
+            table[i] = fn(c)
+        table[-1] = fn(default)
+        return table[col.values]
+
+    def map_categories(self, fn: Callable[[Any], Any], default: Any = None, fill_absent: bool = False) -> "Column":
+        """
+        Categorical transform: fn is applied per category and equal results are merged.
+        With fill_absent, absent rows become fn(default) and the column is fully present.
+        """
+        col = self.as_categorical()
+        if not col.is_categorical:
+            vals = col.tolist()
+            present = col.present.copy()
+            out = [fn(v) if p else (fn(default) if fill_absent else None) for v, p in zip(vals, present.tolist())]
+            if fill_absent:
+                present[:] = True
+            return Column.from_values(out, present)
+
+        mapped = [fn(c) for c in col.categories]  # type: ignore[union-attr]
+        if fill_absent:
+            mapped.append(fn(default))
+        keys = _typed_keys(mapped) or mapped
+        index: Dict[Any, int] = {}
+        remap = np.fromiter((index.setdefault(k, len(index)) for k in keys), dtype=np.int32, count=len(keys))
+        if fill_absent:
+            codes = remap[col.values]  # -1 picks the default slot (last)
+            present = np.ones(len(col), dtype=bool)
+        elif len(remap):
+            codes = np.where(col.present, remap[col.values], -1).astype(np.int32)
+            present = col.present
+        else:
+            codes, present = col.values, col.present
+        categories = tuple(index) if keys is mapped else tuple(v for _, v in index)
+        return Column(values=codes, present=present, categories=categories)
+
+    def coalesce(self, other: "Column") -> "Column":
+        """
+        Rows missing here are filled from other (where other is present).
+        """
+        if self.present.all():
+            return self
+        fill = ~self.present & other.present
+        if not fill.any():
+            return self
+        a = self.decode()
+        a[fill] = other.decode()[fill]
+        present = self.present | other.present
+        return Column.from_values(a.tolist(), present, categorical=self.is_categorical or other.is_categorical)
+
+    def take(self, idx: Any) -> "Column":
+        return Column(values=self.values[idx], present=self.present[idx], categories=self.categories)
+
+
+def _float_or_nan(v: Any) -> float:
+    try:
+        return float(v)
+    except Exception:
+        return float("nan")
+
+
+class EventTable:
+    """
+    Columnar event table (struct-of-arrays).
+
+    Every column keeps a presence mask so the list-of-dicts view round-trips exactly:
+    a key is emitted for a row only if the source event had it.
+    """
+
+    __slots__ = ("_n", "_cols")
+
+    def __init__(self, columns: Mapping[str, Column], n: int) -> None:
+        for name, c in columns.items():
+            if len(c) != n:
+                raise ValueError(f"column length mismatch: {name} has {len(c)} rows, expected {n}")
+        self._n = int(n)
+        self._cols: Dict[str, Column] = dict(columns)
+
+    # ---- construction ----
+    @classmethod
+    def from_records(
+        cls,
+        records: Sequence[Dict[str, Any]],
+        categorical: Iterable[str] = CATEGORICAL_COLUMNS,
+        columns: Optional[Iterable[str]] = None,
+    ) -> "EventTable":
+        """
+        Build from event dicts. `columns` restricts the keys that are materialized.
+        """
+        if isinstance(records, EventTable):
+            return records
+        if not isinstance(records, list):
+            records = list(records)
+        n = len(records)
+        keys = dict.fromkeys(chain.from_iterable(records))
+        if columns is not None:
+            wanted = set(columns)
+            keys = {k: None for k in keys if k in wanted}
+        cat = set(categorical)
+
+        cols: Dict[str, Column] = {}
+        for k in keys:
+            vals = list(map(dict.get, records, repeat(k), repeat(_MISSING)))
+            present = np.fromiter(map(is_not, vals, repeat(_MISSING)), dtype=bool, count=n)
+            cols[k] = Column.from_values(vals, present, categorical=k in cat)
+        return cls(cols, n)
+
+    @classmethod
+    def empty(cls) -> "EventTable":
+        return cls({}, 0)
+
+    # ---- list-of-dicts adapter ----
+    def to_records(self) -> List[Dict[str, Any]]:
+        names = self.columns
+        vals = [self._cols[c].tolist() for c in names]
+        full = [bool(self._cols[c].present.all()) for c in names]
+        if all(full):
+            return [dict(zip(names, row)) for row in zip(*vals)] if names else [{} for _ in range(self._n)]
+
+        pres = [self._cols[c].present.tolist() for c in names]
+        spec = list(zip(names, vals, pres))
+        return [{name: v[i] for name, v, p in spec if p[i]} for i in range(self._n)]
+
+    def row(self, i: int) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for name, c in self._cols.items():
+            if not c.present[i]:
+                continue
+            v = c.values[i]
+            if c.is_categorical:
+                v = c.categories[v]  # type: ignore[index]
+            elif c.values.dtype != object:
+                v = v.item()
+            out[name] = v
+        return out
+
+    # ---- column access ----
+    def __len__(self) -> int:
+        return self._n
+
+    def __contains__(self, name: object) -> bool:
+        c = self._cols.get(name)  # type: ignore[arg-type]
+        return c is not None and c.any_present
+
+    @property
+    def columns(self) -> List[str]:
+        """Columns present in at least one row."""
+        return [k for k, c in self._cols.items() if c.any_present]
+
+    def column(self, name: str) -> Column:
+        return self._cols[name]
+
+    def get(self, name: str) -> Optional[Column]:
+        c = self._cols.get(name)
+        return c if c is not None and c.any_present else None
+
+    def with_column(self, name: str, col: Column) -> "EventTable":
+        cols = dict(self._cols)
+        cols[name] = col
+        return EventTable(cols, self._n)
+
+    def take(self, idx: Any) -> "EventTable":
+        cols = {k: c.take(idx) for k, c in self._cols.items()}
+        n = len(next(iter(cols.values()))) if cols else len(np.arange(self._n)[idx])
+        return EventTable(cols, n)
+
+    def slice(self, start: int, stop: int) -> "EventTable":
+        return self.take(slice(start, stop))
+
+    @classmethod
+    def concat(cls, tables: Sequence["EventTable"]) -> "EventTable":
+        tables = [t for t in tables if len(t)]
+        if not tables:
+            return cls.empty()
+        if len(tables) == 1:
+            return tables[0]
+        names: Dict[str, bool] = {}
+        for t in tables:
+            for k, c in t._cols.items():
+                names[k] = names.get(k, False) or c.is_categorical
+        n = sum(len(t) for t in tables)
+        cols: Dict[str, Column] = {}
+        for k, categorical in names.items():
+            vals: List[Any] = []
+            present: List[np.ndarray] = []
+            for t in tables:
+                c = t._cols.get(k)
+                if c is None:
+                    vals.extend([None] * len(t))
+                    present.append(np.zeros(len(t), dtype=bool))
+                else:
+                    vals.extend(c.tolist())
+                    present.append(c.present)
+            cols[k] = Column.from_values(vals, np.concatenate(present), categorical=categorical)
+        return cls(cols, n)
+
+    def __repr__(self) -> str:
+        return f"EventTable(n={self._n}, columns={self.columns})"
+
+
+def as_event_table(events: Any) -> EventTable:
+    """
+    Accept an EventTable or a list of event dicts.
+    """
+    if isinstance(events, EventTable):
+        return events
+    return EventTable.from_records(events or [])
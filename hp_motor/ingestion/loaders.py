@@ -1,7 +1,14 @@
 from __future__ import annotations
 import csv, json
+from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from hp_motor.ingestion.event_table import EventTable
 
 def load_events(path: Path) -> List[Dict[str, Any]]:
     if not path.exists():
@@ -14,13 +21,200 @@ def load_events(path: Path) -> List[Dict[str, Any]]:
             if isinstance(obj, dict) and isinstance(obj.get("events"), list): return obj["events"]
             return []
     if s == ".jsonl":
-        out: List[Dict[str, Any]] = []
+        return list(iter_raw_events(path))
+    if s in (".csv", ".xml"):
+        return list(iter_raw_events(path))
+    return []
+
+def iter_raw_events(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Yield raw events one at a time. .jsonl/.csv are read line by line, .xml
+    (SportsCode-style instance export) with iterparse as core-schema rows;
+    .json has no streaming parser here, so it is loaded whole and then iterated.
+    """
+    if not path.exists():
+        return
+    s = path.suffix.lower()
+    if s == ".jsonl":
         with path.open("r", encoding="utf-8") as f:
             for line in f:
                 line=line.strip()
-                if line: out.append(json.loads(line))
-        return out
-    if s == ".csv":
+                if line: yield json.loads(line)
+    elif s == ".csv":
         with path.open("r", encoding="utf-8") as f:
-            return [dict(r) for r in csv.DictReader(f)]
-    return []
+            for r in csv.DictReader(f):
+                yield dict(r)
+    elif s == ".xml":
+        from hp_motor.ingestion.sportscode import iter_xml_core_rows
+        yield from iter_xml_core_rows(path)
+    elif s == ".json":
+        yield from load_events(path)
+
+def iter_csv_tables(
+    path: Path, vendor: str = "generic", chunk_size: Optional[int] = None
+) -> Iterator[EventTable]:
+    """
+    Normalized EventTables straight from a CSV file (one table, or one per chunk_size rows).
+
+    The vendor mapping is compiled once against the header; only the projected columns
+    are parsed (pandas C reader). Numeric canonical columns are parsed natively with
+    round-trip float precision (same values as float()); the rest stay text.
+    Rows match csv.DictReader (load_events): blank lines are skipped and the missing cells
+    of a short row are None (see _short_records).
+    """
+    from hp_motor.ingestion.normalizers import NUMERIC_KEYS, compile_plan, normalize_columns
+
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8", newline="") as f:
+        header = next(csv.reader([f.readline()]), [])
+        start = f.tell()
+        n_records, short, n_fields = _short_records(f, len(header))
+        plan = compile_plan(vendor, header)
+        use = sorted({idx[0] for _, idx in plan.sources})
+        text = {idx[0] for ck, idx in plan.sources if ck not in NUMERIC_KEYS}
+        if not use:
+            # nothing to project: only the row count matters
+            yield normalize_columns(header, {}, n_records - int(np.count_nonzero(n_fields == 0)), vendor=vendor)
+            return
+        f.seek(start)
+        # usecols fails on a block of rows all narrower than the header: with short records
+        # every column is parsed
+        reader = pd.read_csv(
+            f, header=None, names=range(len(header)), usecols=None if len(short) else use, index_col=False,
+            dtype={i: str for i in text}, keep_default_na=False, float_precision="round_trip",
+            skip_blank_lines=False, chunksize=chunk_size,
+        )
+        offset = 0
+        for df in ([reader] if chunk_size is None else reader):
+            lo, hi = np.searchsorted(short, [offset, offset + len(df)])
+            rows, fields = short[lo:hi] - offset, n_fields[lo:hi]
+            offset += len(df)
+            keep = np.ones(len(df), dtype=bool)
+            keep[rows[fields == 0]] = False
+            columns = {}
+            for i in use:
+                # an all "True"/"False" column is inferred as bool; float() would reject those cells
+                vals = (df[i].astype(str) if df[i].dtype == bool else df[i]).to_numpy()
+                missing = rows[fields <= i]
+                if len(missing):
+                    vals = vals.astype(object)
+                    vals[missing] = None
+                    vals = vals[keep].tolist()  # Column.from_values, as for records
+                elif len(rows):
+                    vals = vals[keep]
+                columns[i] = vals
+            yield normalize_columns(header, columns, int(np.count_nonzero(keep)), vendor=vendor)
+
+def _short_records(f: Any, width: int) -> Tuple[int, np.ndarray, np.ndarray]:
+    """
+    Count the CSV records from f's position on: (n_records, index, n_fields) of those with
+    fewer than width fields. csv.DictReader skips blank lines (0 fields) and gives None for
+    the missing cells of a short row; pandas (skip_blank_lines=False) keeps both as rows of
+    empty cells. Fields are counted in blocks of 2**20 records; only the short ones are kept.
+    """
+    lengths = map(len, csv.reader(f))
+    n, short, fields = 0, [], []
+    while True:
+        block = np.fromiter(islice(lengths, 1 << 20), dtype=np.int64)
+        if not len(block):
+            break
+        idx = np.flatnonzero(block < max(1, width))
+        short.append(idx + n)
+        fields.append(block[idx])
+        n += len(block)
+    if not short:
+        return 0, np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return n, np.concatenate(short), np.concatenate(fields)
+
+def read_csv_table(path: Path, vendor: str = "generic") -> EventTable:
+    """
+    Whole CSV file as one normalized EventTable (see iter_csv_tables).
+    """
+    return next(iter_csv_tables(path, vendor=vendor), EventTable.empty())
+
+@dataclass(frozen=True)
+class EventChunk:
+    """
+    Normalized events of one match (or a slice of it).
+    offset: row offset of this chunk inside its match; last: final chunk of the match.
+    """
+    match_id: Any
+    table: EventTable
+    offset: int
+    last: bool
+
+def iter_event_chunks(
+    path: Path,
+    chunk_size: int = 50_000,
+    vendor: str = "generic",
+    group_by_match: bool = True,
+) -> Iterator[EventChunk]:
+    """
+    Stream a (multi-match) event file as normalized EventTable chunks.
+
+    Memory is bounded by chunk_size: one raw chunk plus the normalized chunk being
+    consumed. With group_by_match a chunk never spans two match_ids (matches are
+    expected to be contiguous in the file, as vendor dumps are).
+    """
+    from hp_motor.ingestion.normalizers import match_key, normalize_events
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    if path.suffix.lower() == ".csv":
+        # header known up front: compiled projection, no per-event dicts
+        yield from _rechunk(iter_csv_tables(path, vendor=vendor, chunk_size=chunk_size), chunk_size, group_by_match)
+        return
+    key_of = match_key(vendor) if group_by_match else (lambda r: None)
+
+    buf: List[Dict[str, Any]] = []
+    cur_key: Any = None
+    offset = 0
+
+    for r in iter_raw_events(path):
+        k = key_of(r)
+        if buf and (k != cur_key or len(buf) >= chunk_size):
+            match_done = k != cur_key
+            table = normalize_events(EventTable.from_records(buf), vendor=vendor)
+            yield EventChunk(match_id=cur_key, table=table, offset=offset, last=match_done)
+            offset = 0 if match_done else offset + len(buf)
+            buf = []
+        if not buf:
+            cur_key = k
+        buf.append(r)
+
+    if buf:
+        table = normalize_events(EventTable.from_records(buf), vendor=vendor)
+        yield EventChunk(match_id=cur_key, table=table, offset=offset, last=True)
+
+def _rechunk(tables: Iterator[EventTable], chunk_size: int, group_by_match: bool) -> Iterator[EventChunk]:
+    # cut already-normalized tables into the chunks the record loop above would produce
+    parts: List[EventTable] = []
+    n = 0
+    cur_key: Any = None
+    offset = 0
+    for table in tables:
+        col = table.get("match_id") if group_by_match else None
+        if col is None:
+            runs = [(None, table)]
+        else:
+            codes = col.as_categorical().values
+            b = [0, *(np.flatnonzero(codes[1:] != codes[:-1]) + 1).tolist(), len(table)]
+            keys = col.tolist()
+            runs = [(keys[s], table.slice(s, e)) for s, e in zip(b, b[1:])]
+        for k, piece in runs:
+            if parts and k != cur_key:
+                yield EventChunk(match_id=cur_key, table=EventTable.concat(parts), offset=offset, last=True)
+                parts, n, offset = [], 0, 0
+            if not parts:
+                cur_key = k
+            while len(piece):
+                if n == chunk_size:
+                    yield EventChunk(match_id=cur_key, table=EventTable.concat(parts), offset=offset, last=False)
+                    parts, offset, n = [], offset + n, 0
+                take = min(chunk_size - n, len(piece))
+                parts.append(piece.slice(0, take))
+                piece = piece.slice(take, len(piece))
+                n += take
+    if parts:
+        yield EventChunk(match_id=cur_key, table=EventTable.concat(parts), offset=offset, last=True)
@@ -1,6 +1,18 @@
 from __future__ import annotations
-from typing import Any, Dict, List
-from hp_motor.library.loader import load_vendor_mappings
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from hp_motor.ingestion.event_table import CATEGORICAL_COLUMNS, Column, EventTable
+from hp_motor.library.loader import _vendor_mappings
+
+CANONICAL_KEYS = ["match_id","team_id","period","minute","second","event_type","player_id",
+                  "possession_id","sequence_id","start_x","start_y","end_x","end_y","outcome","sot","set_piece_state","phase"]
+XY_KEYS = ["start_x","start_y","end_x","end_y"]
+NUMERIC_KEYS = frozenset(["period","minute","second"] + XY_KEYS)
 
 def _to_int(v: Any, d: int = 0) -> int:
     try: return int(float(v))
@@ -10,54 +22,152 @@ def _to_float(v: Any, d: float = 0.0) -> float:
     try: return float(v)
     except Exception: return d
 
-def normalize_events(events: List[Dict[str, Any]], vendor: str = "generic") -> List[Dict[str, Any]]:
-    mappings, _ = load_vendor_mappings()
-
-    # type guard: loader may return json string/path instead of dict
-    try:
-        import json
-        from pathlib import Path as _P
-        if isinstance(mappings, str):
-            _pp = _P(mappings)
-            if _pp.exists():
-                mappings = json.loads(_pp.read_text(encoding="utf-8"))
+def _vendor_map(vendor: str) -> Mapping[str, str]:
+    # loader returns the parsed (cached, read-only) artifact with the vendor block decoded
+    mappings, _ = _vendor_mappings()
+    vend = mappings.get("vendor", {})
+    return vend.get(vendor) or vend.get("generic", {})
+
+def match_key(vendor: str = "generic") -> Callable[[Dict[str, Any]], Any]:
+    """
+    Raw event -> the match_id normalize_events would assign (vendor key first).
+    """
+    vk = _vendor_map(vendor).get("match_id")
+    if vk and vk != "match_id":
+        return lambda e: e[vk] if vk in e else e.get("match_id")
+    return lambda e: e.get("match_id")
+
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
+
+def _to_int64(v: Any, d: int = 0) -> int:
+    # _to_int, with values outside the int64 column range taking the default
+    i = _to_int(v, d)
+    return i if _INT64_MIN <= i <= _INT64_MAX else d
+
+def _int_column(col: Optional[Column], n: int, d: int) -> Column:
+    present = np.ones(n, dtype=bool)
+    if col is None:
+        return Column(values=np.full(n, d, dtype=np.int64), present=present)
+    f = None if col.is_categorical else col.try_float()
+    if f is not None:
+        # float64 bounds of int64: [-2**63, 2**63); anything beyond would wrap in astype
+        ok = col.present & np.isfinite(f) & (f >= -(2.0**63)) & (f < 2.0**63)
+        return Column(values=np.trunc(np.where(ok, f, d)).astype(np.int64), present=present)
+    vals = col.category_lookup(lambda v: _to_int64(v, d), d, dtype=np.int64)
+    return Column(values=vals, present=present)
+
+def _float_column(col: Column) -> Column:
+    if col.is_categorical:
+        vals = col.category_lookup(lambda v: _to_float(v, 0.0), 0.0, dtype=np.float64)
+    else:
+        vals = col.try_float()
+        if vals is None:
+            vals = col.map_values(lambda v: _to_float(v, 0.0), dtype=np.float64)
+    return Column(values=vals, present=col.present)
+
+def _lower(v: Any) -> str:
+    return str(v).strip().lower()
+
+@dataclass(frozen=True)
+class ProjectionPlan:
+    """
+    Vendor mapping compiled against one input header.
+
+    sources: (canonical key, source column indices) in precedence order - the vendor
+    key first, then the canonical key itself - so coalescing left to right reproduces
+    the per-event `vk in e` / `k in e` rules.
+    """
+    header: Tuple[str, ...]
+    sources: Tuple[Tuple[str, Tuple[int, ...]], ...]
+
+    def index_of(self, key: str) -> Optional[int]:
+        # first source column feeding canonical `key` (e.g. match_id for grouping)
+        for k, idx in self.sources:
+            if k == key: return idx[0]
+        return None
+
+@lru_cache(maxsize=256)
+def _compile(vitems: Tuple[Tuple[str, str], ...], header: Tuple[str, ...]) -> ProjectionPlan:
+    pos: Dict[str, int] = {}
+    for i, h in enumerate(header):
+        pos[h] = i  # duplicate header: the last cell wins, as in csv.DictReader
+    src: Dict[str, List[int]] = {}
+    for ck, vk in vitems:
+        if vk in pos: src.setdefault(ck, []).append(pos[vk])
+    for k in CANONICAL_KEYS:
+        if k in pos and pos[k] not in src.get(k, ()): src.setdefault(k, []).append(pos[k])
+    return ProjectionPlan(header=header, sources=tuple((k, tuple(v)) for k, v in src.items()))
+
+def compile_plan(vendor: str, header: Sequence[str]) -> ProjectionPlan:
+    """
+    Projection plan for (vendor, header). Keyed on the mapping contents as well, so a
+    reloaded vendor file (invalidate_artifacts) never serves a stale plan.
+    """
+    return _compile(tuple(_vendor_map(vendor).items()), tuple(header))
+
+def _typed(cols: Dict[str, Column], n: int) -> EventTable:
+    cols["period"] = _int_column(cols.get("period"), n, 1)
+    cols["minute"] = _int_column(cols.get("minute"), n, 0)
+    cols["second"] = _int_column(cols.get("second"), n, 0)
+    for fk in XY_KEYS:
+        if fk in cols: cols[fk] = _float_column(cols[fk])
+    et = cols.get("event_type")
+    cols["event_type"] = (
+        Column.constant("", n, categorical=True) if et is None
+        else et.map_categories(_lower, default="", fill_absent=True)
+    )
+    if "outcome" in cols: cols["outcome"] = cols["outcome"].map_categories(_lower)
+    if "team_id" in cols: cols["team_id"] = cols["team_id"].as_categorical()
+    return EventTable(cols, n)
+
+def normalize_table(table: EventTable, vendor: str = "generic") -> EventTable:
+    """
+    Columnar normalization: vendor keys are projected onto canonical columns and the
+    typed conversions run once per column (or once per category) instead of per event.
+    """
+    plan = compile_plan(vendor, table.columns)
+    cols: Dict[str, Column] = {}
+    for ck, idx in plan.sources:
+        c = table.column(plan.header[idx[0]])
+        for i in idx[1:]:
+            c = c.coalesce(table.column(plan.header[i]))
+        cols[ck] = c
+    return _typed(cols, len(table))
+
+def normalize_columns(
+    header: Sequence[str], columns: Mapping[int, Sequence[Any]], n: int, vendor: str = "generic"
+) -> EventTable:
+    """
+    Normalize column-major input: columns[i] holds the n raw cells under header[i].
+    Only the indices the plan projects need to be supplied. Every header key exists on
+    every row, so the first source of each canonical key always wins.
+    numpy arrays are taken as parsed reader output (no None cells) and used as is;
+    other sequences go through Column.from_values.
+    """
+    plan = compile_plan(vendor, header)
+    present = np.ones(n, dtype=bool)
+    cols: Dict[str, Column] = {}
+    for ck, idx in plan.sources:
+        vals = columns[idx[0]]
+        categorical = ck in CATEGORICAL_COLUMNS
+        if isinstance(vals, np.ndarray):
+            if categorical:
+                codes, uniques = pd.factorize(vals, use_na_sentinel=False)
+                cols[ck] = Column(values=codes.astype(np.int32), present=present, categories=tuple(uniques.tolist()))
             else:
-                mappings = json.loads(mappings)
-        if not isinstance(mappings, dict):
-            mappings = {}
-    except Exception:
-        mappings = {}
-
-        # normalize vendor field: vendor mappings may be json string (double-encoded)
-    try:
-        import json
-        vend = mappings.get("vendor", {})
-        tries = 0
-        while isinstance(vend, str) and tries < 3:
-            vend = json.loads(vend)
-            tries += 1
-        if not isinstance(vend, dict):
-            vend = {}
-        mappings["vendor"] = vend
-    except Exception:
-        mappings["vendor"] = {}
-
-    vmap = mappings.get("vendor", {}).get(vendor) or mappings.get("vendor", {}).get("generic", {})
-    out: List[Dict[str, Any]] = []
-    for e in events:
-        ne: Dict[str, Any] = {}
-        for ck, vk in vmap.items():
-            if vk in e: ne[ck] = e[vk]
-        for k in ["match_id","team_id","period","minute","second","event_type","player_id",
-                  "possession_id","sequence_id","start_x","start_y","end_x","end_y","outcome","sot","set_piece_state","phase"]:
-            if k in e and k not in ne: ne[k] = e[k]
-
-        ne["period"] = _to_int(ne.get("period", 1), 1)
-        ne["minute"] = _to_int(ne.get("minute", 0), 0)
-        ne["second"] = _to_int(ne.get("second", 0), 0)
-        for fk in ["start_x","start_y","end_x","end_y"]:
-            if fk in ne: ne[fk] = _to_float(ne[fk], 0.0)
-        ne["event_type"] = str(ne.get("event_type","")).strip().lower()
-        if "outcome" in ne: ne["outcome"] = str(ne["outcome"]).strip().lower()
-        out.append(ne)
-    return out
+                cols[ck] = Column(values=vals, present=present)  # converted in _typed
+            continue
+        cols[ck] = Column.from_values(list(vals), present, categorical=categorical)
+    return _typed(cols, n)
+
+def normalize_events(
+    events: Union[List[Dict[str, Any]], EventTable], vendor: str = "generic"
+) -> Union[List[Dict[str, Any]], EventTable]:
+    """
+    EventTable in -> EventTable out. A list of dicts is adapted through the table and
+    returned as a list of dicts.
+    """
+    if isinstance(events, EventTable):
+        return normalize_table(events, vendor=vendor)
+    wanted = set(_vendor_map(vendor).values()) | set(CANONICAL_KEYS)
+    return normalize_table(EventTable.from_records(events, columns=wanted), vendor=vendor).to_records()
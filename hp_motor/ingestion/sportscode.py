@@ -0,0 +1,346 @@
+from __future__ import annotations
+import csv
+import math
+import os
+import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# SportsCode-style event exports (city_gs.csv / city_gs.xml) -> core event rows
+
+CORE_COLS = [
+    "event_id",
+    "t_start",
+    "t_end",
+    "half",
+    "team_name",
+    "team_id",
+    "player_name",
+    "player_id",
+    "event_code_raw",
+    "action_raw",
+    "action_label",
+    "pos_x",
+    "pos_y",
+]
+
+RAW_COLS = ["ID", "start", "end", "code", "team", "action", "half", "pos_x", "pos_y"]
+COMMON_DELIMS = [",", ";", "\t", "|"]
+
+# <label><group>G</group><text>..</text></label> -> raw column (group matched lower-cased)
+XML_GROUPS = {"team": "team", "action": "action", "half": "half", "pos_x": "pos_x", "pos_y": "pos_y"}
+
+TEAM_RE = re.compile(r"^(?P<name>.*?)(?:\s*\((?P<id>\d+)\))?\s*$")
+CODE_RE = re.compile(r"^\s*(?P<num>\d+)\.\s*(?P<player>.+?)\s*\((?P<pid>\d+)\)\s*-\s*(?P<label>.+?)\s*$")
+
+def is_nan(x) -> bool:
+    try:
+        return isinstance(x, float) and math.isnan(x)
+    except Exception:
+        return False
+
+def clean_str(x) -> str:
+    if x is None or is_nan(x):
+        return ""
+    s = str(x).strip()
+    if s.lower() == "nan":
+        return ""
+    return s
+
+def parse_team(s):
+    s = clean_str(s)
+    if not s:
+        return None, None
+    m = TEAM_RE.match(s)
+    if not m:
+        return s, None
+    name = (m.group("name") or "").strip() or None
+    tid = m.group("id")
+    return name, int(tid) if tid else None
+
+def parse_code(s):
+    s = clean_str(s)
+    if not s:
+        return None, None, None
+    m = CODE_RE.match(s)
+    if not m:
+        return None, None, None
+    player = m.group("player").strip()
+    pid = int(m.group("pid"))
+    label = m.group("label").strip()
+    return player, pid, label
+
+def to_float(x):
+    s = clean_str(x)
+    if not s:
+        return None
+    try:
+        return float(s)
+    except Exception:
+        return None
+
+def to_int(x):
+    s = clean_str(x)
+    if not s:
+        return None
+    try:
+        return int(float(s))
+    except Exception:
+        return None
+
+def normalize_action_label(code_label, action_raw):
+    base = clean_str(code_label)
+    if not base:
+        base = clean_str(action_raw)
+    if not base:
+        return None
+    base = re.sub(r"\s+", " ", base).strip().lower()
+    return base
+
+def core_row(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    One raw export row (RAW_COLS keys, missing cells None) -> one core row (CORE_COLS).
+    """
+    team_name, team_id = parse_team(raw.get("team"))
+    player_name, player_id, code_label = parse_code(raw.get("code"))
+    return {
+        "event_id": to_int(raw.get("ID")),
+        "t_start": to_float(raw.get("start")),
+        "t_end": to_float(raw.get("end")),
+        "half": to_int(raw.get("half")),
+        "team_name": team_name,
+        "team_id": team_id,
+        "player_name": player_name,
+        "player_id": player_id,
+        "event_code_raw": raw.get("code"),
+        "action_raw": raw.get("action"),
+        "action_label": normalize_action_label(code_label, raw.get("action")),
+        "pos_x": to_float(raw.get("pos_x")),
+        "pos_y": to_float(raw.get("pos_y")),
+    }
+
+def _cell(text: Optional[str]) -> Optional[str]:
+    # the XML export writes "None" where the CSV export leaves the cell empty
+    if text is None or text == "None":
+        return None
+    return text
+
+def _instance_row(elem: ET.Element) -> Dict[str, Any]:
+    raw: Dict[str, Any] = dict.fromkeys(RAW_COLS)
+    for child in elem:
+        tag = child.tag
+        if tag == "label":
+            group = child.findtext("group")
+            col = XML_GROUPS.get((group or "").strip().lower())
+            if col is not None:
+                raw[col] = _cell(child.findtext("text"))
+        elif tag in ("ID", "start", "end", "code"):
+            raw[tag] = _cell(child.text)
+    return raw
+
+def iter_xml_instances(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Raw rows (RAW_COLS) of an <ALL_INSTANCES><instance> export, streamed with iterparse.
+    Each instance is dropped from the tree once read, so memory stays flat in file size.
+    """
+    open_elems: List[ET.Element] = []
+    depth = 0
+    for event, elem in ET.iterparse(str(path), events=("start", "end")):
+        if event == "start":
+            open_elems.append(elem)
+            depth += elem.tag == "instance"
+            continue
+        open_elems.pop()
+        if elem.tag != "instance":
+            continue
+        depth -= 1
+        if depth:
+            continue  # nested <instance>: part of the outer one
+        yield _instance_row(elem)
+        elem.clear()
+        if open_elems:
+            open_elems[-1].remove(elem)
+
+def iter_xml_core_rows(path: Path) -> Iterator[Dict[str, Any]]:
+    for raw in iter_xml_instances(path):
+        yield core_row(raw)
+
+def read_xml_core(path: str | Path) -> pd.DataFrame:
+    """
+    Whole XML export as a core-schema DataFrame (same columns as convert_city_gs_to_core).
+    """
+    return pd.DataFrame(list(iter_xml_core_rows(Path(path))), columns=CORE_COLS)
+
+# --- column-wise conversion (same values as core_row, one pass per column) ---
+
+def sniff_delimiter(path: str, bytes_to_read: int = 64_000) -> str:
+    with open(path, "rb") as f:
+        b = f.read(bytes_to_read)
+    s = b.decode("utf-8", errors="ignore")
+    try:
+        return csv.Sniffer().sniff(s, delimiters="".join(COMMON_DELIMS)).delimiter
+    except Exception:
+        counts = {c: s.count(c) for c in COMMON_DELIMS}
+        best = max(counts, key=counts.get)
+        return best if counts[best] > 0 else ","
+
+def read_csv_auto(path: str) -> pd.DataFrame:
+    """
+    Raw CSV export as text columns (empty cells NaN), delimiter sniffed.
+    """
+    delim = sniff_delimiter(path)
+    try:
+        df = pd.read_csv(path, sep=delim, dtype=str)
+    except pd.errors.ParserError:
+        df = pd.read_csv(path, sep=delim, engine="python", dtype=str)
+    if df.shape[1] <= 1:
+        raise ValueError(f"CSV parsed into 1 column; detected={repr(delim)}")
+    df.attrs["detected_delimiter"] = delim
+    return df
+
+def _clean(s: pd.Series) -> pd.Series:
+    # clean_str per column: missing -> "", stripped, "nan" -> ""
+    c = s.fillna("").astype(str).str.strip()
+    return c.mask(c.str.lower() == "nan", "")
+
+def _floats(c: pd.Series) -> pd.Series:
+    # to_float over cleaned text; astype(float) parses with float() itself, so values match
+    # exactly (pd.to_numeric rounds some long mantissas differently) - to_numeric only
+    # separates the parseable cells when some are not
+    out = pd.Series(np.nan, index=c.index, dtype=np.float64)
+    has = c != ""
+    try:
+        out[has] = c[has].astype(np.float64)
+    except (ValueError, OverflowError):
+        ok = pd.to_numeric(c.where(has), errors="coerce").notna()
+        out[ok] = c[ok].astype(np.float64)
+        rest = has & ~ok
+        out[rest] = [np.nan if v is None else v for v in map(to_float, c[rest])]
+    return out
+
+def _ints(c: pd.Series) -> pd.Series:
+    f = _floats(c)
+    return np.trunc(f.where(np.isfinite(f))) + 0.0  # + 0.0: int() has no -0
+
+def _applied(values: pd.Series) -> pd.Series:
+    # dtype Series.apply gives ints/None: int64 when nothing is missing, float64 otherwise;
+    # ints past the int64 range stay python ints (object), as astype would wrap them
+    if len(values) and values.notna().all():
+        if ((values >= -(2.0**63)) & (values < 2.0**63)).all():
+            return values.astype(np.int64)
+        return values.map(int).astype(object)
+    return values
+
+def _digits(s: pd.Series) -> pd.Series:
+    # \d+ group text -> number; to_numeric covers ASCII, int() the other Unicode digits
+    out = pd.to_numeric(s, errors="coerce").astype(np.float64)
+    rest = s.notna() & out.isna()
+    if rest.any():
+        out[rest] = [float(int(v)) for v in s[rest]]
+    return out
+
+def _team_parts(u: pd.Series) -> pd.DataFrame:
+    team = _clean(u)
+    t = team.str.extract(TEAM_RE)
+    matched = t["name"].notna()
+    name = t["name"].fillna("").str.strip()
+    keep = team.ne("") & (~matched | name.ne(""))
+    return pd.DataFrame({
+        "team_name": team.where(~matched, name).astype(object).where(keep, None),
+        "team_id": _digits(t["id"].where(team.ne(""))),
+    })
+
+def _code_parts(u: pd.Series) -> pd.DataFrame:
+    code = _clean(u)
+    m = code.str.extract(CODE_RE)
+    ok = m["num"].notna() & code.ne("")
+    return pd.DataFrame({
+        "player_name": m["player"].str.strip().astype(object).where(ok, None),
+        "player_id": _digits(m["pid"].where(ok)),
+        "code_label": m["label"].str.strip().where(ok, ""),
+    })
+
+def _label(base: pd.Series) -> pd.Series:
+    label = base.str.replace(r"\s+", " ", regex=True).str.strip().str.lower()
+    return label.astype(object).where(base.ne(""), None)
+
+def _per_unique(col: pd.Series, fn) -> Any:
+    # fn over the distinct values only, broadcast back to the rows (exports repeat
+    # team / code / action strings heavily)
+    codes, uniques = pd.factorize(col, use_na_sentinel=False)
+    out = fn(pd.Series(uniques, dtype=object))
+    if isinstance(out, pd.DataFrame):
+        return pd.DataFrame({k: v.to_numpy()[codes] for k, v in out.items()}, index=col.index)
+    return pd.Series(out.to_numpy()[codes], index=col.index)
+
+def convert_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Raw export frame (RAW_COLS, text) -> core frame (CORE_COLS), same values as core_row.
+    Regexes run as Series.str.extract, numbers go through the column at once; text work
+    is done once per distinct value.
+    """
+    missing = sorted([c for c in RAW_COLS if c not in df.columns])
+    if missing:
+        raise KeyError(f"Missing required columns: {missing}. Have: {list(df.columns)}")
+
+    team = _per_unique(df["team"], _team_parts)
+    code = _per_unique(df["code"], _code_parts)
+    action = _per_unique(df["action"], _clean)
+    base = code["code_label"].where(code["code_label"].ne(""), action)
+
+    def number(col: str, fn) -> pd.Series:
+        return _per_unique(df[col], lambda u: fn(_clean(u))).astype(np.float64)
+
+    core = pd.DataFrame({
+        "event_id": _applied(number("ID", _ints)),
+        "t_start": number("start", _floats),
+        "t_end": number("end", _floats),
+        "half": _applied(number("half", _ints)),
+        "team_name": team["team_name"],
+        "team_id": _applied(team["team_id"].astype(np.float64)),
+        "player_name": code["player_name"],
+        "player_id": _applied(code["player_id"].astype(np.float64)),
+        "event_code_raw": df["code"],
+        "action_raw": df["action"],
+        "action_label": _per_unique(base, _label),
+        "pos_x": number("pos_x", _floats),
+        "pos_y": number("pos_y", _floats),
+    })
+    return core[CORE_COLS]
+
+def read_core(src: str | Path) -> pd.DataFrame:
+    """
+    Core frame of one export file: .xml streamed (read_xml_core), anything else as CSV.
+    """
+    if str(src).lower().endswith(".xml"):
+        return read_xml_core(src)
+    return convert_frame(read_csv_auto(str(src)))
+
+def convert_file(src: str | Path, out: str | Path) -> Tuple[int, int]:
+    """
+    Export file -> core CSV at out (parent dirs created). Returns the core shape.
+    """
+    core = read_core(src)
+    Path(out).parent.mkdir(parents=True, exist_ok=True)
+    core.to_csv(out, index=False)
+    return core.shape
+
+def convert_files(jobs: Iterable[Tuple[str | Path, str | Path]], workers: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    convert_file over (src, out) pairs, one process per file when workers > 1
+    (default: CPU count). Shapes come back in job order.
+    """
+    jobs = list(jobs)
+    outs = [str(Path(o).resolve()) for _, o in jobs]
+    if len(set(outs)) != len(outs):
+        raise ValueError("convert_files: two jobs write the same output file")
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        return [convert_file(s, o) for s, o in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(convert_file, *zip(*jobs)))
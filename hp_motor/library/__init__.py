@@ -1,13 +1,23 @@
 from hp_motor.library.loader import (
     LibraryHealth,
+    MetricRegistryIndex,
+    cached_artifact,
+    invalidate_artifacts,
     load_registry,
+    load_registry_index,
     load_vendor_mappings,
     library_health,
+    user_cache_dir,
 )
 
 __all__ = [
     "LibraryHealth",
+    "MetricRegistryIndex",
+    "cached_artifact",
+    "invalidate_artifacts",
     "load_registry",
+    "load_registry_index",
     "load_vendor_mappings",
     "library_health",
+    "user_cache_dir",
 ]
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import json
+import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 
 SDCARD_ROOT = Path("/sdcard/HP_LIBRARY")
@@ -47,6 +49,125 @@ def _read_json(path: Path) -> Dict[str, Any]:
     return data
 
 
+def _freeze(obj: Any) -> Any:
+    # read-only view for cached artifacts: dict -> mappingproxy, list -> tuple
+    if isinstance(obj, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+
+def _thaw(obj: Any) -> Any:
+    # plain, caller-owned copy of a frozen artifact: mappingproxy -> dict, tuple -> list
+    if isinstance(obj, Mapping):
+        return {k: _thaw(v) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return [_thaw(v) for v in obj]
+    return obj
+
+
+# Process-wide artifact cache:
+#   (resolved path, kind) -> ((mtime_ns, size), value)
+# A changed mtime/size re-parses on next access; invalidate_artifacts() drops entries explicitly.
+_ARTIFACT_CACHE: Dict[Tuple[str, str], Tuple[Tuple[int, int], Any]] = {}
+
+
+def _stat_key(path: Path) -> Tuple[int, int]:
+    st = path.stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _cached(path: Path, kind: str, build: Callable[[Path], Any]) -> Any:
+    rp = path.resolve()
+    key = (str(rp), kind)
+    stamp = _stat_key(rp)
+    hit = _ARTIFACT_CACHE.get(key)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    value = build(rp)
+    _ARTIFACT_CACHE[key] = (stamp, value)
+    return value
+
+
+def cached_artifact(path: Path, kind: str, build: Callable[[Path], Any]) -> Any:
+    """
+    build(resolved path), cached process-wide per (file, kind) until the file changes.
+    For derived artifacts outside the library (dictionaries, compiled matchers).
+    """
+    return _cached(Path(path), kind, build)
+
+
+def user_cache_dir(*parts: str) -> Path:
+    """
+    On-disk cache root for derived data: $HP_MOTOR_CACHE_DIR, else $XDG_CACHE_HOME/hp_motor
+    (~/.cache/hp_motor). Not created here.
+    """
+    base = os.environ.get("HP_MOTOR_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "hp_motor"
+    )
+    return Path(base, *parts)
+
+
+def invalidate_artifacts(path: Optional[Path] = None) -> None:
+    """
+    Drop cached artifacts (all, or every kind cached for one file).
+    """
+    if path is None:
+        _ARTIFACT_CACHE.clear()
+        return
+    rp = str(Path(path).resolve())
+    for key in [k for k in _ARTIFACT_CACHE if k[0] == rp]:
+        del _ARTIFACT_CACHE[key]
+
+
+@dataclass(frozen=True)
+class MetricRegistryIndex:
+    """
+    Parsed metric_registry.json, read-only and indexed by metric id.
+    """
+    version: str
+    metrics: Tuple[Mapping[str, Any], ...]
+    by_id: Mapping[str, Mapping[str, Any]]
+
+
+def _build_json(path: Path) -> Mapping[str, Any]:
+    return _freeze(_read_json(path))
+
+
+def _build_registry_index(path: Path) -> MetricRegistryIndex:
+    reg = _cached(path, "json", _build_json)
+    metrics = reg.get("metrics", ())
+    if not isinstance(metrics, tuple):
+        metrics = ()
+    metrics = tuple(m for m in metrics if isinstance(m, Mapping))
+    by_id: Dict[str, Mapping[str, Any]] = {}
+    for m in metrics:
+        by_id[m.get("id")] = m  # duplicate ids: the last entry wins
+    return MetricRegistryIndex(
+        version=str(reg.get("version", "unknown")),
+        metrics=metrics,
+        by_id=MappingProxyType(by_id),
+    )
+
+
+def _build_vendor_mappings(path: Path) -> Mapping[str, Any]:
+    data = _cached(path, "json", _build_json)
+
+    # vendor block may itself be double-encoded inside the compiled file
+    vend = data.get("vendor", {})
+    tries = 0
+    while isinstance(vend, str) and tries < 3:
+        try:
+            vend = _freeze(json.loads(vend))
+        except Exception:
+            break
+        tries += 1
+    if not isinstance(vend, Mapping):
+        vend = MappingProxyType({})
+    return MappingProxyType({**data, "vendor": vend})
+
+
 def _resolve(rel: str) -> Tuple[Path | None, LibraryHealth]:
     checked: List[str] = []
     for r in _roots():
@@ -64,17 +185,74 @@ def _resolve(rel: str) -> Tuple[Path | None, LibraryHealth]:
 
 
 def load_registry() -> Tuple[Dict[str, Any], LibraryHealth]:
+    """
+    metric_registry.json as plain dicts / lists (a fresh copy per call, safe to mutate).
+    Read-only hot paths use load_registry_index().
+    """
     p, h = _resolve("registry/metric_registry.json")
     if not p:
         return {"version": "missing", "metrics": []}, h
-    return _read_json(p), h
+    return _thaw(_cached(p, "json", _build_json)), h
+
+
+def load_registry_index() -> Tuple[MetricRegistryIndex, LibraryHealth]:
+    p, h = _resolve("registry/metric_registry.json")
+    if not p:
+        return MetricRegistryIndex(version="missing", metrics=(), by_id=MappingProxyType({})), h
+    return _cached(p, "index", _build_registry_index), h
 
 
 def load_vendor_mappings() -> Tuple[Dict[str, Any], LibraryHealth]:
+    """
+    vendor_mappings_compiled.json (vendor block decoded) as plain dicts / lists, a fresh
+    copy per call. Read-only hot paths use _vendor_mappings().
+    """
+    vm, h = _vendor_mappings()
+    return _thaw(vm), h
+
+
+def _vendor_mappings() -> Tuple[Mapping[str, Any], LibraryHealth]:
+    # the cached, read-only artifact itself (normalizers look the vendor map up per call)
     p, h = _resolve("registry/vendor_mappings_compiled.json")
     if not p:
-        return {"version": "missing", "vendor": {}}, h
-    return _read_json(p), h
+        return _freeze({"version": "missing", "vendor": {}}), h
+    return _cached(p, "vendor", _build_vendor_mappings), h
+
+
+def _registry_flags(p1: Path) -> List[str]:
+    flags: List[str] = []
+    try:
+        mr = _cached(p1, "json", _build_json)
+        metrics = mr.get("metrics")
+        if not isinstance(metrics, tuple):
+            flags.append("invalid_schema:metric_registry.metrics_not_list")
+        else:
+            for i, it in enumerate(metrics[:50]):
+                if not isinstance(it, Mapping):
+                    flags.append(f"invalid_schema:metric_registry.item_not_dict:{i}")
+                    break
+                if not str(it.get("id", "")).strip():
+                    flags.append(f"invalid_schema:metric_registry.missing_id:{i}")
+                    break
+    except Exception as e:
+        flags.append(f"invalid_json:metric_registry:{type(e).__name__}")
+    return flags
+
+
+def _vendor_flags(p2: Path) -> List[str]:
+    flags: List[str] = []
+    try:
+        vm = _cached(p2, "json", _build_json)
+        vend = vm.get("vendor")
+        if not isinstance(vend, Mapping):
+            flags.append("invalid_schema:vendor_mappings.vendor_not_dict")
+        else:
+            g = vend.get("generic")
+            if g is not None and not isinstance(g, Mapping):
+                flags.append("invalid_schema:vendor_mappings.generic_not_dict")
+    except Exception as e:
+        flags.append(f"invalid_json:vendor_mappings:{type(e).__name__}")
+    return flags
 
 
 def library_health() -> LibraryHealth:
@@ -85,39 +263,12 @@ def library_health() -> LibraryHealth:
     flags = list(dict.fromkeys(h1.flags + h2.flags))
     roots_checked = h1.roots_checked
 
-    # Schema checks for metric registry
+    # Schema checks (cached per artifact version, like the parsed files themselves)
     if p1 and p1.exists():
-        try:
-            mr = _read_json(p1)
-            metrics = mr.get("metrics")
-            if not isinstance(metrics, list):
-                flags.append("invalid_schema:metric_registry.metrics_not_list")
-            else:
-                for i, it in enumerate(metrics[:50]):
-                    if not isinstance(it, dict):
-                        flags.append(f"invalid_schema:metric_registry.item_not_dict:{i}")
-                        break
-                    if not str(it.get("id", "")).strip():
-                        flags.append(f"invalid_schema:metric_registry.missing_id:{i}")
-                        break
-        except Exception as e:
-            flags.append(f"invalid_json:metric_registry:{type(e).__name__}")
-
-    # Schema checks for vendor mappings
+        flags.extend(_cached(p1, "health", _registry_flags))
     if p2 and p2.exists():
-        try:
-            vm = _read_json(p2)
-            vend = vm.get("vendor")
-            if not isinstance(vend, dict):
-                flags.append("invalid_schema:vendor_mappings.vendor_not_dict")
-            else:
-                g = vend.get("generic")
-                if g is not None and not isinstance(g, dict):
-                    flags.append("invalid_schema:vendor_mappings.generic_not_dict")
-        except Exception as e:
-            flags.append(f"invalid_json:vendor_mappings:{type(e).__name__}")
+        flags.extend(_cached(p2, "health", _vendor_flags))
 
     flags = list(dict.fromkeys(flags))
     status = "OK" if not flags else "DEGRADED"
     return LibraryHealth(status=status, flags=flags, roots_checked=roots_checked)
-
@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import json
+import os
+import queue
+import socket
+import time
+from collections import deque
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from hp_motor.ingestion.event_table import EventTable
+from hp_motor.ingestion.normalizers import normalize_events
+from hp_motor.library import library_health
+from hp_motor.metrics.factory import compute_raw_metrics, merge_raw_metrics
+from hp_motor.pipeline_single import REQUIRED_EVENT_COLUMNS, assemble_report
+from hp_motor.segmentation.phase_tagger import _infer_row
+from hp_motor.segmentation.possessions import PossessionSegmenter
+from hp_motor.segmentation.sequences import SequenceSegmenter
+
+UNKNOWN_TEAM = "UNKNOWN_TEAM"
+UNTAGGED = "untagged"
+
+
+# ---- feeds ----
+
+def _json_line(line: str, bad: Optional[List[str]]) -> Optional[Dict[str, Any]]:
+    # one feed line -> event; a line that is not a JSON object is skipped (kept in `bad`)
+    try:
+        e = json.loads(line)
+    except ValueError:
+        e = None
+    if isinstance(e, dict):
+        return e
+    if bad is not None:
+        bad.append(line)
+    return None
+
+
+def tail_jsonl(
+    path: Union[str, Path],
+    poll_sec: float = 0.5,
+    idle_timeout: Optional[float] = None,
+    bad: Optional[List[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Follow an append-only .jsonl file (tail -f), waiting for it to appear. A line is parsed
+    once its newline is written. Ends after idle_timeout seconds without new data (None: never).
+    Lines that are not JSON objects are skipped and appended to `bad` when given.
+    """
+    path = Path(path)
+    last = time.monotonic()
+
+    def _idle() -> bool:
+        return idle_timeout is not None and time.monotonic() - last >= idle_timeout
+
+    while not path.exists():
+        if _idle():
+            return
+        time.sleep(poll_sec)
+    buf = ""
+    with path.open("r", encoding="utf-8") as f:
+        while True:
+            part = f.readline()
+            if part:
+                last = time.monotonic()
+                buf += part
+                if buf.endswith("\n"):
+                    line, buf = buf.strip(), ""
+                    e = _json_line(line, bad) if line else None
+                    if e is not None:
+                        yield e
+                continue
+            if _idle():
+                break
+            time.sleep(poll_sec)
+    if buf.strip():  # writer stopped without a final newline
+        e = _json_line(buf.strip(), bad)
+        if e is not None:
+            yield e
+
+
+def iter_socket(
+    host: str, port: int, timeout: Optional[float] = None, bad: Optional[List[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """JSON lines from a local feed server until it closes the connection (bad lines: see tail_jsonl)."""
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        with sock.makefile("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                e = _json_line(line, bad) if line else None
+                if e is not None:
+                    yield e
+
+
+def iter_queue(q: "queue.Queue[Any]", sentinel: Any = None, timeout: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+    """Events from a queue (in-process feed stand-in) until sentinel, or timeout seconds of silence."""
+    while True:
+        try:
+            e = q.get(timeout=timeout)
+        except queue.Empty:
+            return
+        if e is sentinel:
+            return
+        yield e
+
+
+def write_snapshot(path: Union[str, Path]) -> Callable[[Dict[str, Any]], None]:
+    """Publisher replacing `path` atomically, so readers never see a half-written snapshot."""
+    out = Path(path)
+
+    def _publish(snap: Dict[str, Any]) -> None:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        tmp = out.with_name(out.name + ".tmp")
+        tmp.write_text(json.dumps(snap, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, out)
+
+    return _publish
+
+
+def _team_key(team: Any) -> str:
+    return UNKNOWN_TEAM if team is None else str(team)
+
+
+# ---- engine ----
+
+class LiveEngine:
+    """
+    Incremental single-match pipeline over an append-only event feed.
+
+    feed() buffers raw events; every batch_size events (and before each snapshot) the buffer
+    is normalized as one chunk, its RAW counts are merged into the running totals and its rows
+    advance the open possession / sequence, the phase tags and the tempo window. Every event
+    is processed once, so the cost per event does not grow with the match.
+
+    A snapshot is published every `every` events and/or once interval_sec has passed since the
+    last one (checked as events arrive). Its report equals run_pipeline over the events so far.
+    """
+
+    def __init__(
+        self,
+        vendor: str = "generic",
+        every: Optional[int] = 100,
+        interval_sec: Optional[float] = None,
+        window_sec: int = 60,
+        batch_size: int = 500,
+        publish: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> None:
+        if window_sec <= 0:
+            raise ValueError("window_sec must be > 0")
+        self.vendor = vendor
+        self.every = every
+        self.interval_sec = interval_sec
+        self.window_sec = window_sec
+        self.batch_size = max(1, int(batch_size))
+        self._publish = publish
+
+        self.n_events = 0
+        self.n_snapshots = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._since = 0
+        self._last_pub = time.monotonic()
+
+        # popper (same verdict as pipeline_single._popper over the events so far)
+        self._sot_block: Optional[str] = None
+        self._seen_required: set = set()
+
+        self._metrics: Optional[Dict[str, Any]] = None
+
+        # open possession / sequence; closed ones are only counted
+        self._possessions = PossessionSegmenter()
+        self._sequences = SequenceSegmenter()
+        self._n_poss = 0
+        self._n_seq = 0
+
+        # phase tags (segmentation.phase_tagger row rules)
+        self._poss_cols = [False, False]  # possession_id / team_id seen
+        self._prev_pid: Any = None
+        self._prev_t: Optional[float] = None
+        self._phases: Dict[str, Dict[str, int]] = {}
+
+        # tempo: events of the current period within the last window_sec game seconds
+        self._win: Deque[Tuple[float, str]] = deque()
+        self._win_period: Any = None
+        self._win_teams: Dict[str, int] = {}
+        self._clock: Tuple[Any, float] = (None, 0.0)
+
+    # -- input --
+    def feed(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Add one raw event; returns the snapshot if this event triggered one."""
+        if self.n_events < 50 and self._sot_block is None:
+            sot = str(event.get("sot", "")).upper().strip()
+            if sot in {"ERROR", "BROKEN"}:
+                self._sot_block = sot
+        if len(self._seen_required) < len(REQUIRED_EVENT_COLUMNS):
+            self._seen_required.update(c for c in REQUIRED_EVENT_COLUMNS if c in event)
+        self._pending.append(event)
+        self.n_events += 1
+        self._since += 1
+        if len(self._pending) >= self.batch_size:
+            self._absorb()
+        if self._due():
+            return self.publish()
+        return None
+
+    def run(self, source: Iterable[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Consume a feed to its end; the last snapshot covers every event."""
+        last = None
+        for e in source:
+            last = self.feed(e) or last
+        if self._since or not self.n_snapshots:
+            last = self.publish()
+        return last
+
+    def _due(self) -> bool:
+        if self.every and self._since >= self.every:
+            return True
+        return self.interval_sec is not None and time.monotonic() - self._last_pub >= self.interval_sec
+
+    # -- incremental state --
+    def _absorb(self) -> None:
+        if not self._pending:
+            return
+        table = normalize_events(EventTable.from_records(self._pending), vendor=self.vendor)
+        self._pending = []
+        part = compute_raw_metrics(table)
+        self._metrics = part if self._metrics is None else merge_raw_metrics([self._metrics, part])
+        for r in table.to_records():
+            self._advance(r)
+
+    def _advance(self, r: Dict[str, Any]) -> None:
+        self._n_poss += len(self._possessions.feed(r))
+        self._n_seq += len(self._sequences.feed(r))
+        team = r.get("team_id")
+        pid = r.get("possession_id")
+
+        # phase tag
+        t = float(r["minute"]) * 60.0 + float(r["second"])
+        self._poss_cols[0] = self._poss_cols[0] or "possession_id" in r
+        self._poss_cols[1] = self._poss_cols[1] or "team_id" in r
+        if all(self._poss_cols):
+            changed = self._prev_pid is not None and pid != self._prev_pid
+            dt = t - self._prev_t if self._prev_t is not None else 9999
+        else:
+            changed, dt = False, 9999
+        self._prev_pid, self._prev_t = pid, t
+        phase_id = _infer_row({
+            "event_type": r.get("event_type"),
+            "outcome": r.get("outcome"),
+            "start_x": r.get("start_x"),
+            "end_x": r.get("end_x"),
+            "_poss_changed": changed,
+            "_dt": dt,
+        })
+        tk = _team_key(team)
+        counts = self._phases.setdefault(tk, {})
+        counts[phase_id or UNTAGGED] = counts.get(phase_id or UNTAGGED, 0) + 1
+
+        # tempo window
+        period = r.get("period")
+        if period != self._win_period:
+            self._win.clear()
+            self._win_teams.clear()
+            self._win_period = period
+        self._win.append((t, tk))
+        self._win_teams[tk] = self._win_teams.get(tk, 0) + 1
+        while self._win[0][0] <= t - self.window_sec:
+            _, old = self._win.popleft()
+            self._win_teams[old] -= 1
+        self._clock = (period, t)
+
+    # -- output --
+    def _popper(self) -> Dict[str, Any]:
+        if not self.n_events:
+            return {"status": "BLOCKED", "hard_errors": ["events_table_missing_or_empty"], "flags": []}
+        if self._sot_block:
+            return {"status": "BLOCKED", "hard_errors": [f"sot_hard_block:{self._sot_block}"], "flags": []}
+        missing = [c for c in REQUIRED_EVENT_COLUMNS if c not in self._seen_required]
+        if missing:
+            return {"status": "BLOCKED", "hard_errors": [f"missing_required_columns:{missing}"], "flags": []}
+        return {"status": "OK", "hard_errors": [], "flags": []}
+
+    def _live_state(self) -> Dict[str, Any]:
+        p, s = self._possessions.open, self._sequences.open
+        poss = asdict(p) if p is not None else None
+        seq = asdict(s) if s is not None else None
+        per_min = 60.0 / self.window_sec
+        return {
+            "possession": poss,
+            "sequence": seq,
+            "phases": self._phases,
+            "tempo": {
+                "window_sec": self.window_sec,
+                "period": self._clock[0],
+                "t_game_sec": self._clock[1],
+                "events": len(self._win),
+                "per_min": round(len(self._win) * per_min, 2),
+                "by_team": {t: round(c * per_min, 2) for t, c in self._win_teams.items() if c},
+            },
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Report + live state over every event fed so far."""
+        self._absorb()
+        open_ = 1 if self._possessions.open is not None else 0
+        report = assemble_report(
+            self._popper(), library_health(), self.n_events,
+            n_possessions=self._n_poss + open_,
+            n_sequences=self._n_seq + open_,
+            metrics_raw=merge_raw_metrics([self._metrics]) if self._metrics is not None else None,
+        )
+        return json.loads(json.dumps({
+            "snapshot": self.n_snapshots,
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "n_events": self.n_events,
+            "report": report,
+            "live": self._live_state(),
+        }, default=str))
+
+    def publish(self) -> Dict[str, Any]:
+        snap = self.snapshot()
+        self.n_snapshots += 1
+        self._since = 0
+        self._last_pub = time.monotonic()
+        if self._publish is not None:
+            self._publish(snap)
+        return snap
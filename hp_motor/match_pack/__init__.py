@@ -0,0 +1,27 @@
+# Exports resolve on first use, so the STEP13/14 wrappers do not load the STEP12 array
+# engine (numpy / pandas) just by importing the package.
+_EXPORTS = {
+    "MatchPack": "hp_motor.match_pack.pack",
+    "PhaseSummary": "hp_motor.match_pack.summary",
+    "render_brief": "hp_motor.match_pack.brief",
+    "run_match_pack": "hp_motor.match_pack.runner",
+    "run_match_packs": "hp_motor.match_pack.runner",
+    "tag_phases": "hp_motor.match_pack.phase_tagger",
+    "tempo_moments": "hp_motor.match_pack.tempo",
+}
+
+__all__ = sorted(_EXPORTS, key=str.lower)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
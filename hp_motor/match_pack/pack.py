@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Match pack layout (STEP12/13/14):
+#   <root>/events.csv, <root>/alias_map.json (optional), <root>/context_vector.json
+#   <root>/out/phase_timeline.csv, phase_summary.json, module_health.json,
+#   tempo_series.csv, tempo_segments.csv, brief_L1.txt, brief_L2.md, brief_L3.json,
+#   claims.jsonl, template_filled.json
+
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(path, obj):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+
+
+@dataclass
+class MatchPack:
+    """
+    One match pack and the typed stage outputs handed from step to step.
+    A field left as None is read back from <root>/out when a step needs it (standalone
+    STEP scripts); once a step has run in this pack, later steps use memory only.
+    write=False keeps everything in memory (no out/ files, no context_vector stub).
+    """
+    root: Path
+    write: bool = True
+    health: Optional[Dict[str, Any]] = None
+    context: Optional[Dict[str, Any]] = None
+    events: Optional[Any] = None  # phase_tagger.EventArrays
+    timeline: Optional[Any] = None  # phase_tagger.PhaseTimeline
+    phase_summary: Optional[Dict[str, Any]] = None
+    tempo_series: Optional[List[Dict[str, Any]]] = None
+    tempo_segments: Optional[List[Dict[str, Any]]] = None
+    brief: Optional[Dict[str, Any]] = None
+    steps: Dict[str, str] = field(default_factory=dict)  # step -> OK / OFF / STOP
+    messages: List[str] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.root = Path(self.root)
+
+    @property
+    def phase_rows(self) -> Optional[List[Dict[str, Any]]]:
+        """phase_timeline.csv rows, rendered from the timeline on each access."""
+        return None if self.timeline is None else self.timeline.rows()
+
+    @property
+    def out_dir(self) -> Path:
+        return self.root / "out"
+
+    def ensure_out(self) -> None:
+        if self.write:
+            os.makedirs(self.out_dir, exist_ok=True)
+
+    def save_json(self, name: str, obj: Any) -> None:
+        if self.write:
+            write_json(self.out_dir / name, obj)
+
+    def load_health(self, version: str) -> Dict[str, Any]:
+        if self.health is None:
+            p = self.out_dir / "module_health.json"
+            self.health = read_json(p) if p.exists() else {"version": version, "modules": {}}
+        return self.health
+
+    def finish(self, step: str, status: str, message: str) -> str:
+        self.steps[step] = status
+        self.messages.append(message)
+        return status
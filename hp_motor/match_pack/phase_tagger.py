@@ -0,0 +1,653 @@
+"""
+STEP12: event-only 6-phase tagger with NO-GUESSING + OK/DEGRADED/OFF health.
+Outputs: out/phase_timeline.csv, out/phase_summary.json, out/module_health.json
+"""
+import csv, gc, os
+from contextlib import contextmanager
+from itertools import zip_longest
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:  # python-only install (Termux bootstrap): tag_phases uses the row engine
+    np = pd = None
+
+from hp_motor.match_pack.pack import MatchPack, read_json, write_json
+from hp_motor.match_pack.summary import PhaseSummary
+
+VERSION = "STEP12_PHASE_TAGGER_MVP v0.1"
+
+CANON = [
+    "match_id","event_id","team","opponent","period","t_game_sec","minute","second",
+    "event_type","outcome","x","y","end_x","end_y","zone","end_zone"
+]
+
+DEFAULT_EVENT_SETS = {
+    "ON_BALL": {"pass","carry","dribble","shot","cross","goal_kick","free_kick","corner","throw_in"},
+    "REGAIN": {"ball_recovery","interception","tackle_won","keeper_save","claim","pickup","foul_won"},
+    "TURNOVER": {"dispossessed","miscontrol","ball_lost","tackle_lost","interception_against","foul_committed"},
+    "DEF_ACTION": {"pressure","tackle","interception","foul_committed","block","clearance","duel"}
+}
+
+def load_alias_map(match_pack, alias_path=None):
+    if alias_path:
+        return read_json(alias_path)
+    candidate = os.path.join(match_pack, "alias_map.json")
+    if os.path.exists(candidate):
+        return read_json(candidate)
+    return {}
+
+def canonicalize_header(fieldnames, alias_map):
+    found = {}
+    lower_to_actual = {c.lower(): c for c in fieldnames}
+    for c in CANON:
+        if c in fieldnames:
+            found[c] = c
+            continue
+        if c.lower() in lower_to_actual:
+            found[c] = lower_to_actual[c.lower()]
+            continue
+        aliases = alias_map.get(c, [])
+        hit = None
+        for a in aliases:
+            if a in fieldnames:
+                hit = a; break
+            if a.lower() in lower_to_actual:
+                hit = lower_to_actual[a.lower()]; break
+        if hit:
+            found[c] = hit
+    return found
+
+def coerce_float(v):
+    if v is None: return None
+    s = str(v).strip()
+    if s == "" or s.lower() in ("na","nan","none","null"):
+        return None
+    try:
+        return float(s)
+    except:
+        return None
+
+def coerce_int(v):
+    if v is None: return None
+    s = str(v).strip()
+    if s == "" or s.lower() in ("na","nan","none","null"):
+        return None
+    try:
+        return int(float(s))
+    except:
+        return None
+
+def normalize_event_type(s):
+    if s is None: return None
+    t = str(s).strip().lower()
+    if t == "": return None
+    t = t.replace(" ", "_").replace("-", "_")
+    return t
+
+def lower_or_none(s):
+    return (s or "").strip().lower() or None
+
+EVENT_KEYS = ["seq_idx"] + CANON
+COERCE = {
+    "period": coerce_int, "t_game_sec": coerce_float, "minute": coerce_int, "second": coerce_int,
+    "event_type": normalize_event_type, "outcome": lower_or_none,
+    "x": coerce_float, "y": coerce_float, "end_x": coerce_float, "end_y": coerce_float,
+    "zone": lower_or_none, "end_zone": lower_or_none,
+}
+
+@contextmanager
+def _gc_paused():
+    # bulk loads create millions of short tuples/lists; cyclic GC passes over them dominate otherwise
+    was = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was: gc.enable()
+
+def load_event_columns(events_csv_path, mapping):
+    """
+    events.csv -> {EVENT_KEYS name: list}, typed as in load_events (csv.DictReader
+    semantics: blank lines skipped, short rows -> None, repeated header -> last column).
+    Each distinct raw value is coerced once.
+    """
+    with open(events_csv_path, "r", encoding="utf-8-sig", newline="") as f, _gc_paused():
+        r = csv.reader(f)
+        header = next(r, [])
+        rows = [row for row in r if row]
+        table = list(zip_longest(*rows)) if rows else []  # columns; short rows padded with None
+    last = {h: i for i, h in enumerate(header)}
+    cols = {"seq_idx": list(range(len(rows)))}
+    for key in CANON:
+        j = last.get(mapping.get(key)) if mapping.get(key) else None
+        vals = list(table[j]) if j is not None and j < len(table) else [None] * len(rows)
+        fn = COERCE.get(key)
+        if fn is not None:
+            memo = {v: fn(v) for v in set(vals)}
+            vals = list(map(memo.__getitem__, vals))
+        cols[key] = vals
+    return cols
+
+def load_events(events_csv_path, mapping):
+    cols = load_event_columns(events_csv_path, mapping)
+    return [dict(zip(cols, vals)) for vals in zip(*cols.values())]
+
+def module_health(status, reasons, required_cols, provided_cols):
+    return {"status": status, "reasons": reasons, "required_cols": required_cols, "provided_cols": provided_cols}
+
+def ensure_context_vector(pack, events):
+    ctx_path = os.path.join(pack.root, "context_vector.json")
+    if os.path.exists(ctx_path):
+        pack.context = read_json(ctx_path)
+        return ctx_path, "OK", []
+    match_ids = [m for m in events.cols["match_id"] if m not in (None,"")]
+    match_id = match_ids[0] if match_ids else None
+    stub = {
+        "status": "DEGRADED",
+        "reason": "context_vector.json missing; stub created with nulls (NO-GUESSING).",
+        "match_id": match_id,
+        "verified": {"score_state": False,"minute_bin": False,"home_away": False,"red_card": False,"competition_stage": False},
+        "fields": {"score_state": None,"minute_bin": None,"home_away": None,"red_card": None,"late_goal": None,"fatigue_window": None,"opponent_profile_soft": None}
+    }
+    if pack.write:
+        write_json(ctx_path, stub)
+    pack.context = stub
+    return ctx_path, "DEGRADED", ["context_vector.json yoktu; stub üretildi."]
+
+# --- array engine: possession + phase over event columns -------------------------------
+# Tags and limits are bitmasks; strings are only rendered by PhaseTimeline.rows().
+
+PHASES = ["UNKNOWN","attacking_transition","build_up","defensive_transition","finalization","organized_defense","progression"]
+P_UNKNOWN, P_ATT_TRANS, P_BUILD_UP, P_DEF_TRANS, P_FINALIZATION, P_ORG_DEF, P_PROGRESSION = range(len(PHASES))
+
+# render order; "prog", "z", "ez", "def_action" carry a per-event value
+TAG_ORDER = [
+    "phase:att_trans","phase:att_trans_low","phase:finalization","shot","phase:build_up",
+    "phase:progression","phase:progression_low","phase:def_trans","phase:org_def",
+    "z","ez","entry_proxy","window:loss","def_action","prog","window:regain",
+    "cap:possession_unknown","cap:no_xy",
+]
+TAG = {t: 1 << i for i, t in enumerate(TAG_ORDER)}
+LIMITS = ["no_time","no_xy","possession_unknown"]  # sorted: rendered in bit order
+LIMIT = {l: 1 << i for i, l in enumerate(LIMITS)}
+POSS_EVIDENCE = ["poss:on_ball_team","poss:regain_pending","poss:carry_forward_or_unknown"]
+
+ZONES = [None,"own_third","mid_third","att_third"]
+
+class EventColumns:
+    """Typed events as columns (cols: EVENT_KEYS -> list, as load_event_columns returns)."""
+    def __init__(self, cols):
+        self.cols = cols
+        self.n = len(cols["seq_idx"])
+
+    @classmethod
+    def from_events(cls, events):
+        return cls({k: [e[k] for e in events] for k in EVENT_KEYS})
+
+    @classmethod
+    def from_csv(cls, events_csv_path, mapping):
+        return cls(load_event_columns(events_csv_path, mapping))
+
+    def rows(self):
+        return [dict(zip(self.cols, vals)) for vals in zip(*self.cols.values())]
+
+    def __len__(self):
+        return self.n
+
+class EventArrays(EventColumns):
+    """
+    EventColumns plus the arrays the tagger works on. *_has: value present (a parsed NaN
+    still counts).
+    """
+    def __init__(self, cols):
+        super().__init__(cols)
+        n = self.n
+        present = lambda k: np.fromiter((v is not None for v in cols[k]), bool, n)
+        def num(k):
+            return np.array([np.nan if v is None else v for v in cols[k]], dtype=float), present(k)
+        self.team = np.array(cols["team"], dtype=object)
+        self.event_type = np.array(cols["event_type"], dtype=object)
+        self.zone = np.array(cols["zone"], dtype=object)
+        self.end_zone = np.array(cols["end_zone"], dtype=object)
+        self.x, self.x_has = num("x")
+        self.end_x, self.end_x_has = num("end_x")
+        self.t_has = present("t_game_sec")
+        self.minute_has = present("minute")
+        self.second_has = present("second")
+
+
+def _in(values, allowed):
+    # membership per distinct value (None -> False)
+    codes, uniq = pd.factorize(values)
+    hit = np.array([u in allowed for u in uniq] + [False], dtype=bool)
+    return hit[codes]
+
+def _ffill_index(mask):
+    # index of the last True at or before each position, -1 before the first
+    idx = np.where(mask, np.arange(len(mask)), -1)
+    return np.maximum.accumulate(idx) if len(idx) else idx
+
+def zone_buckets(x, has):
+    """zone_bucket() over arrays -> object array (None outside 0..120 / missing)."""
+    ok = has & ~(x < 0) & ~(x > 120)
+    le = ok & (x <= 100); gt = ok & ~(x <= 100)
+    own = (le & (x < 33.33)) | (gt & (x < 40))
+    mid = (le & ~(x < 33.33) & (x < 66.66)) | (gt & ~(x < 40) & (x < 80))
+    code = np.select([own, mid, ok], [1, 2, 3], 0)
+    return np.array(ZONES, dtype=object)[code]
+
+class PossessionArrays:
+    def __init__(self, team_code, teams, poss_code, conf, evidence):
+        self.team_code, self.teams = team_code, teams
+        self.poss_code, self.conf, self.evidence = poss_code, conf, evidence
+
+    @classmethod
+    def from_rows(cls, ev, poss_info):
+        """From infer_possession_team() rows (possession_team / poss_conf / poss_evidence)."""
+        codes, uniq = pd.factorize(np.array(list(ev.team) + [p["possession_team"] for p in poss_info], dtype=object))
+        ev_code = {e: k for k, e in enumerate(POSS_EVIDENCE)}
+        return cls(codes[:ev.n], uniq, codes[ev.n:],
+                   np.array([p["poss_conf"] for p in poss_info], dtype=float),
+                   np.array([ev_code[p["poss_evidence"]] for p in poss_info], dtype=np.int8))
+
+    @property
+    def possession_team(self):
+        return np.array(list(self.teams) + [None], dtype=object)[self.poss_code]
+
+def infer_possession_arrays(ev, sets):
+    """
+    Possession = last team with an on-ball event (forward-filled). Regain events only
+    mark "regain_pending"; everything else carries possession forward.
+    """
+    team_code, teams = pd.factorize(ev.team)  # None -> -1
+    truthy = np.array([bool(t) for t in teams] + [False], dtype=bool)[team_code]
+    on_ball = truthy & _in(ev.event_type, sets["ON_BALL"])
+    regain = truthy & _in(ev.event_type, sets["REGAIN"]) & ~on_ball
+    last = _ffill_index(on_ball)
+    poss_code = np.where(last >= 0, team_code[np.maximum(last, 0)], -1)
+    conf = np.select([on_ball, regain, poss_code >= 0], [0.85, 0.55, 0.40], 0.10)
+    evidence = np.select([on_ball, regain], [0, 1], 2).astype(np.int8)
+    return PossessionArrays(team_code, teams, poss_code, conf, evidence)
+
+def classify_phase_arrays(ev, poss, sets, N_trans=6):
+    """classify_phase() over arrays -> PhaseTimeline (same phases, confidences, tags, limits)."""
+    n = ev.n
+    i = np.arange(n)
+    pc = poss.poss_code
+    has_poss = pc >= 0
+    change = has_poss & (pc != np.r_[-1, pc[:-1]])
+    regain_i = _ffill_index(change)
+    first = np.flatnonzero(change)[:1]
+    loss_i = _ffill_index(change & (i != (first[0] if len(first) else -1)))
+    team_known = poss.team_code >= 0
+    in_poss = team_known & has_poss & (poss.team_code == pc)
+
+    et = ev.event_type
+    shot = _in(et, {"shot"})
+    both_xy = ev.x_has & ev.end_x_has
+    with np.errstate(invalid="ignore"):
+        dx = ev.end_x - ev.x
+    prog = both_xy & (dx >= np.where(ev.end_x <= 100, 10.0, 12.0))
+    zb, ezb = zone_buckets(ev.x, ev.x_has), zone_buckets(ev.end_x, ev.end_x_has)
+    z = np.where(zb != None, zb, ev.zone)  # noqa: E711  (bucket or raw zone)
+    ez = np.where(ezb != None, ezb, ev.end_zone)  # noqa: E711
+
+    limits = (np.where(~has_poss, LIMIT["possession_unknown"], 0)
+              | np.where(~both_xy, LIMIT["no_xy"], 0)
+              | np.where(~ev.t_has & ~(ev.minute_has & ev.second_has), LIMIT["no_time"], 0)).astype(np.uint8)
+
+    win = in_poss & (i - regain_i <= N_trans)
+    att_hi = win & (shot | prog)
+    rest = in_poss & ~win
+    fin = rest & shot
+    r2 = rest & ~shot
+    entry = r2 & _in(ez, {"att_third","box"}) & _in(et, {"pass","carry","dribble","cross"})
+    r3 = r2 & ~entry
+    bu = r3 & _in(z, {"own_third"}) & _in(et, {"pass","goal_kick","free_kick","throw_in"})
+    pr = r3 & ~bu
+    out = ~in_poss
+    dt = out & (loss_i >= 0) & team_known & (i - loss_i <= N_trans) & _in(et, sets["DEF_ACTION"])
+    od = out & ~dt
+    entry_mid = entry & _in(z, {"own_third","mid_third"})
+
+    T = TAG
+    branches = [
+        (att_hi, P_ATT_TRANS, np.where(prog, 0.65, 0.55), T["phase:att_trans"] | T["prog"] | T["window:regain"]),
+        (win & ~att_hi, P_ATT_TRANS, 0.45, T["phase:att_trans_low"] | T["window:regain"] | T["prog"]),
+        (fin, P_FINALIZATION, 0.85, T["phase:finalization"] | T["shot"]),
+        (entry, np.where(entry_mid, P_PROGRESSION, P_FINALIZATION), np.where(_in(ez, {"att_third"}), 0.60, 0.55),
+         T["z"] | T["ez"] | T["entry_proxy"]),
+        (bu, P_BUILD_UP, np.where(ev.x_has, 0.55, 0.40), T["phase:build_up"] | T["z"]),
+        (pr & prog, P_PROGRESSION, 0.70, T["phase:progression"] | T["prog"]),
+        (pr & ~prog, P_PROGRESSION, 0.35, T["phase:progression_low"] | T["prog"]),
+        (dt, P_DEF_TRANS, 0.55, T["phase:def_trans"] | T["window:loss"] | T["def_action"]),
+        (od, P_ORG_DEF, np.where(team_known, 0.45, 0.20), T["phase:org_def"]),
+    ]
+    conds = [b[0] for b in branches]
+    phase = np.select(conds, [b[1] for b in branches], P_UNKNOWN).astype(np.int8)
+    conf = np.select(conds, [b[2] for b in branches], 0.0)
+    tags = np.select(conds, [b[3] for b in branches], 0).astype(np.uint32)
+
+    cap_pu = ~has_poss
+    conf = np.where(cap_pu, np.minimum(conf, 0.25), conf)
+    tags |= np.where(cap_pu, T["cap:possession_unknown"], 0).astype(np.uint32)
+    cap_xy = ~both_xy & np.isin(phase, [P_BUILD_UP, P_PROGRESSION, P_FINALIZATION])
+    conf = np.where(cap_xy, np.minimum(conf, 0.55), conf)
+    tags |= np.where(cap_xy, T["cap:no_xy"], 0).astype(np.uint32)
+
+    codes, uniq = pd.factorize(conf)
+    conf = np.array([round(float(c), 3) for c in uniq])[codes] if n else conf
+
+    return PhaseTimeline(ev, poss, phase, conf, tags, limits, dx, z, ez)
+
+class PhaseTimeline:
+    """
+    classify_phase_arrays() result: one entry per event, phases as PHASES codes, tags /
+    limits as TAG / LIMIT bitmasks. rows() renders the phase_timeline.csv rows.
+    """
+    def __init__(self, ev, poss, phase, conf, tags, limits, dx, z, ez):
+        self.ev, self.poss = ev, poss
+        self.phase, self.conf, self.tags, self.limits = phase, conf, tags, limits
+        self.dx, self.z, self.ez = dx, z, ez
+
+    def __len__(self):
+        return self.ev.n
+
+    @property
+    def phase_names(self):
+        return np.array(PHASES, dtype=object)[self.phase]
+
+    def evidence_tags(self):
+        """Rendered evidence_tags strings, built once per distinct (tags, values) combination."""
+        n = len(self)
+        if not n:
+            return []
+        t = self.tags
+        has = lambda k: (t & TAG[k]) != 0
+        dx_bits = np.where(has("prog") & self.ev.x_has & self.ev.end_x_has, self.dx, 0.0).view(np.int64)
+        prog_xy = np.where(has("prog"), np.where(self.ev.x_has & self.ev.end_x_has, 1, 0), -1)
+        parts = [
+            t.astype(np.int64), prog_xy, dx_bits,
+            np.where(has("z"), pd.factorize(self.z)[0], -2),
+            np.where(has("ez"), pd.factorize(self.ez)[0], -2),
+            np.where(has("def_action"), pd.factorize(self.ev.event_type)[0], -2),
+        ]
+        # one combination code per event (pairwise factorize keeps the codes small)
+        code = pd.factorize(parts[0])[0]
+        for p in parts[1:]:
+            c, u = pd.factorize(p)
+            code = pd.factorize(code * len(u) + c)[0]
+        inv, first = code, np.unique(code, return_index=True)[1]
+        uniq = [[int(p[j]) for p in parts] for j in first]
+        out = []
+        for u, j in zip(uniq, first):
+            mask = int(u[0])
+            keys = [k for k in TAG_ORDER if mask & TAG[k]]
+            if mask & TAG["phase:att_trans_low"]:  # this branch lists window:regain before prog
+                keys.remove("window:regain"); keys.insert(1, "window:regain")
+            parts = []
+            for k in keys:
+                if k == "prog":
+                    parts.append(f"prog:dx={self.dx[j]:.1f}>=thresh" if u[1] == 1 else "prog:no_xy")
+                elif k in ("z", "ez"):
+                    parts.append(f"{k}:{(self.z if k == 'z' else self.ez)[j]}")
+                elif k == "def_action":
+                    parts.append(f"def_action:{self.ev.event_type[j]}")
+                else:
+                    parts.append(k)
+            out.append(";".join(parts))
+        return np.array(out, dtype=object)[inv].tolist()
+
+    def limit_strings(self):
+        names = [";".join(l for b, l in enumerate(LIMITS) if m & (1 << b)) for m in range(1 << len(LIMITS))]
+        return np.array(names, dtype=object)[self.limits].tolist()
+
+    def columns(self):
+        """Rendered phase_timeline.csv columns: {name: list} in PHASE_COLS order."""
+        c = self.ev.cols
+        blank = lambda k: ["" if v is None else v for v in c[k]]
+        return {
+            "seq_idx": c["seq_idx"],
+            "match_id": [v or "" for v in c["match_id"]],
+            "event_id": [v or "" for v in c["event_id"]],
+            "period": blank("period"), "t_game_sec": blank("t_game_sec"),
+            "minute": blank("minute"), "second": blank("second"),
+            "team": [t or "" for t in self.ev.team.tolist()],
+            "event_type": [t or "" for t in self.ev.event_type.tolist()],
+            "possession_team": [t or "" for t in self.poss.possession_team.tolist()],
+            "phase": self.phase_names.tolist(),
+            "phase_confidence": self.conf.tolist(),
+            "evidence_tags": self.evidence_tags(),
+            "limits": self.limit_strings(),
+            "poss_confidence": self.poss.conf.tolist(),
+            "poss_evidence": np.array(POSS_EVIDENCE, dtype=object)[self.poss.evidence].tolist(),
+        }
+
+    def rows(self):
+        """phase_timeline.csv rows, as classify_phase() returns them."""
+        cols = self.columns()
+        return [dict(zip(PHASE_COLS, vals)) for vals in zip(*cols.values())]
+
+    def write_csv(self, path):
+        cols = self.columns()
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(PHASE_COLS)
+            w.writerows(zip(*cols.values()))
+
+def infer_possession_team(events, sets):
+    if np is None:
+        return infer_possession_rows(events, sets)
+    poss = infer_possession_arrays(EventArrays.from_events(events), sets)
+    return [{"possession_team": p, "poss_conf": c, "poss_evidence": POSS_EVIDENCE[k]}
+            for p, c, k in zip(poss.possession_team.tolist(), poss.conf.tolist(), poss.evidence.tolist())]
+
+def classify_phase(events, poss_info, sets, N_trans=6):
+    if np is None:
+        return classify_phase_rows(events, poss_info, sets, N_trans=N_trans)
+    ev = EventArrays.from_events(events)
+    return classify_phase_arrays(ev, PossessionArrays.from_rows(ev, poss_info), sets, N_trans=N_trans).rows()
+
+# --- row engine: the same rules event by event, stdlib only (no numpy / pandas) ---------
+
+def infer_possession_rows(events, sets):
+    poss = []
+    cur = None
+    pending_regain = None
+    for i, e in enumerate(events):
+        et = e["event_type"]
+        team = e["team"]
+        evidence = []
+        confidence = 0.0
+        if team and et in sets["ON_BALL"]:
+            cur = team
+            evidence.append("poss:on_ball_team")
+            confidence = 0.85
+            pending_regain = None
+        elif team and et in sets["REGAIN"]:
+            pending_regain = (team, i)
+            evidence.append("poss:regain_pending")
+            confidence = 0.55
+        else:
+            if pending_regain and team and et in sets["ON_BALL"] and team == pending_regain[0]:
+                cur = team
+                evidence.append("poss:regain_confirmed_next_on_ball")
+                confidence = 0.70
+                pending_regain = None
+            else:
+                evidence.append("poss:carry_forward_or_unknown")
+                confidence = 0.40 if cur else 0.10
+        poss.append({"possession_team": cur, "poss_conf": confidence, "poss_evidence": ";".join(evidence)})
+    return poss
+
+def zone_bucket(x):
+    if x is None: return None
+    if x < 0 or x > 120: return None
+    if x <= 100:
+        if x < 33.33: return "own_third"
+        if x < 66.66: return "mid_third"
+        return "att_third"
+    else:
+        if x < 40: return "own_third"
+        if x < 80: return "mid_third"
+        return "att_third"
+
+def progressive_proxy(e):
+    x, ex = e["x"], e["end_x"]
+    if x is not None and ex is not None:
+        dx = ex - x
+        thresh = 10.0 if ex <= 100 else 12.0
+        return dx >= thresh, f"dx={dx:.1f}>=thresh"
+    return None, "no_xy"
+
+def classify_phase_rows(events, poss_info, sets, N_trans=6):
+    phase_rows = []
+    last_poss = None
+    last_regain_i = None
+    last_loss_i = None
+    for i, e in enumerate(events):
+        poss_team = poss_info[i]["possession_team"]
+        et = e["event_type"]
+        team = e["team"]
+        conf = 0.0
+        tags = []
+        limits = []
+        if poss_team is not None and poss_team != last_poss:
+            if last_poss is not None: last_loss_i = i
+            last_regain_i = i
+            last_poss = poss_team
+        in_poss = (team is not None and poss_team is not None and team == poss_team)
+        if poss_team is None: limits.append("possession_unknown")
+        if e["x"] is None or e["end_x"] is None: limits.append("no_xy")
+        if e["t_game_sec"] is None and (e["minute"] is None or e["second"] is None): limits.append("no_time")
+        phase = "UNKNOWN"
+        if in_poss:
+            if last_regain_i is not None and (i - last_regain_i) <= N_trans:
+                prog, why = progressive_proxy(e)
+                if et == "shot" or prog is True:
+                    phase = "attacking_transition"; conf = 0.65 if prog is True else 0.55
+                    tags += ["phase:att_trans", f"prog:{why}", "window:regain"]
+                else:
+                    phase = "attacking_transition"; conf = 0.45
+                    tags += ["phase:att_trans_low", "window:regain", f"prog:{why}"]
+            if not phase.startswith("attacking_transition"):
+                if et == "shot":
+                    phase = "finalization"; conf = 0.85; tags += ["phase:finalization","shot"]
+                else:
+                    z = zone_bucket(e["x"]) or e["zone"]
+                    ez = zone_bucket(e["end_x"]) or e["end_zone"]
+                    if ez in ("att_third","box") and (et in ("pass","carry","dribble","cross")):
+                        phase = "progression" if (z in ("own_third","mid_third") and ez in ("att_third","box")) else "finalization"
+                        conf = 0.60 if ez == "att_third" else 0.55
+                        tags += [f"z:{z}", f"ez:{ez}", "entry_proxy"]
+                    else:
+                        z = zone_bucket(e["x"]) or e["zone"]
+                        if z == "own_third" and et in ("pass","goal_kick","free_kick","throw_in"):
+                            phase = "build_up"; conf = 0.55 if e["x"] is not None else 0.40
+                            tags += ["phase:build_up", f"z:{z}"]
+                        else:
+                            prog, why = progressive_proxy(e)
+                            if prog is True:
+                                phase = "progression"; conf = 0.70; tags += ["phase:progression", f"prog:{why}"]
+                            else:
+                                phase = "progression"; conf = 0.35; tags += ["phase:progression_low", f"prog:{why}"]
+        else:
+            if last_loss_i is not None and team is not None and (i - last_loss_i) <= N_trans and (et in sets["DEF_ACTION"]):
+                phase = "defensive_transition"; conf = 0.55
+                tags += ["phase:def_trans","window:loss",f"def_action:{et}"]
+            else:
+                phase = "organized_defense"; conf = 0.45 if team is not None else 0.20
+                tags += ["phase:org_def"]
+        if "possession_unknown" in limits:
+            conf = min(conf, 0.25); tags.append("cap:possession_unknown")
+        if "no_xy" in limits and phase in ("build_up","progression","finalization"):
+            conf = min(conf, 0.55); tags.append("cap:no_xy")
+        conf = round(float(conf), 3)
+        phase_rows.append({
+            "seq_idx": e["seq_idx"], "match_id": e["match_id"] or "", "event_id": e["event_id"] or "",
+            "period": e["period"] if e["period"] is not None else "",
+            "t_game_sec": e["t_game_sec"] if e["t_game_sec"] is not None else "",
+            "minute": e["minute"] if e["minute"] is not None else "",
+            "second": e["second"] if e["second"] is not None else "",
+            "team": e["team"] or "", "event_type": e["event_type"] or "", "possession_team": poss_team or "",
+            "phase": phase, "phase_confidence": conf,
+            "evidence_tags": ";".join(tags), "limits": ";".join(sorted(set(limits))),
+            "poss_confidence": poss_info[i]["poss_conf"], "poss_evidence": poss_info[i]["poss_evidence"]
+        })
+    return phase_rows
+
+class RowTimeline:
+    """classify_phase_rows() result with the PhaseTimeline interface tag_phases needs."""
+    def __init__(self, rows):
+        self._rows = rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def rows(self):
+        return self._rows
+
+    def write_csv(self, path):
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(PHASE_COLS)
+            w.writerows([r[k] for k in PHASE_COLS] for r in self._rows)
+
+def summarize_phases(phase_rows):
+    return PhaseSummary().add_rows(phase_rows).to_dict()
+
+PHASE_COLS = [
+    "seq_idx","match_id","event_id","period","t_game_sec","minute","second","team","event_type",
+    "possession_team","phase","phase_confidence","evidence_tags","limits","poss_confidence","poss_evidence"
+]
+
+def tag_phases(pack: MatchPack, events="events.csv", alias=None, n_trans=6) -> str:
+    """
+    STEP12 on a match pack: fills pack.events / timeline / phase_summary / context / health.
+    Returns OK, OFF (missing required columns) or STOP (no events file).
+    """
+    mp = str(pack.root)
+    pack.ensure_out()
+    events_path = os.path.join(mp, events)
+    if not os.path.exists(events_path):
+        return pack.finish("phase_tagger", "STOP", f"STOP: events.csv not found: {events_path}")
+    alias_map = load_alias_map(mp, alias)
+    with open(events_path, "r", encoding="utf-8-sig", newline="") as f:
+        header = next(csv.reader(f))
+    mapping = canonicalize_header(header, alias_map)
+    provided = sorted(list(mapping.keys()))
+    required = ["team","event_type"]
+    missing = [c for c in required if c not in mapping]
+    health = {"version": VERSION, "modules": {}}
+    pack.health = health
+    if missing:
+        health["modules"]["phase_tagger"] = module_health("OFF", [f"missing required columns: {missing}"], required, provided)
+        pack.save_json("module_health.json", health)
+        return pack.finish("phase_tagger", "OFF", "OFF: phase_tagger (missing required columns).")
+    pack.events = ev = (EventColumns if np is None else EventArrays).from_csv(events_path, mapping)
+    _, ctx_status, ctx_reasons = ensure_context_vector(pack, ev)
+    health["modules"]["context_vector"] = module_health(ctx_status, ctx_reasons, ["context_vector.json"], ["context_vector.json"])
+    has_xy = ("x" in mapping and "end_x" in mapping)
+    has_time = ("t_game_sec" in mapping) or ("minute" in mapping and "second" in mapping)
+    status = "OK"; reasons=[]
+    if not has_xy: status="DEGRADED"; reasons.append("no_xy: territory/progression proxies limited")
+    if not has_time: status="DEGRADED"; reasons.append("no_time: per-minute rates unavailable, event-based only")
+    if np is None:
+        rows = ev.rows()
+        poss = infer_possession_rows(rows, DEFAULT_EVENT_SETS)
+        pack.timeline = RowTimeline(classify_phase_rows(rows, poss, DEFAULT_EVENT_SETS, N_trans=n_trans))
+    else:
+        pack.timeline = classify_phase_arrays(ev, infer_possession_arrays(ev, DEFAULT_EVENT_SETS), DEFAULT_EVENT_SETS, N_trans=n_trans)
+    if pack.write:
+        pack.timeline.write_csv(os.path.join(pack.out_dir, "phase_timeline.csv"))
+    summary = PhaseSummary()
+    summary = (summary.add_rows(pack.timeline.rows()) if np is None else summary.add_timeline(pack.timeline)).to_dict()
+    summary["status"] = status
+    summary["reasons"] = reasons
+    summary["notes"] = {"denominator":"per_100_events","no_guessing":True,"transition_window_events":n_trans}
+    pack.phase_summary = summary
+    pack.save_json("phase_summary.json", summary)
+    health["modules"]["phase_tagger"] = module_health(status, reasons, required, provided)
+    pack.save_json("module_health.json", health)
+    return pack.finish("phase_tagger", "OK", "OK: STEP12 outputs written.")
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from hp_motor.match_pack.brief import render_brief
+from hp_motor.match_pack.pack import MatchPack
+from hp_motor.match_pack.phase_tagger import tag_phases
+from hp_motor.match_pack.tempo import tempo_moments
+
+
+def run_match_pack(
+    root: Union[str, Path],
+    write: bool = True,
+    events: str = "events.csv",
+    alias: Optional[str] = None,
+    n_trans: int = 6,
+    window_sec: Union[int, Sequence[int]] = (60,),
+    step_sec: int = 10,
+    emit_png: bool = False,
+) -> MatchPack:
+    """
+    STEP12 -> STEP13 -> STEP14 in this interpreter, stages handing typed data through the
+    MatchPack. Stops after a STOP, as run.sh (set -e) does; an OFF step does not stop it.
+    """
+    pack = MatchPack(Path(root), write=write)
+    steps = (
+        lambda: tag_phases(pack, events=events, alias=alias, n_trans=n_trans),
+        lambda: tempo_moments(pack, window_sec=window_sec, step_sec=step_sec, emit_png=emit_png),
+        lambda: render_brief(pack),
+    )
+    for step in steps:
+        if step() == "STOP":
+            break
+    return pack
+
+
+def _run_one(root: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    rec: Dict[str, Any] = {"match_pack": root}
+    try:
+        pack = run_match_pack(root, **kwargs)
+        rec.update({
+            "status": "STOP" if "STOP" in pack.steps.values() else "OK",
+            "steps": dict(pack.steps),
+            "messages": list(pack.messages),
+        })
+    except Exception as e:
+        rec.update({
+            "status": "FAILED",
+            "error": f"{type(e).__name__}: {e}",
+            "traceback": traceback.format_exc(limit=5),
+        })
+    rec["elapsed_sec"] = round(time.perf_counter() - t0, 4)
+    return rec
+
+
+def run_match_packs(roots: Iterable[Union[str, Path]], workers: Optional[int] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+    """
+    run_match_pack over many packs (process pool when workers > 1), one record per pack
+    in input order: status OK / STOP / FAILED, per-step statuses, messages, elapsed_sec.
+    A failing pack does not stop the others.
+    """
+    roots = [str(r) for r in roots]
+    workers = max(1, int(workers or os.cpu_count() or 1))
+    if workers == 1 or len(roots) <= 1:
+        return [_run_one(r, kwargs) for r in roots]
+    with ProcessPoolExecutor(max_workers=min(workers, len(roots))) as ex:
+        futs = [ex.submit(_run_one, r, kwargs) for r in roots]
+        out = []
+        for r, fut in zip(roots, futs):
+            try:
+                out.append(fut.result())
+            except Exception as e:  # worker crashed / result not transferable
+                out.append({"match_pack": r, "status": "FAILED", "error": f"{type(e).__name__}: {e}"})
+        return out
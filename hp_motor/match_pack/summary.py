@@ -0,0 +1,95 @@
+"""
+Streaming phase summary (phase_summary.json "by_team"): per team and phase only a count
+and a confidence sum are kept, so memory does not grow with the timeline.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List
+
+UNKNOWN_TEAM = "UNKNOWN_TEAM"
+
+
+class PhaseSummary:
+    """
+    Feed phase-tagged events one at a time (add), as rows (add_rows) or as array chunks
+    (add_arrays / add_timeline); to_dict() gives the summarize_phases structure.
+
+    Teams and phases keep first-seen order. Confidence sums continue sequentially across
+    chunks, so any chunking of one stream gives the same floats as a single pass.
+    merge() adds another summary (per-chunk / per-match -> competition totals); merged sums
+    are sums of the partial sums.
+    """
+
+    def __init__(self) -> None:
+        self._teams: Dict[str, Dict[str, List[Any]]] = {}  # team -> phase -> [count, conf_sum]
+
+    def add(self, team: Any, phase: str, confidence: float) -> "PhaseSummary":
+        cell = self._teams.setdefault(team or UNKNOWN_TEAM, {}).setdefault(phase, [0, 0.0])
+        cell[0] += 1
+        cell[1] += float(confidence)
+        return self
+
+    def add_rows(self, rows: Iterable[Dict[str, Any]]) -> "PhaseSummary":
+        for r in rows:
+            self.add(r["team"], r["phase"], r["phase_confidence"])
+        return self
+
+    def add_arrays(self, team: Any, phase: Any, confidence: Any) -> "PhaseSummary":
+        """One chunk: team (None / "" -> UNKNOWN_TEAM), phase name and confidence per event."""
+        import numpy as np  # add / add_rows / merge / to_dict stay stdlib-only
+        import pandas as pd
+
+        # keys before factorizing: pandas would turn None into NaN, and None / "" share a cell
+        team = np.asarray([t or UNKNOWN_TEAM for t in np.asarray(team, dtype=object).tolist()], dtype=object)
+        if not len(team):
+            return self
+        tcode, keys = pd.factorize(team)
+        pcode, phases = pd.factorize(np.asarray(phase, dtype=object), use_na_sentinel=False)
+        pair = pd.factorize(tcode.astype(np.int64) * len(phases) + pcode)[0]
+        # (team, phase) cells of this chunk, codes in first-seen order
+        first = np.unique(pair, return_index=True)[1].tolist()
+        cells = [self._teams.setdefault(keys[tcode[i]], {}).setdefault(phases[pcode[i]], [0, 0.0]) for i in first]
+        conf = np.asarray(confidence, dtype=float)
+        n = len(cells)
+        counts = np.bincount(pair, minlength=n)
+        # running sums go first into each bin: bincount adds in index order, so this continues
+        # the sequential float sum exactly
+        sums = np.bincount(np.r_[np.arange(n), pair], weights=np.r_[[c[1] for c in cells], conf], minlength=n)
+        for cell, c, s in zip(cells, counts.tolist(), sums.tolist()):
+            cell[0] += c
+            cell[1] = s
+        return self
+
+    def add_timeline(self, timeline: Any) -> "PhaseSummary":
+        """A phase_tagger.PhaseTimeline (or a chunk of one)."""
+        return self.add_arrays(timeline.ev.team, timeline.phase_names, timeline.conf)
+
+    def merge(self, other: "PhaseSummary") -> "PhaseSummary":
+        for team, phases in other._teams.items():
+            mine = self._teams.setdefault(team, {})
+            for ph, (c, s) in phases.items():
+                cell = mine.setdefault(ph, [0, 0.0])
+                cell[0] += c
+                cell[1] += s
+        return self
+
+    def state(self) -> Dict[str, Any]:
+        """JSON-serializable state (checkpoint / transfer between processes)."""
+        return {"by_team": {t: {ph: list(v) for ph, v in phases.items()} for t, phases in self._teams.items()}}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "PhaseSummary":
+        out = cls()
+        out._teams = {t: {ph: [int(v[0]), float(v[1])] for ph, v in phases.items()} for t, phases in state["by_team"].items()}
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {"by_team": {}}
+        for team, cells in self._teams.items():
+            total = sum(c for c, _ in cells.values()) or 1
+            phases = {}
+            for ph, (c, s) in cells.items():
+                avg = s / max(1, c)
+                phases[ph] = {"count": int(c), "per_100_events": round(100.0*c/total, 2), "avg_confidence": round(avg, 3)}
+            summary["by_team"][team] = {"total_events": total, "phases": phases}
+        return summary
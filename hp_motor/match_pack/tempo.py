@@ -0,0 +1,196 @@
+"""
+STEP13: tempo + volatility over the time axis. OFF if no time axis (NO-GUESSING).
+Outputs: out/tempo_series.csv, out/tempo_segments.csv, optional out/tempo.png
+"""
+import csv, math, os
+from fractions import Fraction
+
+from hp_motor.match_pack.pack import MatchPack
+
+VERSION = "STEP13_TEMPO_MOMENTS v0.1"
+
+def load_phase_timeline(mp):
+    # phase_timeline.csv rows as strings (standalone STEP13)
+    p = os.path.join(mp, "out", "phase_timeline.csv")
+    if not os.path.exists(p): return None, f"missing required input: {p}"
+    rows=[]
+    with open(p, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f): rows.append(row)
+    return rows, None
+
+def to_float(x):
+    try:
+        s=str(x).strip()
+        if s=="": return None
+        return float(s)
+    except: return None
+
+def to_int(x):
+    try:
+        s=str(x).strip()
+        if s=="": return None
+        return int(float(s))
+    except: return None
+
+def extract_time_sec(row):
+    t = to_float(row.get("t_game_sec",""))
+    if t is not None: return t
+    m = to_int(row.get("minute","")); s = to_int(row.get("second",""))
+    if m is not None and s is not None: return float(m*60+s)
+    return None
+
+def quantile(xs, q):
+    if not xs: return None
+    xs=sorted(xs)
+    if q<=0: return xs[0]
+    if q>=1: return xs[-1]
+    idx=(len(xs)-1)*q
+    lo=int(idx); hi=min(lo+1,len(xs)-1)
+    frac=idx-lo
+    return xs[lo]*(1-frac)+xs[hi]*frac
+
+def window_counts(st, times, window):
+    """Events of sorted st inside [max(tmin,t-window), t] for each t of the ascending grid (two pointers)."""
+    tmin=st[0]; n=len(st); lo=hi=0; out=[]
+    for t in times:
+        t0=max(tmin,t-window)
+        while lo<n and st[lo]<t0: lo+=1
+        while hi<n and st[hi]<=t: hi+=1
+        out.append(max(0,hi-lo))
+    return out
+
+def rolling_pstdev(xs, k):
+    """pstdev over the last k values at each i; exact running sum / sum of squares (no cancellation)."""
+    out=[]; s1=Fraction(0); s2=Fraction(0)
+    for i,x in enumerate(xs):
+        fx=Fraction(x); s1+=fx; s2+=fx*fx
+        if i>=k:
+            fo=Fraction(xs[i-k]); s1-=fo; s2-=fo*fo
+        n=min(i+1,k)
+        out.append(math.sqrt((s2-s1*s1/n)/n) if n>=2 else 0.0)
+    return out
+
+def tempo_series(st, window, step):
+    """Rolling tempo rows for one window (t_sec, window_sec, events_per_min, volatility, regime, kaos_flag) + thresholds."""
+    tmin,tmax=st[0],st[-1]
+    grid=[]
+    t=tmin
+    while t<=tmax:
+        grid.append(t); t+=step
+    series=[]
+    tempo=[]
+    for t,c in zip(grid, window_counts(st, grid, window)):
+        t0=max(tmin,t-window); t1=t
+        val=60.0*c/max(1.0,(t1-t0))
+        tempo.append(val)
+        series.append({"t_sec":round(t,3),"window_sec":int(window),"events_per_min":round(val,3)})
+
+    K=max(5,int(window/max(1.0,step)))
+    for s,vol in zip(series, rolling_pstdev(tempo, K)):
+        s["volatility"]=round(vol,3)
+
+    p33=quantile(tempo,0.33); p66=quantile(tempo,0.66); p90=quantile(tempo,0.90)
+    v90=quantile([s["volatility"] for s in series],0.90)
+
+    def regime(v):
+        if v<p33: return "LOW"
+        if v<p66: return "MID"
+        return "HIGH"
+
+    for s in series:
+        s["regime"]=regime(s["events_per_min"])
+        s["kaos_flag"]="1" if (s["events_per_min"]>=p90 and s["volatility"]>=v90) else "0"
+    return series, {"p33":p33,"p66":p66,"p90":p90,"vol_p90":v90}
+
+def tempo_segments(series):
+    segs=[]
+    cur=None
+    for s in series:
+        if cur is None:
+            cur={"start_t":s["t_sec"],"end_t":s["t_sec"],"regime":s["regime"],"kaos_hits":int(s["kaos_flag"])}
+        elif s["regime"]==cur["regime"]:
+            cur["end_t"]=s["t_sec"]; cur["kaos_hits"]+=int(s["kaos_flag"])
+        else:
+            segs.append(cur); cur={"start_t":s["t_sec"],"end_t":s["t_sec"],"regime":s["regime"],"kaos_hits":int(s["kaos_flag"])}
+    if cur: segs.append(cur)
+    return segs
+
+def _timeline(pack):
+    """[(t_sec or None, seq_idx)] per phase-timeline row, or (None, error)."""
+    if pack.timeline is not None and pack.events is not None:
+        c = pack.events.cols
+        return [(t if t is not None else float(m*60+s) if m is not None and s is not None else None, i)
+                for t, m, s, i in zip(c["t_game_sec"], c["minute"], c["second"], c["seq_idx"])], None
+    if "phase_tagger" in pack.steps:
+        return None, f"missing required input: {os.path.join(str(pack.root), 'out', 'phase_timeline.csv')}"
+    rows, err = load_phase_timeline(str(pack.root))
+    if err: return None, err
+    return [(extract_time_sec(r), int(r.get("seq_idx","0") or 0)) for r in rows], None
+
+def tempo_moments(pack: MatchPack, window_sec=(60,), step_sec=10, emit_png=False) -> str:
+    """
+    STEP13 on a match pack: fills pack.tempo_series / tempo_segments and the tempo health entry.
+    window_sec: one or more window sizes. Returns OK, OFF (no time axis) or STOP (no timeline).
+    """
+    pack.ensure_out()
+    out_dir = str(pack.out_dir)
+    health = pack.load_health(VERSION)
+    timeline, err = _timeline(pack)
+    if err:
+        health["modules"]["tempo"]={"status":"STOP","reasons":[err]}
+        pack.save_json("module_health.json", health)
+        return pack.finish("tempo", "STOP", f"STOP: {err}")
+
+    if all(t is None for t,_ in timeline):
+        health["modules"]["tempo"]={"status":"OFF","reasons":["no_time_axis: need t_game_sec or (minute+second)"]}
+        pack.save_json("module_health.json", health)
+        pack.tempo_series=[]; pack.tempo_segments=[{"status":"OFF","reason":"no_time_axis"}]
+        if pack.write:
+            with open(os.path.join(out_dir,"tempo_segments.csv"),"w",encoding="utf-8",newline="") as f:
+                w=csv.DictWriter(f, fieldnames=["status","reason"]); w.writeheader()
+                w.writerow({"status":"OFF","reason":"no_time_axis"})
+        return pack.finish("tempo", "OFF", "OFF: tempo (no_time_axis).")
+
+    stream=sorted((t,i) for t,i in timeline if t is not None)
+    st=[x[0] for x in stream]
+    if isinstance(window_sec, (int, float)): window_sec=[window_sec]
+    step=float(step_sec)
+    windows=list(dict.fromkeys(int(w) for w in window_sec))
+    series=[]; segs=[]; thresholds={}
+    for wsec in windows:
+        ser, th = tempo_series(st, float(wsec), step)
+        series.extend(ser); thresholds[wsec]=th
+        for g in tempo_segments(ser):
+            segs.append({"window_sec":wsec, **g} if len(windows)>1 else g)
+    primary=[s for s in series if s["window_sec"]==windows[0]]
+    pack.tempo_series=series; pack.tempo_segments=segs
+
+    if pack.write:
+        with open(os.path.join(out_dir,"tempo_series.csv"),"w",encoding="utf-8",newline="") as f:
+            w=csv.DictWriter(f, fieldnames=list(series[0].keys()))
+            w.writeheader()
+            for s in series: w.writerow(s)
+
+        with open(os.path.join(out_dir,"tempo_segments.csv"),"w",encoding="utf-8",newline="") as f:
+            w=csv.DictWriter(f, fieldnames=(["window_sec"] if len(windows)>1 else [])+["start_t","end_t","regime","kaos_hits"])
+            w.writeheader()
+            for s in segs: w.writerow(s)
+
+    # Optional PNG - try but never fail the module
+    if emit_png and pack.write:
+        try:
+            import matplotlib.pyplot as plt
+            xs=[s["t_sec"] for s in primary]; ys=[s["events_per_min"] for s in primary]
+            plt.figure(); plt.plot(xs,ys)
+            plt.xlabel("t_sec"); plt.ylabel("events_per_min"); plt.title("Tempo (rolling)")
+            plt.savefig(os.path.join(out_dir,"tempo.png"), dpi=140, bbox_inches="tight")
+            plt.close()
+        except Exception as e:
+            health["modules"]["tempo_png"]={"status":"DEGRADED","reasons":[f"png_skipped: {e}"]}
+
+    health["modules"]["tempo"]={"status":"OK","reasons":[],
+                                "notes":{"window_sec":windows[0] if len(windows)==1 else windows,"step_sec":step_sec,
+                                         "regime_thresholds":thresholds[windows[0]] if len(windows)==1 else {str(w):thresholds[w] for w in windows},
+                                         "no_guessing":True}}
+    pack.save_json("module_health.json", health)
+    return pack.finish("tempo", "OK", "OK: STEP13 outputs written.")
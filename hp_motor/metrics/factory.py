@@ -1,59 +1,98 @@
 from __future__ import annotations
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Union
 
 from hp_motor.config_reader import read_spec
+from hp_motor.ingestion.event_table import EventTable, as_event_table
+from hp_motor.metrics.formula import compile_registry
+from hp_motor.metrics.kernel import MaskKernel, Node
 
+_TURNOVER_TYPES = frozenset({"turnover", "dispossessed"})
+_PASS_FAIL = frozenset({"fail", "failed", "incomplete", "lost"})
+_CARRY_FAIL = frozenset({"fail", "failed", "lost"})
 
-def compute_raw_metrics(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+_IS_PASS: Node = ("==", "event_type", "pass")
+
+# Built-in row predicates of the core count metrics, also the fallback without a usable
+# registry. The registry raw_formula drives a count unless the entry is marked
+# "formula_source": "code" (M_TURNOVER_COUNT: its text summarizes the pass / carry
+# failure rules below, which define the reported value).
+COUNT_DECLARATIONS: Dict[str, Node] = {
+    "M_PASS_COUNT": _IS_PASS,
+    "M_PROG_PASS_COUNT": ("and", _IS_PASS, (">=", ("-", "end_x", "start_x"), ("param", "threshold"))),
+    "M_SHOT_COUNT": ("contains", "event_type", "shot"),
+    "M_TURNOVER_COUNT": (
+        "or",
+        ("in", "event_type", _TURNOVER_TYPES),
+        ("and", _IS_PASS, ("in", "outcome", _PASS_FAIL)),
+        ("and", ("in", "event_type", frozenset({"carry", "dribble"})), ("in", "outcome", _CARRY_FAIL)),
+    ),
+}
+
+
+def count_declarations() -> Dict[str, Node]:
+    """
+    Event-level COUNT metrics to compute, in registry order: the compiled raw_formula, or
+    the built-in predicate for ids the registry marks as code-defined. Without a usable
+    registry, the built-in declarations.
+    """
+    reg = compile_registry()
+    nodes = {
+        mid: COUNT_DECLARATIONS[mid] if mid in reg.code_defined and mid in COUNT_DECLARATIONS else p.where
+        for mid, p in reg.plans.items()
+        if p.agg == "COUNT" and p.source == "events"
+    }
+    return nodes or dict(COUNT_DECLARATIONS)
+
+
+def count_metric_ids() -> List[str]:
+    return list(count_declarations())
+
+
+def metric_params() -> Dict[str, float]:
+    """Formula parameters from the spec (threshold: progressive pass dx)."""
     spec = read_spec()
-    prog_dx = float(spec.get("hp_motor", {}).get("progressive_pass_dx_threshold", 15.0))
-
-    # column inventory
-    columns_present = set()
-    for e in events:
-        columns_present.update(e.keys())
-
-    pass_count = 0
-    prog_pass = 0
-    shot = 0
-    turnover = 0
-    have_xy = True
-
-    for e in events:
-        et = str(e.get("event_type", "")).lower()
-
-        if et == "pass":
-            pass_count += 1
-            if "start_x" in e and "end_x" in e:
-                try:
-                    dx = float(e["end_x"]) - float(e["start_x"])
-                    if dx >= prog_dx:
-                        prog_pass += 1
-                except Exception:
-                    have_xy = False
-            else:
-                have_xy = False
-
-        if "shot" in et:
-            shot += 1
-
-        if et in {"turnover", "dispossessed"}:
-            turnover += 1
-        if et == "pass" and str(e.get("outcome", "")).lower() in {"fail", "failed", "incomplete", "lost"}:
-            turnover += 1
-        if et in {"carry", "dribble"} and str(e.get("outcome", "")).lower() in {"fail", "failed", "lost"}:
-            turnover += 1
+    return {"threshold": float(spec.get("hp_motor", {}).get("progressive_pass_dx_threshold", 15.0))}
+
+
+def compute_raw_metrics(events: Union[List[Dict[str, Any]], EventTable]) -> Dict[str, Any]:
+    params = metric_params()
+    prog_dx = params["threshold"]
+
+    table = as_event_table(events)
+
+    # one fused pass: shared predicate masks are evaluated once, each metric is a sum
+    kernel = MaskKernel(table, params=params)
+    metrics = {mid: {"value": kernel.count(node)} for mid, node in count_declarations().items()}
 
     return {
         "meta": {
             "thresholds": {"progressive_pass_dx": prog_dx},
-            "counts": {"events": len(events)},
-            "columns_present": sorted(columns_present),
+            "counts": {"events": len(table)},
+            "columns_present": sorted(table.columns),
         },
-        "metrics": {
-            "M_PASS_COUNT": {"value": pass_count},
-            "M_PROG_PASS_COUNT": {"value": prog_pass},
-            "M_SHOT_COUNT": {"value": shot},
-            "M_TURNOVER_COUNT": {"value": turnover},
+        "metrics": metrics,
+    }
+
+
+def merge_raw_metrics(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine compute_raw_metrics outputs of disjoint event chunks (all metrics are counts).
+    """
+    if not parts:
+        return compute_raw_metrics([])
+    columns: set = set()
+    n = 0
+    values: Dict[str, int] = {}
+    for p in parts:
+        columns.update(p["meta"].get("columns_present", []))
+        n += int(p["meta"].get("counts", {}).get("events", 0))
+        for mid, payload in p.get("metrics", {}).items():
+            values[mid] = values.get(mid, 0) + int(payload.get("value") or 0)
+    return {
+        "meta": {
+            "thresholds": dict(parts[0]["meta"].get("thresholds", {})),
+            "counts": {"events": n},
+            "columns_present": sorted(columns),
         },
+        "metrics": {mid: {"value": v} for mid, v in values.items()},
     }
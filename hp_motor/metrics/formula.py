@@ -0,0 +1,500 @@
+"""
+raw_formula compiler for metric_registry.json.
+
+  formula := COUNT "(" source [WHERE pred] ")"
+           | SUM "(" expr [WHERE pred] ")" | MEAN "(" expr [WHERE pred] ")"
+           | RATIO "(" formula "," formula ")"
+  source  := events | sequence | possession | <event type, e.g. pass>
+  pred    := pred OR pred | pred AND pred | NOT pred | "(" pred ")"
+           | column (== | != | CONTAINS) 'text' | column IN ['a', ...]
+           | expr (== | != | >= | > | <= | <) number-or-param
+  expr    := column | number | param, combined with + - * /
+             (a column may be qualified by its source: sequence.end_idx)
+
+Text comparisons are case-insensitive (cells are str()-ed and lowercased, a missing
+cell reads as ""). `threshold` is a parameter, supplied at evaluation time.
+"""
+from __future__ import annotations
+import re
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from hp_motor.ingestion.event_table import CATEGORICAL_COLUMNS, Column, EventTable, as_event_table
+from hp_motor.library.loader import load_registry_index
+from hp_motor.metrics.kernel import MaskKernel, Node
+from hp_motor.segmentation.segment_table import SEQUENCE, SegmentTable
+
+SOURCES = {"events": "events", "sequence": "sequence", "sequences": "sequence",
+           "possession": "possession", "possessions": "possession"}
+PARAMS = frozenset({"threshold"})
+_AGGS = frozenset({"COUNT", "SUM", "MEAN", "AVG", "RATIO"})
+
+# group_by name -> column per source (first present one wins)
+GROUP_COLUMNS = {
+    "team": ("team_id",),
+    "phase": ("phase_id", "phase"),
+    "sequence": ("sequence_id",),
+    "possession": ("possession_id",),
+}
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<str>'[^']*'|\"[^\"]*\")|(?P<num>\d+(?:\.\d*)?|\.\d+)"
+    r"|(?P<name>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)?)"
+    r"|(?P<op>==|!=|>=|<=|[><()\[\],+\-*/]))"
+)
+
+
+class FormulaError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class CompiledFormula:
+    """
+    One parsed raw_formula.
+
+    agg:    COUNT | SUM | MEAN | RATIO
+    source: table the rows come from (events | sequence | possession)
+    where:  row predicate (kernel node)
+    expr:   numeric operand for SUM / MEAN
+    parts:  (numerator, denominator) for RATIO
+    """
+    text: str
+    agg: str
+    source: str = "events"
+    where: Node = ("true",)
+    expr: Any = None
+    parts: Tuple["CompiledFormula", ...] = ()
+
+    def evaluate(self, ctx: "FormulaContext", group_by: Optional[str] = None) -> Any:
+        """
+        Scalar value, or {group value: value} when group_by is team/phase/sequence/possession.
+        """
+        if self.agg == "RATIO":
+            num, den = (p.evaluate(ctx, group_by) for p in self.parts)
+            if group_by is None:
+                return _ratio(num, den)
+            return {g: _ratio(num.get(g, 0), den.get(g)) for g in den}
+
+        kernel = ctx.kernel(self.source)
+        mask = kernel.mask(self.where)
+        vals = None
+        if self.agg != "COUNT":
+            vals = kernel.numeric(self.expr)
+            mask = mask & ~np.isnan(vals)  # SUM/MEAN skip rows without a numeric value
+
+        if group_by is None:
+            if self.agg == "COUNT":
+                return int(mask.sum())
+            total = float(vals[mask].sum())
+            if self.agg == "SUM":
+                return total
+            n = int(mask.sum())
+            return total / n if n else None
+
+        codes, labels = ctx.groups(self.source, group_by)
+        slots = np.where(codes < 0, len(labels) - 1, codes)[mask]
+        counts = np.bincount(slots, minlength=len(labels))
+        if self.agg == "COUNT":
+            out = counts
+        else:
+            sums = np.bincount(slots, weights=vals[mask], minlength=len(labels))
+            out = sums if self.agg == "SUM" else np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+        res: Dict[Any, Any] = {}
+        for i, g in enumerate(labels):
+            if i == len(labels) - 1 and not (codes < 0).any():
+                continue  # no ungrouped rows
+            v = out[i]
+            res[g] = int(v) if self.agg == "COUNT" else (None if np.isnan(v) else float(v))
+        return res
+
+
+def _ratio(num: Any, den: Any) -> Optional[float]:
+    if num is None or not den:
+        return None
+    return float(num) / float(den)
+
+
+class FormulaContext:
+    """
+    Per-match evaluation context: one MaskKernel per source table, so predicates shared
+    across formulas are evaluated once for the whole registry.
+    """
+
+    def __init__(
+        self,
+        events: Union[List[Dict[str, Any]], EventTable],
+        sequences: Optional[Sequence[Any]] = None,
+        possessions: Optional[Sequence[Any]] = None,
+        params: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        self.params = dict(params or {})
+        self._tables: Dict[str, EventTable] = {"events": as_event_table(events)}
+        self._spans = {"sequence": sequences, "possession": possessions}
+        for name, items in self._spans.items():
+            if items is not None:
+                self._tables[name] = _span_table(items)
+        self._kernels: Dict[str, MaskKernel] = {}
+        self._groups: Dict[Tuple[str, str], Tuple[np.ndarray, List[Any]]] = {}
+
+    def kernel(self, source: str) -> MaskKernel:
+        k = self._kernels.get(source)
+        if k is None:
+            if source not in self._tables:
+                raise FormulaError(f"no {source} table in this context")
+            k = self._kernels[source] = MaskKernel(self._tables[source], self.params)
+        return k
+
+    def groups(self, source: str, group_by: str) -> Tuple[np.ndarray, List[Any]]:
+        """
+        (int codes per row, labels); -1 / the trailing None label = row outside any group.
+        """
+        key = (source, group_by)
+        got = self._groups.get(key)
+        if got is not None:
+            return got
+        if group_by not in GROUP_COLUMNS:
+            raise FormulaError(f"unknown group_by: {group_by}")
+        table = self._tables[source]
+        col = next((table.get(c) for c in GROUP_COLUMNS[group_by] if table.get(c) is not None), None)
+        if col is None and source == "events" and self._spans.get(group_by) is not None:
+            col = _span_labels(self._spans[group_by], len(table), f"{group_by}_id")
+        if col is None:
+            got = (np.full(len(table), -1, dtype=np.int32), [None])
+        else:
+            col = col.as_categorical()
+            got = (col.values, list(col.categories) + [None])  # type: ignore[arg-type]
+        self._groups[key] = got
+        return got
+
+
+def _span_table(spans: Sequence[Any]) -> EventTable:
+    # span fields as columns; a SegmentTable's interned columns are used as codes, without
+    # building span objects
+    if not isinstance(spans, SegmentTable):
+        return EventTable.from_records([vars(s) for s in spans])
+    n = len(spans)
+    present = np.ones(n, dtype=bool)
+    coded = [("possession_id", "poss", spans.ids), ("team_id", "team", spans.teams)]
+    if spans.kind == SEQUENCE:
+        coded += [("phase", "phase", spans.phases), ("set_piece_state", "set_piece", spans.set_pieces)]
+    cols = {name: _coded_column(spans.column(code), interned.values) for name, code, interned in coded}
+    cols["start_idx"] = Column(spans.starts.astype(np.int64), present)
+    cols["end_idx"] = Column(spans.ends.astype(np.int64), present)
+    if spans.kind == SEQUENCE:
+        cols["sequence_id"] = Column.from_values(spans.sequence_ids(), present, categorical=True)
+    return EventTable(cols, n)
+
+
+def _coded_column(codes: np.ndarray, values: Sequence[Any]) -> Column:
+    # interned codes -> categorical column over the values actually used, in first-seen order
+    used, first = np.unique(codes, return_index=True)
+    used = used[np.argsort(first)]
+    remap = np.full(len(values), -1, dtype=np.int32)
+    remap[used] = np.arange(len(used), dtype=np.int32)
+    cats = Column.from_values([values[c] for c in used.tolist()], np.ones(len(used), dtype=bool), categorical=True)
+    return cats.take(remap[codes])
+
+
+def _span_labels(spans: Sequence[Any], n: int, id_attr: str) -> Column:
+    # event row -> id of the span (sequence / possession) covering it
+    if isinstance(spans, SegmentTable):
+        bounds = zip(spans.starts.tolist(), spans.ends.tolist())
+        ids = spans.sequence_ids() if id_attr == "sequence_id" else spans.possession_ids()
+    else:
+        bounds = ((s.start_idx, s.end_idx) for s in spans)
+        ids = [getattr(s, id_attr) for s in spans]
+    codes = np.full(n, -1, dtype=np.int32)
+    for i, (start, end) in enumerate(bounds):
+        codes[start:end + 1] = i
+    return Column(values=codes, present=codes >= 0, categories=tuple(ids))
+
+
+# ---- parser ----
+
+class _Parser:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.toks: List[Tuple[str, Any]] = []
+        pos = 0
+        text = text.strip()
+        while pos < len(text):
+            m = _TOKEN.match(text, pos)
+            if not m or m.end() == pos:
+                raise FormulaError(f"unexpected input at {pos}: {text[pos:pos + 20]!r}")
+            pos = m.end()
+            kind = m.lastgroup
+            val = m.group(kind)  # type: ignore[arg-type]
+            if kind == "str":
+                self.toks.append(("str", val[1:-1]))
+            elif kind == "num":
+                self.toks.append(("num", float(val)))
+            elif kind == "name":
+                self.toks.append(("name", val))
+            else:
+                self.toks.append(("op", val))
+        self.i = 0
+        self.sources: set = set()
+
+    def peek(self) -> Tuple[str, Any]:
+        return self.toks[self.i] if self.i < len(self.toks) else ("end", None)
+
+    def take(self) -> Tuple[str, Any]:
+        t = self.peek()
+        self.i += 1
+        return t
+
+    def expect(self, value: str) -> None:
+        kind, v = self.take()
+        if v != value and not (kind == "name" and str(v).upper() == value):
+            raise FormulaError(f"expected {value!r}, got {v!r} in {self.text!r}")
+
+    def keyword(self, *words: str) -> Optional[str]:
+        kind, v = self.peek()
+        if kind == "name" and v.upper() in words:
+            self.i += 1
+            return v.upper()
+        return None
+
+    # formula
+    def formula(self) -> CompiledFormula:
+        kind, v = self.take()
+        agg = str(v).upper() if kind == "name" else ""
+        if agg not in _AGGS:
+            raise FormulaError(f"expected COUNT/SUM/MEAN/RATIO, got {v!r}")
+        agg = "MEAN" if agg == "AVG" else agg
+        self.expect("(")
+        if agg == "RATIO":
+            num = self.formula()
+            self.expect(",")
+            den = self.formula()
+            self.expect(")")
+            return CompiledFormula(text=self.text, agg=agg, source=num.source, parts=(num, den))
+
+        self.sources = set()
+        if agg == "COUNT":
+            source, where = self.source()
+            expr = None
+        else:
+            expr = self.expr()
+            where = ("true",)
+        if self.keyword("WHERE"):
+            pred = self.pred()
+            where = pred if where == ("true",) else ("and", where, pred)
+        self.expect(")")
+        if agg != "COUNT":
+            if len(self.sources) > 1:
+                raise FormulaError(f"columns from several sources: {sorted(self.sources)}")
+            source = next(iter(self.sources), "events")
+        elif self.sources - {source}:
+            raise FormulaError(f"predicate columns outside {source}: {sorted(self.sources)}")
+        return CompiledFormula(text=self.text, agg=agg, source=source, where=where, expr=expr)
+
+    def source(self) -> Tuple[str, Node]:
+        kind, v = self.take()
+        if kind != "name":
+            raise FormulaError(f"expected a source, got {v!r}")
+        name = v.lower()
+        if name in SOURCES:
+            return SOURCES[name], ("true",)
+        return "events", ("==", "event_type", name)  # COUNT(pass ...) = pass events
+
+    # predicates
+    def pred(self) -> Node:
+        node = self.conj()
+        while self.keyword("OR"):
+            node = _flat("or", node, self.conj())
+        return node
+
+    def conj(self) -> Node:
+        node = self.factor()
+        while self.keyword("AND"):
+            node = _flat("and", node, self.factor())
+        return node
+
+    def factor(self) -> Node:
+        if self.keyword("NOT"):
+            return ("not", self.factor())
+        if self.peek() == ("op", "("):
+            # "(" pred ")" or a parenthesised arithmetic operand; try the predicate first
+            save = self.i
+            self.take()
+            try:
+                node = self.pred()
+                self.expect(")")
+                return node
+            except FormulaError:
+                self.i = save
+        return self.comparison()
+
+    def comparison(self) -> Node:
+        lhs = self.expr()
+        op = self.keyword("CONTAINS", "IN")
+        if op is None:
+            kind, op = self.take()
+            if kind != "op" or op not in ("==", "!=", ">=", "<=", ">", "<"):
+                raise FormulaError(f"expected a comparison operator, got {op!r}")
+        if op == "IN":
+            return ("in", self.text_column(lhs), frozenset(s.lower() for s in self.str_list()))
+        if self.peek()[0] == "str":
+            if op not in ("==", "!=", "CONTAINS"):
+                raise FormulaError(f"{op} needs a numeric right-hand side")
+            return ({"CONTAINS": "contains"}.get(op, op), self.text_column(lhs), self.take()[1].lower())
+        if op == "CONTAINS":
+            raise FormulaError("CONTAINS needs a text literal")
+        rhs = self.expr()
+        return ({"==": "eq", "!=": "ne"}.get(op, op), lhs, rhs)
+
+    def text_column(self, operand: Any) -> str:
+        if not isinstance(operand, str):
+            raise FormulaError("text comparison needs a plain column on the left")
+        return operand
+
+    def str_list(self) -> List[str]:
+        self.expect("[")
+        out: List[str] = []
+        while True:
+            kind, v = self.take()
+            if kind != "str":
+                raise FormulaError(f"expected a text literal in list, got {v!r}")
+            out.append(v)
+            if self.peek() == ("op", ","):
+                self.take()
+                continue
+            self.expect("]")
+            return out
+
+    # arithmetic
+    def expr(self) -> Any:
+        node = self.term()
+        while self.peek() in (("op", "+"), ("op", "-")):
+            node = (self.take()[1], node, self.term())
+        return node
+
+    def term(self) -> Any:
+        node = self.atom()
+        while self.peek() in (("op", "*"), ("op", "/")):
+            node = (self.take()[1], node, self.atom())
+        return node
+
+    def atom(self) -> Any:
+        kind, v = self.take()
+        if kind == "num":
+            return ("const", v)
+        if kind == "op" and v == "(":
+            node = self.expr()
+            self.expect(")")
+            return node
+        if kind == "op" and v == "-":
+            return ("-", ("const", 0.0), self.atom())
+        if kind == "name":
+            if v in PARAMS:
+                return ("param", v)
+            src, _, col = v.rpartition(".")
+            if src:
+                if src.lower() not in SOURCES:
+                    raise FormulaError(f"unknown source qualifier: {src}")
+                self.sources.add(SOURCES[src.lower()])
+            return col
+        raise FormulaError(f"unexpected {v!r} in {self.text!r}")
+
+
+def _flat(op: str, a: Node, b: Node) -> Node:
+    # keep and/or chains flat: (or, x, y, z) instead of (or, (or, x, y), z)
+    return (op, *(a[1:] if a[0] == op else (a,)), b)
+
+
+@lru_cache(maxsize=1024)
+def compile_formula(text: str) -> CompiledFormula:
+    """
+    Parse one raw_formula (memoized on the text). Raises FormulaError.
+    """
+    p = _Parser(text)
+    f = p.formula()
+    if p.peek()[0] != "end":
+        raise FormulaError(f"trailing input in {text!r}")
+    return f
+
+
+@dataclass(frozen=True)
+class RegistryPlans:
+    """
+    Compiled raw_formulas of one registry version (metric id -> plan, in registry order).
+    errors: metric id -> why its raw_formula did not compile.
+    code_defined: ids marked "formula_source": "code", whose reported value comes from a
+    built-in predicate (hp_motor.metrics.factory.COUNT_DECLARATIONS) rather than raw_formula.
+    """
+    version: str
+    plans: Mapping[str, CompiledFormula]
+    errors: Mapping[str, str]
+    code_defined: FrozenSet[str] = frozenset()
+
+
+_REGISTRY_PLANS: Dict[str, Tuple[Any, RegistryPlans]] = {}
+
+
+def compile_registry() -> RegistryPlans:
+    """
+    Compile every non-empty raw_formula of the loaded registry once per registry version.
+    The loader returns the same cached index until the file changes, so a version hit
+    is only reused for that very index object.
+    """
+    registry, _ = load_registry_index()
+    hit = _REGISTRY_PLANS.get(registry.version)
+    if hit is not None and hit[0] is registry:
+        return hit[1]
+    plans: Dict[str, CompiledFormula] = {}
+    errors: Dict[str, str] = {}
+    code_defined = frozenset(m["id"] for m in registry.metrics if m.get("formula_source") == "code")
+    for m in registry.metrics:
+        text = str(m.get("raw_formula") or "").strip()
+        if not text:
+            continue
+        try:
+            plans[m["id"]] = compile_formula(text)
+        except FormulaError as e:
+            errors[m["id"]] = str(e)
+    out = RegistryPlans(
+        version=registry.version,
+        plans=MappingProxyType(plans),
+        errors=MappingProxyType(errors),
+        code_defined=code_defined,
+    )
+    _REGISTRY_PLANS[registry.version] = (registry, out)
+    return out
+
+
+def evaluate_registry(
+    events: Union[List[Dict[str, Any]], EventTable],
+    sequences: Optional[Sequence[Any]] = None,
+    possessions: Optional[Sequence[Any]] = None,
+    params: Optional[Mapping[str, float]] = None,
+    group_by: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Value of every executable registry metric for one match, in registry order.
+    Event COUNT metrics use the predicates compute_raw_metrics reports (code-defined ids
+    keep their built-in rule), so shared ids agree with the reported counts. params
+    defaults to the spec's. Metrics whose source table was not supplied (e.g. sequence
+    metrics without sequences) are skipped.
+    """
+    from hp_motor.metrics.factory import count_declarations, metric_params  # factory imports this module
+
+    ctx = FormulaContext(
+        events, sequences=sequences, possessions=possessions,
+        params=metric_params() if params is None else params,
+    )
+    counts = count_declarations()
+    out: Dict[str, Any] = {}
+    for mid, plan in compile_registry().plans.items():
+        if mid in counts and plan.where != counts[mid]:
+            plan = replace(plan, where=counts[mid])
+        try:
+            out[mid] = plan.evaluate(ctx, group_by=group_by)
+        except (FormulaError, KeyError):  # source table or param not supplied
+            continue
+    return out
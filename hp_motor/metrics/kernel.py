@@ -0,0 +1,118 @@
+from __future__ import annotations
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+from hp_motor.ingestion.event_table import EventTable
+
+# Predicate nodes are nested tuples (hashable, so equal sub-predicates are evaluated once):
+#   ("==", col, value)          str(cell).lower() == value   (missing cell reads as "")
+#   ("contains", col, sub)      sub in str(cell).lower()
+#   ("in", col, frozenset)      str(cell).lower() in values
+#   (">=", lhs, rhs)            numeric compare (also >, <=, <, eq, ne); NaN never passes
+#   ("and", n, ...) / ("or", n, ...) / ("not", n) / ("true",)
+# Numeric operands: "col" (float() of the cell, NaN if missing / not numeric),
+# ("const", v), ("param", name), and (op, a, b) with op in + - * /.
+Node = Tuple[Any, ...]
+
+_TEXT_OPS = {
+    "==": lambda s, v: s == v,
+    "!=": lambda s, v: s != v,
+    "contains": lambda s, v: v in s,
+    "in": lambda s, v: s in v,
+}
+_CMP_OPS = {
+    ">=": np.greater_equal,
+    ">": np.greater,
+    "<=": np.less_equal,
+    "<": np.less,
+    "eq": np.equal,
+    "ne": np.not_equal,
+}
+_ARITH_OPS = {
+    "+": np.add,
+    "-": np.subtract,
+    "*": np.multiply,
+    "/": np.divide,
+}
+
+
+class MaskKernel:
+    """
+    Evaluates predicate nodes over one EventTable as boolean row masks.
+
+    Text predicates run once per category of their column; every node's mask is
+    memoized, so metrics sharing a predicate (e.g. event_type == 'pass') pay for it once.
+    """
+
+    def __init__(self, table: EventTable, params: Optional[Mapping[str, float]] = None) -> None:
+        self.table = table
+        self.n = len(table)
+        self.params = dict(params or {})
+        self._memo: Dict[Node, np.ndarray] = {}
+        self._num: Dict[Any, np.ndarray] = {}
+
+    def count(self, node: Node) -> int:
+        return int(self.mask(node).sum())
+
+    def mask(self, node: Node) -> np.ndarray:
+        m = self._memo.get(node)
+        if m is None:
+            m = self._memo[node] = self._eval(node)
+        return m
+
+    def _eval(self, node: Node) -> np.ndarray:
+        op = node[0]
+        if op == "true":
+            return np.ones(self.n, dtype=bool)
+        if op == "and":
+            out = self.mask(node[1]).copy()
+            for sub in node[2:]:
+                out &= self.mask(sub)
+            return out
+        if op == "or":
+            out = self.mask(node[1]).copy()
+            for sub in node[2:]:
+                out |= self.mask(sub)
+            return out
+        if op == "not":
+            return ~self.mask(node[1])
+        if op in _TEXT_OPS:
+            return self._text(op, node[1], node[2])
+        if op in _CMP_OPS:
+            lhs, rhs = self.numeric(node[1]), self.numeric(node[2])
+            with np.errstate(invalid="ignore"):
+                out = _CMP_OPS[op](lhs, rhs)
+            if op == "ne":
+                out &= ~(np.isnan(lhs) | np.isnan(rhs))
+            return out
+        raise ValueError(f"unknown predicate op: {op!r}")
+
+    def _text(self, op: str, name: str, value: Any) -> np.ndarray:
+        fn = _TEXT_OPS[op]
+        col = self.table.get(name)
+        if col is None:
+            return np.full(self.n, bool(fn("", value)), dtype=bool)
+        return col.category_lookup(lambda v: bool(fn(str(v).lower(), value)), "", dtype=bool)
+
+    def numeric(self, operand: Any) -> np.ndarray:
+        """
+        float64 row values of a numeric operand (memoized).
+        """
+        got = self._num.get(operand)
+        if got is not None:
+            return got
+        if isinstance(operand, str):
+            col = self.table.get(operand)
+            out = np.full(self.n, np.nan) if col is None else col.as_float()
+        elif operand[0] == "const":
+            out = np.full(self.n, float(operand[1]))
+        elif operand[0] == "param":
+            out = np.full(self.n, float(self.params[operand[1]]))
+        elif operand[0] in _ARITH_OPS:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out = _ARITH_OPS[operand[0]](self.numeric(operand[1]), self.numeric(operand[2]))
+        else:
+            raise ValueError(f"unknown numeric operand: {operand!r}")
+        self._num[operand] = out
+        return out
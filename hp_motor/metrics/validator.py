@@ -1,7 +1,8 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
-from hp_motor.library.loader import load_registry
+from hp_motor.library.loader import load_registry_index
+from hp_motor.metrics.formula import compile_registry
 
 Status = str  # OK | DEGRADED | UNKNOWN
 
@@ -14,14 +15,18 @@ def _has_columns(events_meta: Dict[str, Any], required: List[str]) -> bool:
 def validate_metrics(
     metrics_raw: Dict[str, Any],
     events_meta: Dict[str, Any],
+    registry_values: Optional[Mapping[str, Any]] = None,
 ) -> Tuple[Dict[str, Any], List[str]]:
     """
     Validate raw metrics against metric_registry contract.
+    registry_values (evaluate_registry output for the same match): a reported metric whose
+    registry formula gives a different value is DEGRADED (registry_formula_mismatch), and
+    raw_formulas that do not compile are flagged.
     Returns:
       validated_metrics_raw, validation_flags
     """
-    registry, reg_health = load_registry()
-    contract = {m["id"]: m for m in registry.get("metrics", [])}
+    registry, reg_health = load_registry_index()
+    contract = registry.by_id
 
     validated = {"meta": dict(metrics_raw.get("meta", {})), "metrics": {}}
     flags: List[str] = []
@@ -39,7 +44,7 @@ def validate_metrics(
             flags.append(f"metric_unknown:{mid}")
             continue
 
-        required_cols = spec.get("required_columns", [])
+        required_cols = list(spec.get("required_columns", []))
         status_policy = spec.get("status_policy", {})
 
         if not required_cols:
@@ -60,22 +65,31 @@ def validate_metrics(
                     status = "UNKNOWN"
                     reason = "required_columns_missing"
 
+        if registry_values is not None and mid in registry_values and registry_values[mid] != value:
+            status = "DEGRADED"
+            reason = "registry_formula_mismatch"
+            flags.append(f"formula_mismatch:{mid}")
+
         validated["metrics"][mid] = {
             "value": value,
             "status": status,
             "reason": reason,
             "contract": {
                 "layer": spec.get("layer"),
-                "mechanisms": spec.get("mechanisms", []),
+                "mechanisms": list(spec.get("mechanisms", [])),
             },
         }
 
         if status != "OK":
             flags.append(f"metric_status:{mid}:{status}")
 
+    if registry_values is not None:
+        flags.extend(f"formula_error:{mid}" for mid in compile_registry().errors)
+
     # propagate registry health
     if reg_health.status != "OK":
         flags.append("registry:" + reg_health.status)
         flags.extend(reg_health.flags)
 
     return validated, flags
+
@@ -0,0 +1,195 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from hp_motor.library.loader import user_cache_dir
+
+_VERSION = 1
+
+# dir (relative to the root, "" = root) -> (mtime_ns, entry names, subdir names); names in scandir order
+Tree = Dict[str, Tuple[int, List[str], List[str]]]
+
+
+def _join(rel: str, name: str) -> str:
+    return f"{rel}/{name}" if rel else name
+
+
+def _scan_dir(root: Path, rel: str) -> Optional[Tuple[int, List[str], List[str]]]:
+    path = root / rel if rel else root
+    try:
+        mtime = path.stat().st_mtime_ns
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return None
+    names: List[str] = []
+    subdirs: List[str] = []
+    for e in entries:
+        names.append(e.name)
+        try:
+            # same rule as Path.rglob: follow into real dirs, not dir symlinks
+            if e.is_dir() and not e.is_symlink():
+                subdirs.append(e.name)
+        except OSError:
+            pass
+    return mtime, names, subdirs
+
+
+class FileIndex:
+    """
+    name -> paths under one base directory, persisted under user_cache_dir("file_index")
+    keyed by the resolved root - outside the indexed tree, so writing the index never
+    changes a directory mtime it tracks.
+
+    Lookups are answered from memory; hits are ordered like Path.rglob(name) (pre-order
+    walk). A directory is rescanned only when its mtime changed, and the mtimes are
+    checked only when a lookup misses or its indexed paths are gone - so resolving an
+    indexed name costs a dict lookup and one stat, whatever the size of the tree.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.tree: Tree = {}
+        self._names: Optional[Dict[str, List[str]]] = None
+
+    @property
+    def path(self) -> Path:
+        return user_cache_dir("file_index") / (hashlib.sha1(str(self.root).encode("utf-8")).hexdigest() + ".json")
+
+    def load(self) -> bool:
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                obj = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if (not isinstance(obj, dict) or obj.get("version") != _VERSION or obj.get("root") != str(self.root)
+                or not isinstance(obj.get("dirs"), dict)):
+            return False
+        self.tree = {k: (int(v[0]), list(v[1]), list(v[2])) for k, v in obj["dirs"].items()}
+        self._names = None
+        return True
+
+    def save(self) -> None:
+        path = self.path
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            obj = {"version": _VERSION, "root": str(self.root), "dirs": self.tree}
+            tmp.write_text(json.dumps(obj, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            pass  # no writable cache dir: the in-process index still works
+
+    def rebuild(self) -> None:
+        self.tree = {}
+        self._scan("")
+        self._names = None
+        self.save()
+
+    def refresh(self) -> bool:
+        """
+        Re-list directories whose mtime changed (new, removed or renamed entries); only
+        subdirectories that are new get walked. Returns True if anything changed.
+        """
+        if "" not in self.tree:
+            self.rebuild()
+            return True
+        changed = False
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            node = self.tree.get(rel)
+            try:
+                mtime = (self.root / rel if rel else self.root).stat().st_mtime_ns
+            except OSError:
+                mtime = None
+            if node is not None and mtime == node[0]:
+                stack.extend(_join(rel, d) for d in node[2])
+                continue
+            changed = True
+            fresh = _scan_dir(self.root, rel) if mtime is not None else None
+            if fresh is None:
+                self._drop(rel)
+                continue
+            old = set(node[2]) if node is not None else set()
+            for d in old - set(fresh[2]):
+                self._drop(_join(rel, d))
+            self.tree[rel] = fresh
+            for d in fresh[2]:
+                if d in old:
+                    stack.append(_join(rel, d))
+                else:
+                    self._scan(_join(rel, d))
+        if changed:
+            self._names = None
+            self.save()
+        return changed
+
+    def _drop(self, rel: str) -> None:
+        node = self.tree.pop(rel, None)
+        if node is not None:
+            for d in node[2]:
+                self._drop(_join(rel, d))
+
+    def _scan(self, rel: str) -> None:
+        stack = [rel]
+        while stack:
+            cur = stack.pop()
+            node = _scan_dir(self.root, cur)
+            if node is None:
+                continue
+            self.tree[cur] = node
+            stack.extend(_join(cur, d) for d in reversed(node[2]))
+
+    def _name_map(self) -> Dict[str, List[str]]:
+        if self._names is None:
+            names: Dict[str, List[str]] = {}
+            stack = [""]
+            while stack:
+                rel = stack.pop()
+                node = self.tree.get(rel)
+                if node is None:
+                    continue
+                for n in node[1]:
+                    names.setdefault(n, []).append(_join(rel, n))
+                stack.extend(_join(rel, d) for d in reversed(node[2]))
+            self._names = names
+        return self._names
+
+    def _first_existing(self, name: str) -> Optional[str]:
+        for rel in self._name_map().get(name, ()):
+            if (self.root / rel).exists():
+                return rel
+        return None
+
+    def find(self, name: str) -> Optional[str]:
+        """
+        Root-relative path of the first entry named `name` (Path.rglob order), or None.
+        """
+        hit = self._first_existing(name)
+        if hit is None and self.refresh():
+            hit = self._first_existing(name)
+        return hit
+
+
+# resolved root -> FileIndex, shared by every source of every run in this process
+_INDEXES: Dict[str, FileIndex] = {}
+
+
+def file_index(base_dir: Path, rebuild: bool = False) -> FileIndex:
+    """
+    The FileIndex of base_dir: from this process, else from its index file, else a fresh walk.
+    rebuild=True walks the tree again and rewrites the index file.
+    """
+    root = Path(base_dir).resolve()
+    idx = _INDEXES.get(str(root))
+    if idx is None:
+        idx = _INDEXES[str(root)] = FileIndex(root)
+        if not rebuild and not idx.load():
+            idx.rebuild()
+    if rebuild:
+        idx.rebuild()
+    return idx
@@ -11,8 +11,9 @@ from hp_motor.engine.extract import extract_team_metrics
 from hp_motor.diagnostics.dictionary import load_dictionary, build_alias_map
 from hp_motor.diagnostics.inventory import load_inventory, allowed_sheets_for_corr
 from hp_motor.semantics.tagger import load_6faz_map, build_6faz_index, tag_metric
-from hp_motor.semantics.dictionary_enrich import load_dictionary as load_metric_dictionary, enrich as enrich_metric
+from hp_motor.semantics.dictionary_enrich import load_dictionary as load_metric_dictionary, enrich_many as enrich_metrics
 from hp_motor.engine.match_stats import extract_team_match_stats
+from hp_motor.pipeline.file_index import file_index
 
 def _find_source_file(base_dir: Path, rel_path: str) -> Path | None:
     # spec'teki path genelde dosya adıdır; base_dir içinde ararız
@@ -21,12 +22,18 @@ def _find_source_file(base_dir: Path, rel_path: str) -> Path | None:
         return cand
     # fallback: sadece file name ile ara
     name = Path(rel_path).name
-    hits = list(base_dir.rglob(name))
-    return hits[0] if hits else None
-
-def run(spec_path: str, base_dir: str, out_path: str, team_names: list[str]) -> Dict[str, Any]:
+    if any(ch in name for ch in "*?["):
+        # glob pattern, not a file name: the index only answers exact names
+        hits = list(base_dir.rglob(name))
+        return hits[0] if hits else None
+    rel = file_index(base_dir).find(name)
+    return base_dir / rel if rel is not None else None
+
+def run(spec_path: str, base_dir: str, out_path: str, team_names: list[str], rebuild_index: bool = False) -> Dict[str, Any]:
     spec = load_spec(spec_path)
     base = Path(base_dir)
+    if rebuild_index:
+        file_index(base, rebuild=True)
 
     dict_path = base / "hp_motor/data/metric_dictionary.csv"
     inv_path  = base / "hp_motor/data/data_inventory.csv"
@@ -116,15 +123,13 @@ def run(spec_path: str, base_dir: str, out_path: str, team_names: list[str]) ->
         if not match_stats_added:
             report['degraded'].append('No match-stats xlsx source loaded -> Shots/xG may remain UNKNOWN (expected for event-only).')
 
-        enriched = []
-        for m in reg:
-            d = m.as_dict()
+        enriched = [m.as_dict() for m in reg]
+        metas = enrich_metrics([d.get('name', '') for d in enriched], dict_df)
+        for d, meta in zip(enriched, metas):
             faz = tag_metric(d.get('name', ''), faz_idx)
             d['phase_id'] = faz.get('phase_id')
             d['metric_role'] = faz.get('metric_role')
-            meta = enrich_metric(d.get('name', ''), dict_df)
             d.update(meta)
-            enriched.append(d)
         report['teams'][t] = enriched
 
     # 4) inventory gate (şimdilik sadece rapora koyuyoruz; corr engine sonra)
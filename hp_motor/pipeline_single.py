@@ -1,16 +1,19 @@
 from __future__ import annotations
 
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 
-from hp_motor.ingestion.loaders import load_events
+from hp_motor.ingestion.event_table import EventTable
+from hp_motor.ingestion.loaders import iter_event_chunks, iter_raw_events, load_events, read_csv_table
 from hp_motor.ingestion.normalizers import normalize_events
 from hp_motor.library import library_health
 from hp_motor.segmentation.set_piece_state import tag_set_piece_state
 from hp_motor.segmentation.phase_tagger import tag_phases
-from hp_motor.segmentation.possessions import segment_possessions
-from hp_motor.segmentation.sequences import segment_sequences
-from hp_motor.metrics.factory import compute_raw_metrics
+from hp_motor.segmentation.possessions import iter_possessions, possession_table
+from hp_motor.segmentation.sequences import sequence_table
+from hp_motor.metrics.factory import compute_raw_metrics, merge_raw_metrics
+from hp_motor.metrics.formula import evaluate_registry
 from hp_motor.metrics.validator import validate_metrics
 from hp_motor.context.engine import apply_context
 from hp_motor.report.generator import generate_report
@@ -43,17 +46,26 @@ def _popper(events: List[Dict[str, Any]]) -> Dict[str, Any]:
     return {"status": "OK", "hard_errors": [], "flags": []}
 
 
-def run_pipeline(events_path: Path, vendor: str = "generic") -> Dict[str, Any]:
-    raw_events = load_events(events_path)
-    pop = _popper(raw_events)
-    lib_h = library_health()
-
+def assemble_report(
+    pop: Dict[str, Any],
+    lib_h: Any,
+    n_events: int,
+    n_possessions: int = 0,
+    n_sequences: int = 0,
+    metrics_raw: Optional[Dict[str, Any]] = None,
+    registry_values: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Popper verdict + segmentation counts + RAW counts -> validated report
+    (shared by run_pipeline and the live engine). registry_values: evaluate_registry output,
+    cross-checked against the reported counts.
+    """
     if pop["status"] == "BLOCKED":
         report = generate_report(
             popper_status="BLOCKED",
             hard_errors=pop["hard_errors"],
             flags=[],
-            events_summary={"n_events": len(raw_events)},
+            events_summary={"n_events": n_events},
             metrics_raw={},
             metrics_adjusted={},
             context_flags=["library:" + lib_h.status] + lib_h.flags,
@@ -61,21 +73,13 @@ def run_pipeline(events_path: Path, vendor: str = "generic") -> Dict[str, Any]:
         validate_report(report)
         return report
 
-    events = normalize_events(raw_events, vendor=vendor)
-    events = tag_set_piece_state(events)
-    events = tag_phases(events)
-
-    possessions = segment_possessions(events)
-    sequences = segment_sequences(events, possessions)
-
-    # RAW metrics
-    metrics_raw = compute_raw_metrics(events)
+    metrics_raw = metrics_raw if metrics_raw is not None else compute_raw_metrics([])
     metrics_raw.setdefault("meta", {})
     metrics_raw["meta"].update(
         {
             "segmentation": {
-                "n_possessions": len(possessions),
-                "n_sequences": len(sequences),
+                "n_possessions": n_possessions,
+                "n_sequences": n_sequences,
             }
         }
     )
@@ -84,6 +88,7 @@ def run_pipeline(events_path: Path, vendor: str = "generic") -> Dict[str, Any]:
     validated_raw, validation_flags = validate_metrics(
         metrics_raw=metrics_raw,
         events_meta={"columns_present": metrics_raw["meta"].get("columns_present", [])},
+        registry_values=registry_values,
     )
 
     # CONTEXT (identity v0)
@@ -101,9 +106,9 @@ def run_pipeline(events_path: Path, vendor: str = "generic") -> Dict[str, Any]:
         hard_errors=[],
         flags=[],
         events_summary={
-            "n_events": len(events),
-            "n_possessions": len(possessions),
-            "n_sequences": len(sequences),
+            "n_events": n_events,
+            "n_possessions": n_possessions,
+            "n_sequences": n_sequences,
         },
         metrics_raw=validated_raw,
         metrics_adjusted=metrics_adj,
@@ -111,3 +116,68 @@ def run_pipeline(events_path: Path, vendor: str = "generic") -> Dict[str, Any]:
     )
     validate_report(report)
     return report
+
+
+def run_pipeline(events_path: Path, vendor: str = "generic") -> Dict[str, Any]:
+    lib_h = library_health()
+    if events_path.suffix.lower() == ".csv":
+        # every row carries the header's keys, so the popper only needs the first 50 rows;
+        # the table comes from the compiled projection plan (no per-event dicts)
+        pop = _popper(list(islice(iter_raw_events(events_path), 50)))
+        if pop["status"] == "BLOCKED":
+            return assemble_report(pop, lib_h, sum(1 for _ in iter_raw_events(events_path)))
+        events = read_csv_table(events_path, vendor=vendor)
+    else:
+        raw_events = load_events(events_path)
+        pop = _popper(raw_events)
+        if pop["status"] == "BLOCKED":
+            return assemble_report(pop, lib_h, len(raw_events))
+        events = normalize_events(EventTable.from_records(raw_events), vendor=vendor)
+
+    # columnar core: every stage below works on the EventTable natively
+    events = tag_set_piece_state(events)
+    events = tag_phases(events)
+
+    # segment tables: counts only, no per-segment objects
+    possessions = possession_table(events)
+    sequences = sequence_table(events, possessions)
+
+    return assemble_report(
+        pop, lib_h, len(events),
+        n_possessions=len(possessions),
+        n_sequences=len(sequences),
+        metrics_raw=compute_raw_metrics(events),
+        registry_values=evaluate_registry(events, sequences=sequences, possessions=possessions),
+    )
+
+
+def iter_match_metrics(
+    events_path: Path, vendor: str = "generic", chunk_size: int = 50_000
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming variant for multi-match dumps (.jsonl/.csv): yields one summary per match
+    ({match_id, events_summary, metrics_raw}) with memory bounded by chunk_size.
+    Normalization, possession segmentation and RAW counts run chunk by chunk.
+    """
+    chunks = iter_event_chunks(events_path, chunk_size=chunk_size, vendor=vendor)
+    for first in chunks:
+        n_events = 0
+        parts: List[Dict[str, Any]] = []
+
+        def _match_tables(c=first):
+            # chunks of the current match only; RAW counts are taken per chunk on the way
+            nonlocal n_events
+            while True:
+                n_events += len(c.table)
+                parts.append(compute_raw_metrics(c.table))
+                yield c.table
+                if c.last:
+                    return
+                c = next(chunks)
+
+        n_possessions = sum(1 for _ in iter_possessions(_match_tables()))
+        yield {
+            "match_id": first.match_id,
+            "events_summary": {"n_events": n_events, "n_possessions": n_possessions},
+            "metrics_raw": merge_raw_metrics(parts),
+        }
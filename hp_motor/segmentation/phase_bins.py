@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from hp_motor.semantics.polarity import EXACT, polarity_index
+
+# Time-binned possession / momentum phases over core events (convert_city_gs_to_core schema:
+# half, t_start [s], team_name, event_id, action_label). One sorted pass yields every
+# resolution; coarser views can also be rolled up from a finer frame without re-reading.
+
+RESOLUTIONS = (5.0, 60.0, 300.0)  # seconds
+
+ATT_HIGH = 0.65
+DEF_LOW = 0.35
+MOM_POS = 1
+MOM_NEG = -1
+
+ROLLUP_SW_TH = 22        # 5s -> 5min rollup: switch_count threshold for defence-B (p70-80 band)
+ROLLUP_MOM_DEF_B_MAX = 0 # defence-B momentum brake
+
+BIN_COLS = [
+    "half", "bin", "team_name", "event_count", "mom_sum", "total_events", "switch_count",
+    "mom_bin_total", "possession_share_proxy", "transition_index", "phase_label_v3",
+    "teams_active", "phase_label_v7",
+]
+
+
+def event_momentum(labels: pd.Series, positive: Iterable[str], negative: Iterable[str]) -> np.ndarray:
+    """
+    +1 / -1 / 0 per event: stripped, lower-cased label in the positive / negative set
+    (positive wins). See hp_motor.semantics.polarity (exact mode).
+    """
+    return polarity_index(positive, negative, mode=EXACT).score(labels)
+
+
+def label_v3(share: np.ndarray, mom: np.ndarray, low_poss: float, high_poss: float,
+             low_mom: float, high_mom: float) -> np.ndarray:
+    return np.select(
+        [
+            ((share >= high_poss) & (mom >= 0)) | ((mom >= high_mom) & (share >= 0.5)),
+            ((share <= low_poss) & (mom <= 0)) | ((mom <= low_mom) & (share <= 0.5)),
+        ],
+        ["attack", "defence"],
+        "transition",
+    ).astype(object)
+
+
+def label_v7(share: np.ndarray, mom: np.ndarray, switches: np.ndarray, teams_active: np.ndarray,
+             sw_min: int = 1, mom_def_b_max: Optional[float] = None) -> np.ndarray:
+    """
+    v7 rules. Attack: share >= ATT_HIGH, or mom >= MOM_POS with share >= 0.5.
+    Defence: share <= DEF_LOW and (mom <= MOM_NEG, or both teams active with
+    >= sw_min switches [and mom <= mom_def_b_max when given]). Else transition.
+    """
+    low = share <= DEF_LOW
+    busy = (teams_active == 2) & (switches >= sw_min)
+    if mom_def_b_max is not None:
+        busy &= mom <= mom_def_b_max
+    return np.select(
+        [(share >= ATT_HIGH) | ((mom >= MOM_POS) & (share >= 0.50)), low & ((mom <= MOM_NEG) | busy)],
+        ["attack", "defence"],
+        "transition",
+    ).astype(object)
+
+
+def _prepare(events: pd.DataFrame, positive: Iterable[str], negative: Iterable[str]) -> pd.DataFrame:
+    df = events.dropna(subset=["team_name"])
+    df = df.sort_values(["half", "t_start", "event_id"], na_position="last").reset_index(drop=True)
+    return pd.DataFrame({
+        "half": df["half"],
+        "t_start": df["t_start"],
+        "team_name": df["team_name"],
+        "has_id": df["event_id"].notna(),
+        "mom_evt": event_momentum(df["action_label"], positive, negative),
+    })
+
+
+def _bin_frame(ev: pd.DataFrame, teams: Sequence[str], team_codes: np.ndarray, seconds: float) -> pd.DataFrame:
+    half = ev["half"].to_numpy()
+    bins = (ev["t_start"] // seconds * seconds).to_numpy()
+    valid = ~(pd.isna(half) | np.isnan(bins))
+
+    # rows are sorted by (half, t_start) with NaNs last, so every (half, bin) group is one run
+    vh, vb, vt = half[valid], bins[valid], team_codes[valid]
+    new_group = np.r_[True, (vh[1:] != vh[:-1]) | (vb[1:] != vb[:-1])] if len(vh) else np.zeros(0, dtype=bool)
+    group = np.cumsum(new_group) - 1
+    n_groups = int(new_group.sum())
+    switch = (~new_group & np.r_[False, vt[1:] != vt[:-1]]).astype(np.int64)
+
+    has_id = ev["has_id"].to_numpy()[valid].astype(np.int64)
+    mom = ev["mom_evt"].to_numpy()[valid]
+    n_teams = len(teams)
+    cell = group * n_teams + vt
+    size = n_groups * n_teams
+
+    event_count = np.bincount(cell, weights=has_id, minlength=size).astype(np.int64)
+    mom_sum = np.bincount(cell, weights=mom, minlength=size).astype(np.int64)
+    total = np.bincount(group, weights=has_id, minlength=n_groups).astype(np.int64)
+    switches = np.bincount(group, weights=switch, minlength=n_groups).astype(np.int64)
+    mom_total = np.bincount(group, weights=mom, minlength=n_groups).astype(np.int64)
+    active = np.add.reduceat((event_count > 0).astype(np.int64), np.arange(0, size, n_teams)) if size else np.zeros(0, np.int64)
+
+    first = np.flatnonzero(new_group)
+    rep = np.repeat
+    out = pd.DataFrame({
+        "half": rep(vh[first], n_teams),
+        "bin": rep(vb[first], n_teams),
+        "team_name": np.tile(np.asarray(teams, dtype=object), n_groups),
+        "event_count": event_count,
+        "mom_sum": mom_sum,
+        "total_events": rep(total, n_teams),
+        "switch_count": rep(switches, n_teams),
+        "mom_bin_total": rep(mom_total, n_teams),
+    })
+    denom = out["total_events"].clip(lower=1)
+    out["possession_share_proxy"] = out["event_count"] / denom
+    out["transition_index"] = out["switch_count"] / denom
+
+    share, m = out["possession_share_proxy"], out["mom_sum"]
+    out["phase_label_v3"] = label_v3(
+        share.to_numpy(), m.to_numpy(),
+        share.quantile(0.40), share.quantile(0.60), m.quantile(0.35), m.quantile(0.65),
+    )
+    out["teams_active"] = rep(active, n_teams)
+    out["phase_label_v7"] = label_v7(share.to_numpy(), m.to_numpy(), out["switch_count"].to_numpy(), out["teams_active"].to_numpy())
+    return out
+
+
+def phase_bins(
+    events: pd.DataFrame,
+    positive: Iterable[str],
+    negative: Iterable[str],
+    resolutions: Iterable[float] = RESOLUTIONS,
+) -> Dict[float, pd.DataFrame]:
+    """
+    {seconds: frame} with one row per (half, bin, team) - every team in every bin that
+    has events - in BIN_COLS order. Events are sorted and scored once for all resolutions.
+    Thresholds of the v3 label are per-resolution quantiles.
+    """
+    ev = _prepare(events, positive, negative)
+    codes, teams = pd.factorize(ev["team_name"], sort=True)
+    return {float(s): _bin_frame(ev, teams.tolist(), codes, float(s)) for s in resolutions}
+
+
+def rollup(
+    bins: pd.DataFrame,
+    seconds: float = 300.0,
+    sw_min: int = ROLLUP_SW_TH,
+    mom_def_b_max: Optional[float] = ROLLUP_MOM_DEF_B_MAX,
+) -> pd.DataFrame:
+    """
+    Fine bins -> (team_name, half, bin) every `seconds`: mean share proxy, summed
+    momentum / switches / events, max teams_active, relabelled with v7 rules
+    (phase_label_v7_<n>m or _<n>s).
+    """
+    coarse = (np.floor(bins["bin"] / seconds) * seconds).astype(int)
+    agg = bins.assign(bin=coarse).groupby(["team_name", "half", "bin"]).agg(
+        possession_share_proxy=("possession_share_proxy", "mean"),
+        mom_sum=("mom_sum", "sum"),
+        switch_count=("switch_count", "sum"),
+        teams_active=("teams_active", "max"),
+        event_count=("event_count", "sum"),
+    ).reset_index()
+    suffix = f"{int(seconds // 60)}m" if seconds % 60 == 0 else f"{int(seconds)}s"
+    agg[f"phase_label_v7_{suffix}"] = label_v7(
+        agg["possession_share_proxy"].to_numpy(), agg["mom_sum"].to_numpy(),
+        agg["switch_count"].to_numpy(), agg["teams_active"].to_numpy(),
+        sw_min=sw_min, mom_def_b_max=mom_def_b_max,
+    )
+    return agg
@@ -4,7 +4,7 @@
 from __future__ import annotations
 from typing import Any, Optional
 
-from .set_piece_state import tag_set_piece_state
+from .set_piece_state import map_unique, tag_set_piece_state
 
 P1 = "P1_BUILDUP"
 P2 = "P2_PROGRESSION"
@@ -80,6 +80,163 @@ def _event_phase(event_type: str, outcome: str) -> Optional[str]:
 
     return None
 
+# keyword classes behind _event_phase, evaluated once per distinct value
+def _is_final(event_type: Any) -> bool:
+    et = _norm(event_type)
+    return any(k in et for k in FINAL_ACTIONS)
+
+def _is_def(event_type: Any) -> bool:
+    et = _norm(event_type)
+    return any(k in et for k in DEF_ACTIONS)
+
+def _is_carrier(event_type: Any) -> bool:
+    et = _norm(event_type)
+    return "pass" in et or "carry" in et or "dribble" in et or "touch" in et or "loss" in et
+
+def _is_turnover_outcome(outcome: Any) -> bool:
+    oc = _norm(outcome)
+    return any(k in oc for k in TURNOVER_OUTCOMES)
+
+def _infer_row(r) -> Optional[str]:
+    """
+    Row-wise reference of the pandas rules (kept for equivalence checks and benchmarks).
+    """
+    et = r.get("event_type", None)
+    oc = r.get("outcome", None)
+    sx = r.get("start_x", None)
+    ex = r.get("end_x", None)
+    poss_changed = bool(r.get("_poss_changed", False))
+    dt = r.get("_dt", 9999)
+
+    ep = _event_phase(et, oc)
+
+    if poss_changed and dt <= 8:
+        return P6
+    if ep == P4:
+        return P4
+    if ep == P5:
+        return P5
+    if ep == P3:
+        return P3
+
+    x = _to_float(ex) if ex is not None else _to_float(sx)
+    return _zone_phase(x)
+
+# np.select codes -> phase_id
+_PHASE_BY_CODE = (P6, P4, P5, P3, P1, P2, P3, None)
+
+def _pd_coord(df, col):
+    """
+    pandas: (is_none, x, valid) for one coordinate column, mirroring
+    `r.get(col)` + `_to_float`: None -> is_none, unparsable -> not valid, NaN stays valid.
+    """
+    import numpy as np
+    import pandas as pd  # type: ignore
+    from operator import is_
+    from itertools import repeat
+
+    n = len(df)
+    if col not in df.columns:
+        return np.ones(n, dtype=bool), np.full(n, np.nan), np.zeros(n, dtype=bool)
+
+    s = df[col]
+    if s.dtype.kind in "biuf":
+        return np.zeros(n, dtype=bool), s.to_numpy(dtype=float), np.ones(n, dtype=bool)
+
+    arr = s.to_numpy(dtype=object)
+    is_none = np.fromiter(map(is_, arr, repeat(None)), dtype=bool, count=n)
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    conv = [_to_float(u) for u in uniques]
+    table = np.array([np.nan if v is None else v for v in conv] + [np.nan], dtype=float)
+    ok = np.array([v is not None for v in conv] + [False], dtype=bool)
+    x, valid = table[codes], ok[codes]
+
+    # NA rows (None / NaN / pd.NA) differ per row: NaN is a valid float, the others are not
+    na = np.flatnonzero(codes < 0)
+    if len(na):
+        na_conv = [_to_float(v) for v in arr[na]]
+        valid[na] = [v is not None for v in na_conv]
+        x[na] = [np.nan if v is None else v for v in na_conv]
+    return is_none, x, valid
+
+def _pd_phase_ids(df):
+    import numpy as np
+
+    n = len(df)
+    et = df["event_type"]
+    is_final = map_unique(et, _is_final, dtype=bool)
+    is_def = map_unique(et, _is_def, dtype=bool)
+    is_carrier = map_unique(et, _is_carrier, dtype=bool)
+    if "outcome" in df.columns:
+        turnover_oc = map_unique(df["outcome"], _is_turnover_outcome, dtype=bool)
+    else:
+        turnover_oc = np.zeros(n, dtype=bool)
+
+    ep3 = is_final
+    ep5 = ~is_final & is_def
+    ep4 = ~is_final & ~is_def & turnover_oc & is_carrier
+
+    ex_none, ex, ex_ok = _pd_coord(df, "end_x")
+    _, sx, sx_ok = _pd_coord(df, "start_x")
+    x = np.where(ex_none, sx, ex)
+    x_ok = np.where(ex_none, sx_ok, ex_ok)
+    with np.errstate(invalid="ignore"):
+        xn = np.where(x > 105, (x / 120.0) * 100.0, x)
+        zone1 = x_ok & (xn <= 35)
+        zone2 = x_ok & (xn <= 70)
+
+    p6 = df["_poss_changed"].to_numpy(dtype=bool) & (df["_dt"].to_numpy(dtype=float) <= 8)
+
+    codes = np.select([p6, ep4, ep5, ep3, zone1, zone2, x_ok], list(range(7)), default=7)
+    lookup = np.empty(len(_PHASE_BY_CODE), dtype=object)
+    lookup[:] = _PHASE_BY_CODE
+    return lookup[codes]
+
+def _pl_phase_expr(df):
+    """
+    polars: same rules as a single when/then expression. Keyword classes are resolved over
+    the distinct event_type / outcome values and applied with is_in.
+    """
+    import polars as pl  # type: ignore
+
+    cols = set(df.columns)
+
+    def _in(col, pred):
+        if col not in cols:
+            return pl.lit(False)
+        vals = [v for v in df.get_column(col).unique().to_list() if v is not None and pred(v)]
+        return pl.col(col).is_in(vals) if vals else pl.lit(False)
+
+    is_final = _in("event_type", _is_final)
+    is_def = _in("event_type", _is_def)
+    ep4 = is_final.not_() & is_def.not_() & _in("outcome", _is_turnover_outcome) & _in("event_type", _is_carrier)
+
+    xs = [pl.col(c).cast(pl.Float64, strict=False) for c in ("end_x", "start_x") if c in cols]
+    if len(xs) == 2:
+        x = pl.when(pl.col("end_x").is_not_null()).then(xs[0]).otherwise(xs[1])
+    elif "end_x" in cols:
+        x = xs[0]
+    elif xs:
+        x = xs[0]
+    else:
+        x = pl.lit(None, dtype=pl.Float64)
+    xn = pl.when(x > 105).then((x / 120.0) * 100.0).otherwise(x)
+
+    # row rule used `dt or 9999`, so dt == 0 never opened a P6 window on this path
+    dt = pl.col("_dt")
+    p6 = pl.col("_poss_changed").fill_null(False) & (dt != 0) & (dt <= 8)
+
+    return (
+        pl.when(p6).then(pl.lit(P6))
+        .when(ep4).then(pl.lit(P4))
+        .when(is_def & is_final.not_()).then(pl.lit(P5))
+        .when(is_final).then(pl.lit(P3))
+        .when(x.is_null()).then(pl.lit(None, dtype=pl.Utf8))
+        .when(xn <= 35).then(pl.lit(P1))
+        .when(xn <= 70).then(pl.lit(P2))
+        .otherwise(pl.lit(P3))
+    )
+
 def tag_phases(df):
     """
     Adds/normalizes:
@@ -87,6 +244,8 @@ def tag_phases(df):
       - phase_id (P1..P6)
     Deterministic rules for fixture schema:
       uses: minute, second, possession_id, team_id, event_type, outcome, start_x/end_x
+    Vectorized: keyword rules are evaluated once per distinct event_type/outcome and
+    phase_id is assigned with column masks (see _infer_row for the row-wise rules).
     """
     df = tag_set_piece_state(df)
 
@@ -127,41 +286,7 @@ def tag_phases(df):
                     pl.lit(9999).alias("_dt")
                 ])
 
-            # base phase inference
-            def infer_row(r):
-                et = r.get("event_type")
-                oc = r.get("outcome")
-                sx = r.get("start_x")
-                ex = r.get("end_x")
-                poss_changed = bool(r.get("_poss_changed"))
-                dt = r.get("_dt") or 9999
-
-                # 1) quick event-based
-                ep = _event_phase(et, oc)
-
-                # 2) possession change => positive transition window
-                if poss_changed and dt <= 8:
-                    return P6
-
-                # 3) neg transition trigger
-                if ep == P4:
-                    return P4
-
-                # 4) defensive action
-                if ep == P5:
-                    return P5
-
-                # 5) final action
-                if ep == P3:
-                    return P3
-
-                # 6) zone-based
-                x = _to_float(ex) if ex is not None else _to_float(sx)
-                return _zone_phase(x)
-
-            df = df.with_columns(
-                pl.struct(df.columns).map_elements(infer_row, return_dtype=pl.Utf8).alias("phase_id")
-            )
+            df = df.with_columns(_pl_phase_expr(df).alias("phase_id"))
 
             # cleanup helper cols (keep optional if you want)
             df = df.drop([c for c in ["_t","_prev_poss","_prev_team","_prev_t","_poss_changed","_dt"] if c in df.columns])
@@ -192,29 +317,7 @@ def tag_phases(df):
                 df["_poss_changed"] = False
                 df["_dt"] = 9999
 
-            def infer(r):
-                et = r.get("event_type", None)
-                oc = r.get("outcome", None)
-                sx = r.get("start_x", None)
-                ex = r.get("end_x", None)
-                poss_changed = bool(r.get("_poss_changed", False))
-                dt = r.get("_dt", 9999)
-
-                ep = _event_phase(et, oc)
-
-                if poss_changed and dt <= 8:
-                    return P6
-                if ep == P4:
-                    return P4
-                if ep == P5:
-                    return P5
-                if ep == P3:
-                    return P3
-
-                x = _to_float(ex) if ex is not None else _to_float(sx)
-                return _zone_phase(x)
-
-            df["phase_id"] = df.apply(infer, axis=1)
+            df["phase_id"] = _pd_phase_ids(df)
 
             # cleanup
             for c in ["_t","_prev_poss","_prev_t","_poss_changed","_dt"]:
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from hp_motor.ingestion.event_table import EventTable, as_event_table
+from hp_motor.segmentation.segment_table import POSSESSION, SegmentTable
 
 
 @dataclass
@@ -12,7 +17,64 @@ class Possession:
     end_idx: int
 
 
-def segment_possessions(events: List[Dict[str, Any]]) -> List[Possession]:
+def _possession_keys(table: EventTable) -> tuple[np.ndarray, List[str]]:
+    """
+    Per-row possession key codes + key strings.
+    possession_id (stringified) when set, else fallback_team_<team_id>.
+    """
+    n = len(table)
+    keys: Dict[str, int] = {}
+
+    def _code(k: str) -> int:
+        return keys.setdefault(k, len(keys))
+
+    team = table.get("team_id")
+    if team is not None:
+        team = team.as_categorical()
+        team_map = np.array([_code(f"fallback_team_{t}") for t in team.categories] + [_code("fallback_team_NA")])
+        row_codes = team_map[team.values]
+    else:
+        row_codes = np.full(n, _code("fallback_team_NA"))
+
+    pid = table.get("possession_id")
+    if pid is not None:
+        pid = pid.as_categorical()
+        valid = np.array([c not in (None, "") for c in pid.categories] + [False], dtype=bool)
+        pid_map = np.array([_code(str(c)) if ok else -1 for c, ok in zip(pid.categories, valid)] + [-1])
+        use = valid[pid.values]
+        row_codes = np.where(use, pid_map[pid.values], row_codes)
+
+    return row_codes, list(keys)
+
+
+def possession_table(events: Union[List[Dict[str, Any]], EventTable]) -> SegmentTable:
+    """
+    segment_possessions as a SegmentTable (no per-possession objects).
+    """
+    table = as_event_table(events)
+    n = len(table)
+    if not n:
+        return SegmentTable(POSSESSION)
+
+    codes, names = _possession_keys(table)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:] - 1, n - 1]
+
+    team = table.get("team_id")
+    if team is not None:
+        team = team.as_categorical()
+        teams = list(team.categories) + [None]  # type: ignore[arg-type]
+        team_codes = team.values[starts]
+        team_codes = np.where(team_codes < 0, len(teams) - 1, team_codes)
+    else:
+        teams, team_codes = [None], np.zeros(len(starts), dtype=np.int32)
+    return SegmentTable.from_columns(
+        POSSESSION, names, teams,
+        {"poss": codes[starts], "team": team_codes, "start": starts, "end": ends},
+    )
+
+
+def segment_possessions(events: Union[List[Dict[str, Any]], EventTable]) -> List[Possession]:
     """
     Deterministic lite possession segmentation.
 
@@ -20,42 +82,103 @@ def segment_possessions(events: List[Dict[str, Any]]) -> List[Possession]:
     - If possession_id exists: contiguous runs
     - Else: fallback to team_id runs (DEGRADED but stable)
     """
-    if not events:
-        return []
+    return possession_table(events).to_list()
+
+
+def iter_possessions(chunks: Iterable[Union[List[Dict[str, Any]], EventTable]]) -> Iterator[Possession]:
+    """
+    Segment consecutive chunks of one event stream. Indices are global across chunks and
+    a possession spanning a chunk boundary is emitted once, after it closes — the result
+    equals segment_possessions over the concatenated events.
+    """
+    offset = 0
+    open_p: Possession | None = None
+    for chunk in chunks:
+        ps = segment_possessions(chunk)
+        n = len(chunk)
+        if ps:
+            ps = [Possession(p.possession_id, p.team_id, p.start_idx + offset, p.end_idx + offset) for p in ps]
+            if open_p is not None:
+                if ps[0].possession_id == open_p.possession_id:
+                    ps[0] = Possession(open_p.possession_id, open_p.team_id, open_p.start_idx, ps[0].end_idx)
+                else:
+                    yield open_p
+            yield from ps[:-1]
+            open_p = ps[-1]
+        offset += n
+    if open_p is not None:
+        yield open_p
 
-    possessions: List[Possession] = []
 
-    def _pid(i: int) -> str:
-        pid = events[i].get("possession_id")
-        if pid in (None, ""):
-            return f"fallback_team_{events[i].get('team_id', 'NA')}"
+def possession_key(event: Dict[str, Any]) -> str:
+    """
+    segment_possessions key of one (normalized) event.
+    """
+    pid = event.get("possession_id")
+    if pid not in (None, ""):
         return str(pid)
+    return f"fallback_team_{event['team_id']}" if "team_id" in event else "fallback_team_NA"
 
-    cur_pid = _pid(0)
-    cur_team = events[0].get("team_id")
-    start = 0
-
-    for i in range(1, len(events)):
-        pid = _pid(i)
-        if pid != cur_pid:
-            possessions.append(
-                Possession(
-                    possession_id=cur_pid,
-                    team_id=cur_team,
-                    start_idx=start,
-                    end_idx=i - 1,
-                )
-            )
-            cur_pid = pid
-            cur_team = events[i].get("team_id")
-            start = i
-
-    possessions.append(
-        Possession(
-            possession_id=cur_pid,
-            team_id=cur_team,
-            start_idx=start,
-            end_idx=len(events) - 1,
-        )
-    )
-    return possessions
+
+class PossessionSegmenter:
+    """
+    Stateful segment_possessions for event streams (live feeds, long matches).
+
+    feed() takes normalized events in row order and returns the possession it closed, if
+    any; flush() closes the last one at the end of the stream. Only the open possession is
+    kept in memory. state() / from_state() checkpoint and resume it (JSON-serializable as
+    long as team ids are).
+    With `out`, closed possessions are appended to that SegmentTable instead of returned.
+    """
+
+    def __init__(self, out: Optional[SegmentTable] = None) -> None:
+        self.n = 0  # events seen (global row index of the next one)
+        self._open: Optional[List[Any]] = None  # [possession_id, team_id, start_idx]
+        self.out = out
+
+    def _close(self, end_idx: int) -> List[Possession]:
+        key, team, start = self._open  # type: ignore[misc]
+        if self.out is not None:
+            self.out.append(key, team, start, end_idx)
+            return []
+        return [Possession(key, team, start, end_idx)]
+
+    def feed(self, event: Dict[str, Any]) -> List[Possession]:
+        key = possession_key(event)
+        i = self.n
+        self.n += 1
+        if self._open is not None and key == self._open[0]:
+            return []
+        closed = self._close(i - 1) if self._open is not None else []
+        self._open = [key, event.get("team_id"), i]
+        return closed
+
+    def extend(self, events: Union[List[Dict[str, Any]], EventTable]) -> List[Possession]:
+        if isinstance(events, EventTable):
+            events = events.to_records()
+        closed: List[Possession] = []
+        for e in events:
+            closed.extend(self.feed(e))
+        return closed
+
+    @property
+    def open(self) -> Optional[Possession]:
+        """The open possession as it stands (end_idx = last event seen)."""
+        if self._open is None:
+            return None
+        return Possession(self._open[0], self._open[1], self._open[2], self.n - 1)
+
+    def flush(self) -> List[Possession]:
+        closed = self._close(self.n - 1) if self._open is not None else []
+        self._open = None
+        return closed
+
+    def state(self) -> Dict[str, Any]:
+        return {"n": self.n, "open": list(self._open) if self._open is not None else None}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], out: Optional[SegmentTable] = None) -> "PossessionSegmenter":
+        seg = cls(out)
+        seg.n = int(state["n"])
+        seg._open = list(state["open"]) if state.get("open") is not None else None
+        return seg
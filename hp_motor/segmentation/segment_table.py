@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+POSSESSION = "possession"
+SEQUENCE = "sequence"
+
+_COLUMNS = {
+    POSSESSION: ("poss", "team", "start", "end"),
+    SEQUENCE: ("poss", "team", "start", "end", "seq", "phase", "set_piece"),
+}
+
+
+class Interned:
+    """
+    Value <-> int code, codes in first-seen order.
+    """
+
+    __slots__ = ("values", "_index")
+
+    def __init__(self, values: Iterable[Any] = ()) -> None:
+        self.values: List[Any] = list(values)
+        self._index: Dict[Any, int] = {v: i for i, v in enumerate(self.values)}
+
+    def code(self, value: Any) -> int:
+        c = self._index.get(value)
+        if c is None:
+            c = self._index[value] = len(self.values)
+            self.values.append(value)
+        return c
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class SegmentTable:
+    """
+    Possessions or sequences as a struct-of-arrays.
+
+    Columns are int32: start / end row indices, poss (code into `ids`, the interned
+    possession ids), team (code into `teams`) and, for sequences, seq (number within the
+    possession), phase / set_piece (codes into `phases` / `set_pieces`).
+    sequence_id strings and Possession / Sequence objects are only built when a caller
+    indexes, iterates or calls to_list().
+
+    Rows are appended one at a time (the stateful segmenters emit here) or set column-wise
+    (from_columns, used by the batch segmenters).
+    """
+
+    __slots__ = ("kind", "_n", "_cols", "ids", "teams", "phases", "set_pieces")
+
+    def __init__(self, kind: str = POSSESSION, capacity: int = 64) -> None:
+        if kind not in _COLUMNS:
+            raise ValueError(f"unknown segment kind: {kind}")
+        self.kind = kind
+        self._n = 0
+        self._cols: Dict[str, np.ndarray] = {c: np.empty(max(1, capacity), dtype=np.int32) for c in _COLUMNS[kind]}
+        self.ids = Interned()
+        self.teams = Interned()
+        self.phases = Interned()
+        self.set_pieces = Interned()
+
+    # ---- construction ----
+    @classmethod
+    def from_columns(
+        cls,
+        kind: str,
+        ids: Sequence[Any],
+        teams: Sequence[Any],
+        columns: Dict[str, np.ndarray],
+        phases: Sequence[Any] = (),
+        set_pieces: Sequence[Any] = (),
+    ) -> "SegmentTable":
+        """
+        Build from code arrays (one per column of `kind`) and their lookup lists.
+        """
+        out = cls(kind, capacity=1)
+        names = _COLUMNS[kind]
+        missing = [c for c in names if c not in columns]
+        if missing:
+            raise ValueError(f"missing segment columns: {missing}")
+        out._cols = {c: np.asarray(columns[c], dtype=np.int32) for c in names}
+        out._n = len(out._cols["start"])
+        out.ids, out.teams = Interned(ids), Interned(teams)
+        out.phases, out.set_pieces = Interned(phases), Interned(set_pieces)
+        return out
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Any], kind: Optional[str] = None) -> "SegmentTable":
+        """
+        Table of Possession / Sequence objects (kind inferred from the first one).
+        """
+        segments = list(segments)
+        if kind is None:
+            kind = SEQUENCE if segments and hasattr(segments[0], "sequence_id") else POSSESSION
+        out = cls(kind, capacity=len(segments))
+        for s in segments:
+            if kind == SEQUENCE:
+                k = int(s.sequence_id.rsplit("_seq_", 1)[1])
+                out.append(s.possession_id, s.team_id, s.start_idx, s.end_idx, k, s.phase, s.set_piece_state)
+            else:
+                out.append(s.possession_id, s.team_id, s.start_idx, s.end_idx)
+        return out
+
+    def append(
+        self,
+        possession_id: str,
+        team_id: Any,
+        start_idx: int,
+        end_idx: int,
+        seq: int = 0,
+        phase: Any = None,
+        set_piece_state: Any = None,
+    ) -> None:
+        i = self._n
+        cols = self._cols
+        if i == len(cols["start"]):
+            for c, arr in cols.items():
+                grown = np.empty(2 * len(arr), dtype=np.int32)
+                grown[:i] = arr[:i]
+                cols[c] = grown
+        cols["poss"][i] = self.ids.code(possession_id)
+        cols["team"][i] = self.teams.code(team_id)
+        cols["start"][i] = start_idx
+        cols["end"][i] = end_idx
+        if self.kind == SEQUENCE:
+            cols["seq"][i] = seq
+            cols["phase"][i] = self.phases.code(phase)
+            cols["set_piece"][i] = self.set_pieces.code(set_piece_state)
+        self._n = i + 1
+
+    # ---- columns ----
+    def __len__(self) -> int:
+        return self._n
+
+    def column(self, name: str) -> np.ndarray:
+        return self._cols[name][: self._n]
+
+    @property
+    def starts(self) -> np.ndarray:
+        return self.column("start")
+
+    @property
+    def ends(self) -> np.ndarray:
+        return self.column("end")
+
+    def possession_ids(self) -> List[str]:
+        ids = self.ids.values
+        return [ids[c] for c in self.column("poss").tolist()]
+
+    def team_ids(self) -> List[Any]:
+        teams = self.teams.values
+        return [teams[c] for c in self.column("team").tolist()]
+
+    def sequence_ids(self) -> List[str]:
+        if self.kind != SEQUENCE:
+            raise ValueError("sequence_ids: not a sequence table")
+        return [f"{p}_seq_{k}" for p, k in zip(self.possession_ids(), self.column("seq").tolist())]
+
+    # ---- materialization ----
+    def to_list(self) -> List[Any]:
+        """Possession / Sequence objects for every row."""
+        starts, ends = self.starts.tolist(), self.ends.tolist()
+        pids, teams = self.possession_ids(), self.team_ids()
+        if self.kind == POSSESSION:
+            from hp_motor.segmentation.possessions import Possession
+
+            return [Possession(p, t, s, e) for p, t, s, e in zip(pids, teams, starts, ends)]
+
+        from hp_motor.segmentation.sequences import Sequence as Seq
+
+        phases, set_pieces = self.phases.values, self.set_pieces.values
+        return [
+            Seq(
+                sequence_id=f"{p}_seq_{k}",
+                possession_id=p,
+                team_id=t,
+                start_idx=s,
+                end_idx=e,
+                phase=phases[ph],
+                set_piece_state=set_pieces[sp],
+            )
+            for p, t, s, e, k, ph, sp in zip(
+                pids, teams, starts, ends,
+                self.column("seq").tolist(), self.column("phase").tolist(), self.column("set_piece").tolist(),
+            )
+        ]
+
+    def __getitem__(self, i: int) -> Any:
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError("segment index out of range")
+        row = {c: int(a[i]) for c, a in self._cols.items()}
+        pid, team = self.ids.values[row["poss"]], self.teams.values[row["team"]]
+        if self.kind == POSSESSION:
+            from hp_motor.segmentation.possessions import Possession
+
+            return Possession(pid, team, row["start"], row["end"])
+
+        from hp_motor.segmentation.sequences import Sequence as Seq
+
+        return Seq(
+            sequence_id=f"{pid}_seq_{row['seq']}",
+            possession_id=pid,
+            team_id=team,
+            start_idx=row["start"],
+            end_idx=row["end"],
+            phase=self.phases.values[row["phase"]],
+            set_piece_state=self.set_pieces.values[row["set_piece"]],
+        )
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(self._n):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        return f"SegmentTable(kind={self.kind}, n={self._n})"
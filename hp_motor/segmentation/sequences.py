@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from hp_motor.segmentation.possessions import Possession
+import numpy as np
+
+from hp_motor.ingestion.event_table import EventTable, as_event_table
+from hp_motor.segmentation.possessions import Possession, possession_key
+from hp_motor.segmentation.segment_table import POSSESSION, SEQUENCE, SegmentTable
 
 
 @dataclass
@@ -17,53 +21,194 @@ class Sequence:
     set_piece_state: str
 
 
+def _carried_codes(table: EventTable, name: str, default: Any, starts: np.ndarray) -> Tuple[np.ndarray, List[Any]]:
+    """
+    Category codes for `name`, carried forward over rows that lack the key.
+    Each possession start without a value falls back to `default`.
+    """
+    n = len(table)
+    col = table.get(name)
+    if col is None:
+        return np.zeros(n, dtype=np.int32), [default]
+
+    col = col.as_categorical()
+    cats = list(col.categories)  # type: ignore[arg-type]
+    try:
+        dflt = cats.index(default)
+    except ValueError:
+        cats.append(default)
+        dflt = len(cats) - 1
+
+    codes = col.values.copy()
+    src = np.where(col.present, np.arange(n), -1)
+    missing_starts = starts[~col.present[starts]]
+    codes[missing_starts] = dflt
+    src[missing_starts] = missing_starts
+    src = np.maximum.accumulate(src)
+    return codes[np.maximum(src, 0)], cats
+
+
+def sequence_table(
+    events: Union[List[Dict[str, Any]], EventTable],
+    possessions: Union[List[Possession], SegmentTable],
+) -> SegmentTable:
+    """
+    segment_sequences as a SegmentTable (no per-sequence objects or id strings).
+    """
+    if not len(possessions):
+        return SegmentTable(SEQUENCE)
+    if not isinstance(possessions, SegmentTable):
+        possessions = SegmentTable.from_segments(possessions, kind=POSSESSION)
+    table = as_event_table(events)
+
+    p_starts = possessions.starts.astype(np.int64)
+    p_ends = possessions.ends.astype(np.int64)
+    ph, ph_cats = _carried_codes(table, "phase", "P1_ATTACK_BUILD", p_starts)
+    sp, sp_cats = _carried_codes(table, "set_piece_state", "open_play", p_starts)
+
+    # rows covered by some possession (cumulative +1/-1 over start/end markers)
+    cover = np.zeros(len(table) + 1, dtype=np.int64)
+    np.add.at(cover, p_starts, 1)
+    np.add.at(cover, p_ends + 1, -1)
+    covered = np.cumsum(cover[:-1]) > 0
+
+    is_start = np.zeros(len(table), dtype=bool)
+    is_start[1:] = (ph[1:] != ph[:-1]) | (sp[1:] != sp[:-1])
+    is_start &= covered
+    is_start[p_starts] = True
+
+    starts = np.flatnonzero(is_start)
+    owner = np.searchsorted(p_starts, starts, side="right") - 1
+    ends = np.minimum(np.r_[starts[1:] - 1, len(table) - 1], p_ends[owner])
+    seq_idx = np.arange(len(starts)) - np.searchsorted(starts, p_starts)[owner]
+
+    return SegmentTable.from_columns(
+        SEQUENCE, possessions.ids.values, possessions.teams.values,
+        {
+            "poss": possessions.column("poss")[owner],
+            "team": possessions.column("team")[owner],
+            "start": starts,
+            "end": ends,
+            "seq": seq_idx,
+            "phase": ph[starts],
+            "set_piece": sp[starts],
+        },
+        phases=ph_cats,
+        set_pieces=sp_cats,
+    )
+
+
 def segment_sequences(
-    events: List[Dict[str, Any]],
-    possessions: List[Possession],
+    events: Union[List[Dict[str, Any]], EventTable],
+    possessions: Union[List[Possession], SegmentTable],
 ) -> List[Sequence]:
     """
     Lite sequence segmentation:
     - Each possession split by phase OR set-piece change
+
+    Possessions are expected in row order and non-overlapping (as segment_possessions emits).
+    """
+    return sequence_table(events, possessions).to_list()
+
+
+class SequenceSegmenter:
+    """
+    Stateful segment_sequences over the possessions segment_possessions would find.
+
+    feed() takes normalized events in row order and returns the sequence it closed, if any
+    (a possession change or a phase / set-piece change); flush() closes the last one at the
+    end of the stream. phase / set_piece_state are carried forward within a possession, as
+    in the batch path. Only the open sequence is kept; state() / from_state() checkpoint it.
+    With `out`, closed sequences are appended to that SegmentTable instead of returned.
     """
-    sequences: List[Sequence] = []
-
-    for p in possessions:
-        start = p.start_idx
-        cur_phase = events[start].get("phase", "P1_ATTACK_BUILD")
-        cur_sp = events[start].get("set_piece_state", "open_play")
-        seq_idx = 0
-
-        for i in range(p.start_idx + 1, p.end_idx + 1):
-            ph = events[i].get("phase", cur_phase)
-            sp = events[i].get("set_piece_state", cur_sp)
-
-            if ph != cur_phase or sp != cur_sp:
-                sequences.append(
-                    Sequence(
-                        sequence_id=f"{p.possession_id}_seq_{seq_idx}",
-                        possession_id=p.possession_id,
-                        team_id=p.team_id,
-                        start_idx=start,
-                        end_idx=i - 1,
-                        phase=cur_phase,
-                        set_piece_state=cur_sp,
-                    )
-                )
-                seq_idx += 1
-                start = i
-                cur_phase = ph
-                cur_sp = sp
-
-        sequences.append(
-            Sequence(
-                sequence_id=f"{p.possession_id}_seq_{seq_idx}",
-                possession_id=p.possession_id,
-                team_id=p.team_id,
-                start_idx=start,
-                end_idx=p.end_idx,
-                phase=cur_phase,
-                set_piece_state=cur_sp,
-            )
+
+    def __init__(
+        self,
+        default_phase: str = "P1_ATTACK_BUILD",
+        default_set_piece: str = "open_play",
+        out: Optional[SegmentTable] = None,
+    ) -> None:
+        self.default_phase = default_phase
+        self.default_set_piece = default_set_piece
+        self.out = out
+        self.n = 0
+        self._poss: Optional[List[Any]] = None  # [possession_id, team_id]
+        self._seq: Optional[List[Any]] = None  # [k within possession, start_idx, phase, set_piece_state]
+
+    def _sequence(self, end_idx: int) -> Sequence:
+        key, team = self._poss  # type: ignore[misc]
+        k, start, phase, sps = self._seq  # type: ignore[misc]
+        return Sequence(
+            sequence_id=f"{key}_seq_{k}",
+            possession_id=key,
+            team_id=team,
+            start_idx=start,
+            end_idx=end_idx,
+            phase=phase,
+            set_piece_state=sps,
         )
 
-    return sequences
+    def _close(self, end_idx: int) -> List[Sequence]:
+        if self.out is not None:
+            key, team = self._poss  # type: ignore[misc]
+            k, start, phase, sps = self._seq  # type: ignore[misc]
+            self.out.append(key, team, start, end_idx, k, phase, sps)
+            return []
+        return [self._sequence(end_idx)]
+
+    def feed(self, event: Dict[str, Any]) -> List[Sequence]:
+        key = possession_key(event)
+        i = self.n
+        self.n += 1
+        if self._poss is None or key != self._poss[0]:
+            closed = self._close(i - 1) if self._poss is not None else []
+            self._poss = [key, event.get("team_id")]
+            self._seq = [
+                0, i,
+                event["phase"] if "phase" in event else self.default_phase,
+                event["set_piece_state"] if "set_piece_state" in event else self.default_set_piece,
+            ]
+            return closed
+        seq = self._seq
+        phase = event["phase"] if "phase" in event else seq[2]  # type: ignore[index]
+        sps = event["set_piece_state"] if "set_piece_state" in event else seq[3]  # type: ignore[index]
+        if phase == seq[2] and sps == seq[3]:  # type: ignore[index]
+            return []
+        closed = self._close(i - 1)
+        self._seq = [seq[0] + 1, i, phase, sps]  # type: ignore[index]
+        return closed
+
+    def extend(self, events: Union[List[Dict[str, Any]], EventTable]) -> List[Sequence]:
+        if isinstance(events, EventTable):
+            events = events.to_records()
+        closed: List[Sequence] = []
+        for e in events:
+            closed.extend(self.feed(e))
+        return closed
+
+    @property
+    def open(self) -> Optional[Sequence]:
+        """The open sequence as it stands (end_idx = last event seen)."""
+        return self._sequence(self.n - 1) if self._poss is not None else None
+
+    def flush(self) -> List[Sequence]:
+        closed = self._close(self.n - 1) if self._poss is not None else []
+        self._poss = self._seq = None
+        return closed
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            "n": self.n,
+            "default_phase": self.default_phase,
+            "default_set_piece": self.default_set_piece,
+            "possession": list(self._poss) if self._poss is not None else None,
+            "sequence": list(self._seq) if self._seq is not None else None,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], out: Optional[SegmentTable] = None) -> "SequenceSegmenter":
+        seg = cls(state["default_phase"], state["default_set_piece"], out)
+        seg.n = int(state["n"])
+        seg._poss = list(state["possession"]) if state.get("possession") is not None else None
+        seg._seq = list(state["sequence"]) if state.get("sequence") is not None else None
+        return seg
@@ -39,6 +39,39 @@ def _map_any(v: Any) -> Optional[str]:
             return sp
     return None
 
+def map_unique(s, fn, dtype=object):
+    """
+    pandas: evaluate fn once per distinct value of s and gather per row (NA -> fn(None)).
+    """
+    import numpy as np
+    import pandas as pd  # type: ignore
+
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    table = np.empty(len(uniques) + 1, dtype=dtype)
+    for i, u in enumerate(uniques):
+        table[i] = fn(u)
+    table[-1] = fn(None)
+    return table[codes]
+
+def pl_map_unique(df, src, fn, cast_utf8=True):
+    """
+    polars: evaluate fn once per distinct value of column src and return a when/then
+    expression mapping each value to its label (None -> null).
+    """
+    import polars as pl  # type: ignore
+
+    col = pl.col(src).cast(pl.Utf8) if cast_utf8 else pl.col(src)
+    uniques = df.select(col.unique()).to_series().to_list()
+    groups = {}
+    for v in uniques:
+        label = fn(v)
+        if label is not None and v is not None:
+            groups.setdefault(label, []).append(v)
+    expr = pl.lit(None, dtype=pl.Utf8)
+    for label, vals in groups.items():
+        expr = pl.when(col.is_in(vals)).then(pl.lit(label)).otherwise(expr)
+    return expr
+
 def tag_set_piece_state(df):
     """
     Adds/normalizes column: set_piece_state (string or null)
@@ -52,16 +85,12 @@ def tag_set_piece_state(df):
             # prefer explicit columns if exist
             for src in ["set_piece_state", "set_piece", "restart_type", "event_restart"]:
                 if src in cols:
-                    return df.with_columns(
-                        pl.col(src).cast(pl.Utf8).map_elements(_map_any, return_dtype=pl.Utf8).alias("set_piece_state")
-                    )
+                    return df.with_columns(pl_map_unique(df, src, _map_any).alias("set_piece_state"))
             # else infer from event_type/type
             src = "event_type" if "event_type" in cols else ("type" if "type" in cols else None)
             if not src:
                 return df.with_columns(pl.lit(None).cast(pl.Utf8).alias("set_piece_state"))
-            return df.with_columns(
-                pl.col(src).cast(pl.Utf8).map_elements(_map_any, return_dtype=pl.Utf8).alias("set_piece_state")
-            )
+            return df.with_columns(pl_map_unique(df, src, _map_any).alias("set_piece_state"))
     except Exception:
         pass
 
@@ -72,13 +101,13 @@ def tag_set_piece_state(df):
             cols = set(df.columns)
             for src in ["set_piece_state", "set_piece", "restart_type", "event_restart"]:
                 if src in cols:
-                    df["set_piece_state"] = df[src].apply(_map_any)
+                    df["set_piece_state"] = map_unique(df[src], _map_any)
                     return df
             src = "event_type" if "event_type" in cols else ("type" if "type" in cols else None)
             if not src:
                 df["set_piece_state"] = None
                 return df
-            df["set_piece_state"] = df[src].apply(_map_any)
+            df["set_piece_state"] = map_unique(df[src], _map_any)
             return df
     except Exception:
         pass
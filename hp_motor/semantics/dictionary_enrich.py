@@ -1,6 +1,15 @@
 from __future__ import annotations
+import hashlib
 import pandas as pd
 import re
+import weakref
+from typing import Dict, Iterable, List, Tuple
+
+FIELDS = ("unit", "polarity", "recommended_transform", "canonical_family")
+_EMPTY = dict.fromkeys(FIELDS)
+
+# id(dict_df) -> (weakref to the frame, content fingerprint, metric_name_norm -> payload)
+_INDEXES: Dict[int, Tuple[weakref.ref, str, Dict[str, dict]]] = {}
 
 def _norm(s: str) -> str:
     s = str(s).strip().lower()
@@ -11,21 +20,53 @@ def load_dictionary(path: str) -> pd.DataFrame:
     df = pd.read_csv(path)
     # bazı satırlar sezon başlığı gibi (ör: 2025/2026) -> unit/polarity boş; yine de bırakırız
     df["metric_name_norm"] = df["metric_name"].astype(str).map(_norm)
+    _index_for(df)
     return df
 
+def _build_index(dict_df: pd.DataFrame) -> Dict[str, dict]:
+    n = len(dict_df)
+    cols = [
+        dict_df[f].to_numpy() if f in dict_df.columns else [None] * n
+        for f in FIELDS
+    ]
+    idx: Dict[str, dict] = {}
+    for i, key in enumerate(dict_df["metric_name_norm"].tolist()):
+        if key in idx:
+            continue  # first row wins, as with .iloc[0]
+        idx[key] = {f: (None if pd.isna(c[i]) else c[i]) for f, c in zip(FIELDS, cols)}
+    return idx
+
+def _fingerprint(dict_df: pd.DataFrame) -> str:
+    # content of the columns the index is built from (absent fields included by name)
+    cols = [c for c in ("metric_name_norm",) + FIELDS if c in dict_df.columns]
+    h = hashlib.sha1("\0".join(cols).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(dict_df[cols], index=False).values.tobytes())
+    return h.hexdigest()
+
+def _index_for(dict_df: pd.DataFrame) -> Dict[str, dict]:
+    """
+    metric_name_norm -> enrichment payload, built once per dictionary frame and rebuilt
+    when its metric_name_norm / enrichment columns are edited.
+    """
+    fp = _fingerprint(dict_df)
+    hit = _INDEXES.get(id(dict_df))
+    if hit is not None and hit[0]() is dict_df and hit[1] == fp:
+        return hit[2]
+    idx = _build_index(dict_df)
+    key = id(dict_df)
+    _INDEXES[key] = (weakref.ref(dict_df, lambda _r, k=key: _INDEXES.pop(k, None)), fp, idx)
+    return idx
+
 def enrich(metric_name: str, dict_df: pd.DataFrame | None) -> dict:
     if dict_df is None:
-        return {"unit": None, "polarity": None, "recommended_transform": None, "canonical_family": None}
-
-    n = _norm(metric_name)
-    row = dict_df[dict_df["metric_name_norm"] == n]
-    if row.empty:
-        return {"unit": None, "polarity": None, "recommended_transform": None, "canonical_family": None}
-
-    r = row.iloc[0]
-    return {
-        "unit": None if pd.isna(r.get("unit")) else r.get("unit"),
-        "polarity": None if pd.isna(r.get("polarity")) else r.get("polarity"),
-        "recommended_transform": None if pd.isna(r.get("recommended_transform")) else r.get("recommended_transform"),
-        "canonical_family": None if pd.isna(r.get("canonical_family")) else r.get("canonical_family"),
-    }
+        return dict(_EMPTY)
+    return dict(_index_for(dict_df).get(_norm(metric_name), _EMPTY))
+
+def enrich_many(metric_names: Iterable[str], dict_df: pd.DataFrame | None) -> List[dict]:
+    """
+    enrich() for many names with a single index lookup setup.
+    """
+    if dict_df is None:
+        return [dict(_EMPTY) for _ in metric_names]
+    get = _index_for(dict_df).get
+    return [dict(get(_norm(n), _EMPTY)) for n in metric_names]
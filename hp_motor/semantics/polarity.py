@@ -0,0 +1,96 @@
+from __future__ import annotations
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable
+
+import numpy as np
+import pandas as pd
+
+from hp_motor.library.loader import cached_artifact
+from hp_motor.semantics.substring_index import SubstringIndex
+
+# Event polarity (+1 / -1 / 0 per action_label) from a force_positive / force_negative
+# dictionary such as tools/dicts_city_gs.json.
+#   exact:     label.strip().lower() is a key (positive wins)
+#   substring: some key occurs in label.lower() (positive wins)
+
+EXACT = "exact"
+SUBSTRING = "substring"
+MODES = (EXACT, SUBSTRING)
+
+def _norm(s: Any) -> str:
+    return str(s).strip().lower()
+
+@dataclass(frozen=True)
+class PolarityIndex:
+    """
+    Compiled polarity dictionary. score() factorizes the labels and evaluates each
+    distinct label once (remembered across calls), then maps the codes through an
+    int64 table.
+    """
+    positive: FrozenSet[str]
+    negative: FrozenSet[str]
+    mode: str
+    digest: str
+    _index: SubstringIndex = field(repr=False, compare=False)
+    _memo: Dict[str, int] = field(default_factory=dict, repr=False, compare=False)
+
+    def score_label(self, label: Any) -> int:
+        if not isinstance(label, str):
+            return 0
+        hit = self._memo.get(label)
+        if hit is not None:
+            return hit
+        if self.mode == EXACT:
+            l = label.strip().lower()
+            s = 1 if l in self.positive else -1 if l in self.negative else 0
+        else:
+            n_pos = len(self.positive)
+            s = 0
+            for kid in (*self._index.always, *self._index.automaton.find(label.lower())):
+                if kid < n_pos:
+                    s = 1
+                    break
+                s = -1
+        self._memo[label] = s
+        return s
+
+    def score(self, labels: Iterable[Any]) -> np.ndarray:
+        codes, uniques = pd.factorize(labels if isinstance(labels, pd.Series) else pd.Series(list(labels), dtype=object))
+        table = np.array([self.score_label(u) for u in uniques] + [0], dtype=np.int64)  # code -1 (missing) -> 0
+        return table[codes]
+
+# digest -> compiled index; equal dictionaries share one compile
+_INDEXES: Dict[str, PolarityIndex] = {}
+
+def polarity_index(positive: Iterable[str], negative: Iterable[str], mode: str = EXACT) -> PolarityIndex:
+    """
+    Compiled index for the given keys (stripped, lower-cased), cached per dictionary hash.
+    """
+    if mode not in MODES:
+        raise ValueError(f"unknown polarity mode: {mode!r} (expected one of {MODES})")
+    pos = sorted({_norm(x) for x in positive})
+    neg = sorted({_norm(x) for x in negative})
+    digest = hashlib.sha1(json.dumps([mode, pos, neg], ensure_ascii=False).encode("utf-8")).hexdigest()
+    hit = _INDEXES.get(digest)
+    if hit is None:
+        hit = PolarityIndex(
+            positive=frozenset(pos), negative=frozenset(neg), mode=mode, digest=digest,
+            _index=SubstringIndex([*pos, *neg]),  # positive keys first: kid < len(positive)
+        )
+        _INDEXES[digest] = hit
+    return hit
+
+def load_polarity(path: str | Path, mode: str = EXACT) -> PolarityIndex:
+    """
+    polarity_index over the force_positive / force_negative lists of a JSON dictionary;
+    the file is re-read only when it changes.
+    """
+    def _build(rp: Path) -> PolarityIndex:
+        with rp.open("r", encoding="utf-8") as f:
+            d = json.load(f)
+        return polarity_index(d.get("force_positive", []), d.get("force_negative", []), mode=mode)
+
+    return cached_artifact(Path(path), f"polarity:{mode}", _build)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+from collections import deque
+from itertools import chain
+from typing import Dict, Iterator, List, Optional, Set
+
+_GRAM = 3
+
+class _Automaton:
+    """
+    Aho-Corasick over the index keys: every key occurring inside a text, in one pass.
+    """
+    def __init__(self, words: List[str]) -> None:
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[int]] = [[]]
+        for wid, w in enumerate(words):
+            if not w:
+                continue
+            s = 0
+            for ch in w:
+                nxt = self.goto[s].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[s][ch] = nxt
+                    self.goto.append({}); self.fail.append(0); self.out.append([])
+                s = nxt
+            self.out[s].append(wid)
+        q = deque(self.goto[0].values())
+        while q:
+            s = q.popleft()
+            for ch, t in self.goto[s].items():
+                q.append(t)
+                f = self.fail[s]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[t] = self.goto[f].get(ch, 0)
+                self.out[t] = self.out[t] + self.out[self.fail[t]]
+
+    def find(self, text: str) -> Iterator[int]:
+        s = 0
+        for ch in text:
+            while s and ch not in self.goto[s]:
+                s = self.fail[s]
+            s = self.goto[s].get(ch, 0)
+            yield from self.out[s]
+
+class SubstringIndex:
+    """
+    Keys k with `k in n or n in k`: the automaton finds keys inside n, a q-gram
+    inverted index (q <= 3) narrows the keys that contain n before the exact check.
+    An empty key is inside every text.
+    """
+    def __init__(self, keys: List[str]) -> None:
+        self.keys = list(keys)
+        self.always = [kid for kid, k in enumerate(self.keys) if not k]
+        self.automaton = _Automaton(self.keys)
+        self.grams: Dict[str, Set[int]] = {}
+        for kid, k in enumerate(keys):
+            for q in range(1, _GRAM + 1):
+                for i in range(len(k) - q + 1):
+                    self.grams.setdefault(k[i:i + q], set()).add(kid)
+
+    def superstrings(self, n: str) -> Iterator[int]:
+        if not n:
+            yield from range(len(self.keys))
+            return
+        q = min(_GRAM, len(n))
+        postings = sorted((self.grams.get(n[i:i + q], set()) for i in range(len(n) - q + 1)), key=len)
+        cands = set(postings[0]).intersection(*postings[1:])
+        for kid in cands:
+            if n in self.keys[kid]:
+                yield kid
+
+    def single_hit(self, n: str) -> Optional[int]:
+        """
+        The one key related to n by containment (either way), or None for zero / several.
+        """
+        hit: Optional[int] = None
+        for kid in chain(self.always, self.automaton.find(n)):
+            if hit is not None and kid != hit:
+                return None
+            hit = kid
+        for kid in self.superstrings(n):
+            if hit is not None and kid != hit:
+                return None
+            hit = kid
+        return hit
@@ -1,7 +1,11 @@
 from __future__ import annotations
 import json
 import re
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
+
+from hp_motor.semantics.substring_index import SubstringIndex
 
 def _norm(s: str) -> str:
     s = str(s).strip().lower()
@@ -52,7 +56,48 @@ def build_6faz_index(mapj: dict) -> dict:
             k = _norm(raw)
             idx.setdefault(k, {"phase_id": phase_id, "metric_role": "derived", "raw": raw})
 
-    return idx
+    return FazIndex(idx)
+
+_NO_TAG = {"phase_id": None, "metric_role": None, "raw": None}
+class FazIndex(dict):
+    """
+    build_6faz_index result: the plain metric_norm -> tag dict, plus a lazily built
+    contains-lookup and an LRU memo of tag_metric results (both dropped on mutation).
+    """
+    _lookup: Optional[SubstringIndex] = None
+    _memo = None
+
+    def _invalidate(self) -> None:
+        self._lookup = None
+        self._memo = None
+
+    def __setitem__(self, k, v):
+        self._invalidate(); super().__setitem__(k, v)
+    def __delitem__(self, k):
+        self._invalidate(); super().__delitem__(k)
+    def update(self, *a, **kw):
+        self._invalidate(); super().update(*a, **kw)
+    def setdefault(self, k, d=None):
+        self._invalidate(); return super().setdefault(k, d)
+    def pop(self, *a):
+        self._invalidate(); return super().pop(*a)
+    def popitem(self):
+        self._invalidate(); return super().popitem()
+    def clear(self):
+        self._invalidate(); super().clear()
+
+    def tag(self, n: str) -> dict:
+        if self._memo is None:
+            self._memo = lru_cache(maxsize=4096)(self._tag)
+        return self._memo(n)
+
+    def _tag(self, n: str) -> dict:
+        if n in self:
+            return self[n]
+        if self._lookup is None:
+            self._lookup = SubstringIndex([k for k in self if k])
+        kid = self._lookup.single_hit(n)
+        return _NO_TAG if kid is None else self[self._lookup.keys[kid]]
 
 def tag_metric(metric_name: str, idx: dict) -> dict:
     """
@@ -61,6 +106,9 @@ def tag_metric(metric_name: str, idx: dict) -> dict:
     - contains match (single-hit)
     """
     n = _norm(metric_name)
+    if isinstance(idx, FazIndex):
+        hit = idx.tag(n)
+        return dict(hit) if hit is _NO_TAG else hit
     if n in idx:
         return idx[n]
 
@@ -8,9 +8,10 @@ def main():
     ap.add_argument("--base-dir", default=".")
     ap.add_argument("--out", default="hp_report.json")
     ap.add_argument("--team", action="append", required=True, help="Birden fazla verebilirsin: --team Galatasaray --team 'Manchester City'")
+    ap.add_argument("--rebuild-index", action="store_true", help="base-dir dosya indeksini yeniden oluştur (önbellek: $HP_MOTOR_CACHE_DIR veya ~/.cache/hp_motor altında file_index/)")
     args = ap.parse_args()
 
-    run(args.spec, args.base_dir, args.out, args.team)
+    run(args.spec, args.base_dir, args.out, args.team, rebuild_index=args.rebuild_index)
     print(f"OK -> {args.out}")
 
 if __name__ == "__main__":
@@ -0,0 +1,31 @@
+import pandas as pd
+
+from hp_motor.diagnostics.dictionary import _norm, build_alias_map, load_dictionary
+
+
+def _dict_df(names):
+    df = pd.DataFrame({"metric_name": names})
+    df["metric_name_norm"] = df["metric_name"].astype(str).map(_norm)
+    return df
+
+
+def test_alias_map_exact_then_unique_contains():
+    df = _dict_df(["Passes", "Accurate passes", "Shots", "Shots on target"])
+    alias = build_alias_map(["PASSES", "Accurate passes, %", "on target", "xG"], df)
+    # "accurate passes, %" contains both "passes" and "accurate passes" -> ambiguous, dropped
+    assert alias == {"PASSES": "Passes", "on target": "Shots on target"}
+
+
+def test_load_dictionary_returns_independent_frames(tmp_path):
+    p = tmp_path / "dict.csv"
+    p.write_text("metric_name\nPasses\nShots\n", encoding="utf-8")
+    a, b = load_dictionary(str(p)), load_dictionary(str(p))
+    assert a is not b and a.equals(b)
+    a.loc[0, "metric_name"] = "changed"
+    assert b.loc[0, "metric_name"] == "Passes"
+    assert build_alias_map(["passes"], b) == {"passes": "Passes"}
+    # the edited frame is matched on its new contents, not a stale compiled matcher
+    assert build_alias_map(["passes"], a) == {"passes": "changed"}
+    a.loc[1, "metric_name_norm"] = "xg"
+    assert build_alias_map(["xG"], a) == {"xG": "Shots"}
+    assert build_alias_map(["xG"], b) == {}
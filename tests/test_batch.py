@@ -0,0 +1,38 @@
+import json
+import shutil
+from pathlib import Path
+
+from hp_motor.batch import run_batch
+
+
+def test_batch_writes_reports_and_reports_failures(tmp_path):
+    src = tmp_path / "events"
+    src.mkdir()
+    for name in ["m1", "m2"]:
+        shutil.copy("tests/fixtures/events_min.json", src / f"{name}.json")
+    (src / "broken.json").write_text("{not json", encoding="utf-8")
+
+    index, index_path = run_batch(str(src), tmp_path / "out", workers=2)
+
+    assert index_path.exists()
+    assert index["n_matches"] == 3
+    assert index["n_failed"] == 1
+    by_name = {m["match"]: m for m in index["matches"]}
+    assert by_name["broken"]["status"] == "FAILED"
+    for name in ["m1", "m2"]:
+        rep = json.loads(Path(by_name[name]["report_path"]).read_text(encoding="utf-8"))
+        assert rep["events_summary"]["n_events"] == 5
+
+
+def test_batch_match_names_stay_unique(tmp_path):
+    # a/m + b/m would name the second "m__1", which is also the stem of m__1.json
+    for rel in ["a/m.json", "b/m.json", "m__1.json"]:
+        (tmp_path / "events" / rel).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy("tests/fixtures/events_min.json", tmp_path / "events" / rel)
+
+    index, _ = run_batch(str(tmp_path / "events" / "**" / "*.json"), tmp_path / "out", workers=1)
+
+    names = [m["match"] for m in index["matches"]]
+    assert sorted(names) == ["m", "m__1", "m__1__1"]
+    assert len({m["report_path"] for m in index["matches"]}) == 3
+    assert index["n_failed"] == 0
@@ -0,0 +1,43 @@
+from hp_motor.ingestion.loaders import iter_csv_tables, load_events, read_csv_table
+from hp_motor.ingestion.normalizers import _compile, compile_plan, normalize_events
+
+
+def test_csv_plan_matches_dict_normalization(tmp_path):
+    p = tmp_path / "events.csv"
+    p.write_text(
+        "match_id,team_id,period,minute,second,event_type,outcome,start_x,end_x,possession_id\n"
+        "m1,A,1,0,5, Pass ,Complete,10.5,30.25,1\n"
+        "m1,A,1.0,1,x,shot,,bad,,1\n"
+        "m1,B,2,46,0,Tackle,Won,1_0,inf,2\n",
+        encoding="utf-8",
+    )
+    assert read_csv_table(p).to_records() == normalize_events(load_events(p))
+    assert sum(len(t) for t in iter_csv_tables(p, chunk_size=2)) == 3
+
+
+def test_csv_plan_blank_lines_and_short_rows_read_like_dictreader(tmp_path):
+    p = tmp_path / "events.csv"
+    p.write_text(
+        "match_id,team_id,period,minute,second,event_type,possession_id\n"
+        "m1,A,1,0,5,pass,1\n"
+        "\n"
+        "m1,,1,0,6,pass\n"
+        " \n"
+        "m1,B,1,0,7\n"
+        "m1,\"B\nB\",1,0,8,shot,2\n",
+        encoding="utf-8",
+    )
+    expected = normalize_events(load_events(p))
+    assert len(expected) == 5
+    assert read_csv_table(p).to_records() == expected
+    assert [r for t in iter_csv_tables(p, chunk_size=2) for r in t.to_records()] == expected
+
+
+def test_plan_prefers_vendor_key_and_is_cached():
+    vitems = (("match_id", "MID"),)
+    header = ("MID", "match_id", "minute")
+
+    plan = _compile(vitems, header)
+    assert dict(plan.sources) == {"match_id": (0, 1), "minute": (2,)}
+    assert _compile(vitems, header) is plan
+    assert compile_plan("generic", header) is compile_plan("generic", list(header))
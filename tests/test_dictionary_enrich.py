@@ -0,0 +1,35 @@
+import pandas as pd
+
+from hp_motor.semantics.dictionary_enrich import _norm, enrich, enrich_many, load_dictionary
+
+
+def test_enrich_uses_first_row_and_maps_nan_to_none():
+    df = pd.DataFrame({
+        "metric_name": ["Key  Passes", "key passes", "Shots"],
+        "unit": ["count", "pct", None],
+        "polarity": [1.0, -1.0, float("nan")],
+    })
+    df["metric_name_norm"] = df["metric_name"].map(_norm)
+
+    assert enrich(" KEY passes ", df) == {
+        "unit": "count", "polarity": 1.0, "recommended_transform": None, "canonical_family": None,
+    }
+    assert enrich_many(["shots", "missing"], df) == [
+        dict.fromkeys(["unit", "polarity", "recommended_transform", "canonical_family"]),
+    ] * 2
+    assert enrich_many(["x"], None) == [enrich("x", None)]
+
+
+def test_enrich_follows_edits_to_the_dictionary_frame(tmp_path):
+    p = tmp_path / "dict.csv"
+    p.write_text("metric_name,unit\nShots,count\n", encoding="utf-8")
+    df = load_dictionary(str(p))
+    assert enrich("shots", df)["unit"] == "count"
+
+    df.loc[0, "unit"] = "pct"
+    assert enrich("shots", df)["unit"] == "pct"
+    df.loc[0, "metric_name_norm"] = "xg"
+    assert enrich_many(["shots", "xg"], df) == [enrich("missing", df), enrich("xg", df)]
+    assert enrich("xg", df)["unit"] == "pct"
+    df["polarity"] = 1.0
+    assert enrich("xg", df)["polarity"] == 1.0
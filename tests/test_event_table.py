@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+from hp_motor.ingestion.event_table import EventTable
+from hp_motor.ingestion.normalizers import normalize_events
+from hp_motor.metrics.factory import compute_raw_metrics
+from hp_motor.segmentation.possessions import possession_table, segment_possessions
+from hp_motor.segmentation.sequences import segment_sequences
+
+
+def _raw():
+    return json.loads(Path("tests/fixtures/events_min.json").read_text(encoding="utf-8"))
+
+
+def test_table_roundtrip_keeps_missing_keys():
+    raw = _raw()
+    table = EventTable.from_records(raw)
+    assert len(table) == len(raw)
+    assert table.to_records() == raw
+    assert table.column("event_type").is_categorical
+
+
+def test_list_adapter_matches_table_path():
+    raw = _raw()
+    as_list = normalize_events(raw)
+    as_table = normalize_events(EventTable.from_records(raw))
+
+    assert as_table.to_records() == as_list
+    assert all(isinstance(e["period"], int) for e in as_list)
+    assert "outcome" not in as_list[-1]
+
+    assert compute_raw_metrics(as_list) == compute_raw_metrics(as_table)
+
+    p_list, p_table = segment_possessions(as_list), segment_possessions(as_table)
+    assert p_list == p_table
+    assert segment_sequences(as_list, p_list) == segment_sequences(as_table, p_table)
+
+
+def test_int_columns_outside_int64_take_the_default():
+    big = "9999999999999999999999999"
+    mixed = normalize_events([{"period": big, "minute": big}, {"period": "abc", "minute": "abc"}, {"period": "2", "minute": "7"}])
+    assert [(e["period"], e["minute"]) for e in mixed] == [(1, 0), (1, 0), (2, 7)]
+    numeric = normalize_events([{"second": 1e30}, {"second": -1e19}, {"second": 12.9}])
+    assert [e["second"] for e in numeric] == [0, 0, 12]
+
+
+def test_hash_equal_ids_of_different_types_stay_apart():
+    ids = [1, 1, 1.0, True, "1", 2]
+    events = [
+        {"match_id": "m", "team_id": "A", "period": 1, "minute": 0, "second": i, "event_type": "pass", "possession_id": p}
+        for i, p in enumerate(ids)
+    ]
+    table = normalize_events(EventTable.from_records(events))
+    assert [p.possession_id for p in possession_table(table)] == ["1", "1.0", "True", "1", "2"]
+    assert EventTable.from_records(events).column("possession_id").tolist() == ids
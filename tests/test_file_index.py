@@ -0,0 +1,27 @@
+from hp_motor.pipeline import file_index as fi
+
+
+def test_file_index_is_persisted_and_refreshed(tmp_path, monkeypatch):
+    monkeypatch.setenv("HP_MOTOR_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(fi, "_INDEXES", {})
+    base = tmp_path / "data"
+    (base / "a" / "b").mkdir(parents=True)
+    (base / "a" / "b" / "events.csv").write_text("x", encoding="utf-8")
+    (base / "z").mkdir()
+    (base / "z" / "events.csv").write_text("x", encoding="utf-8")
+
+    idx = fi.file_index(base)
+    first = next(base.rglob("events.csv"))
+    assert idx.find("events.csv") == first.relative_to(base).as_posix()  # Path.rglob order
+    assert idx.path.exists()
+
+    # next process: loaded from the index file; a new file in a new directory is picked up on the miss
+    monkeypatch.setattr(fi, "_INDEXES", {})
+    (base / "c").mkdir()
+    (base / "c" / "match.xlsx").write_text("x", encoding="utf-8")
+    idx = fi.file_index(base)
+    assert idx.find("match.xlsx") == "c/match.xlsx"
+    assert idx.find("missing.csv") is None
+
+    first.unlink()
+    assert idx.find("events.csv") == next(base.rglob("events.csv")).relative_to(base).as_posix()
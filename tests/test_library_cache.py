@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from hp_motor.library import invalidate_artifacts, load_registry, load_registry_index, load_vendor_mappings
+from hp_motor.library.loader import _build_json, _build_registry_index, _cached
+
+
+def test_registry_index_is_cached_and_read_only():
+    idx1, h = load_registry_index()
+    idx2, _ = load_registry_index()
+    assert h.status == "OK"
+    assert idx1 is idx2
+    assert "M_PASS_COUNT" in idx1.by_id
+    with pytest.raises(TypeError):
+        idx1.by_id["M_PASS_COUNT"]["layer"] = "x"
+
+    invalidate_artifacts()
+    idx3, _ = load_registry_index()
+    assert idx3 is not idx1
+    assert idx3.by_id.keys() == idx1.by_id.keys()
+
+    vm, _ = load_vendor_mappings()
+    assert "generic" in vm["vendor"]
+
+
+def test_artifact_cache_refreshes_on_file_change(tmp_path):
+    p = tmp_path / "a.json"
+    p.write_text(json.dumps({"v": 1}), encoding="utf-8")
+    first = _cached(p, "json", _build_json)
+    assert _cached(p, "json", _build_json) is first
+
+    p.write_text(json.dumps({"v": 22}), encoding="utf-8")
+    assert _cached(p, "json", _build_json)["v"] == 22
+
+
+def test_public_loaders_return_plain_copies():
+    reg, _ = load_registry()
+    assert type(reg) is dict and type(reg["metrics"]) is list and type(reg["metrics"][0]) is dict
+    reg["metrics"].clear()
+    assert load_registry()[0]["metrics"]
+
+    vm, _ = load_vendor_mappings()
+    assert type(vm["vendor"]["generic"]) is dict
+    vm["vendor"].clear()
+    assert "generic" in load_vendor_mappings()[0]["vendor"]
+
+
+def test_registry_index_duplicate_ids_last_wins(tmp_path):
+    p = tmp_path / "metric_registry.json"
+    p.write_text(json.dumps({"version": "t", "metrics": [{"id": "M", "layer": "a"}, {"id": "M", "layer": "b"}]}), encoding="utf-8")
+    idx = _build_registry_index(p)
+    assert len(idx.metrics) == 2
+    assert idx.by_id["M"]["layer"] == "b"
@@ -0,0 +1,68 @@
+import json
+import queue
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from hp_motor.cli import build_parser
+from hp_motor.live import LiveEngine, iter_queue, tail_jsonl
+from hp_motor.pipeline_single import run_pipeline
+
+
+def _events():
+    base = json.loads(Path("tests/fixtures/events_min.json").read_text(encoding="utf-8"))
+    return base * 3
+
+
+def test_snapshots_equal_batch_reports(tmp_path):
+    events = _events()
+    snaps = []
+    LiveEngine(every=4, batch_size=3, publish=snaps.append).run(iter(events))
+    assert [s["n_events"] for s in snaps] == [4, 8, 12, 15]
+    for s in snaps:
+        p = tmp_path / f"prefix_{s['n_events']}.jsonl"
+        p.write_text("".join(json.dumps(e) + "\n" for e in events[: s["n_events"]]), encoding="utf-8")
+        assert s["report"] == json.loads(json.dumps(run_pipeline(p)))
+    live = snaps[-1]["live"]
+    assert sum(sum(c.values()) for c in live["phases"].values()) == len(events)
+    assert live["possession"]["start_idx"] <= len(events) - 1
+
+
+def test_tail_and_queue_feeds(tmp_path):
+    events = _events()
+    p = tmp_path / "feed.jsonl"
+    lines = [json.dumps(e) + "\n" for e in events]
+    p.write_text("".join(lines[:2]) + lines[2][:5], encoding="utf-8")
+
+    def _append():
+        time.sleep(0.1)
+        with p.open("a", encoding="utf-8") as f:
+            f.write(lines[2][5:] + "".join(lines[3:]))
+
+    threading.Thread(target=_append).start()
+    assert list(tail_jsonl(p, poll_sec=0.02, idle_timeout=0.5)) == events
+
+    q = queue.Queue()
+    for e in events:
+        q.put(e)
+    q.put(None)
+    snap = LiveEngine(every=None).run(iter_queue(q))
+    assert snap["n_events"] == len(events) and snap["report"]["popper"]["status"] == "OK"
+
+
+def test_malformed_lines_and_window_validation(tmp_path):
+    events = _events()[:3]
+    p = tmp_path / "feed.jsonl"
+    good = [json.dumps(e) for e in events]
+    p.write_text("\n".join([good[0], "{broken", good[1], "[1, 2]", good[2], '{"cut']), encoding="utf-8")
+    bad = []
+    assert list(tail_jsonl(p, poll_sec=0.01, idle_timeout=0.05, bad=bad)) == events
+    assert bad == ["{broken", "[1, 2]", '{"cut']
+
+    for w in (0, -5):
+        with pytest.raises(ValueError):
+            LiveEngine(window_sec=w)
+        with pytest.raises(SystemExit):
+            build_parser().parse_args(["live", "--events", str(p), "--out", "o.json", "--window-sec", str(w)])
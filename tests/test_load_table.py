@@ -0,0 +1,15 @@
+import pandas as pd
+
+from hp_motor.ingest.loader import load_table
+
+
+def test_load_table_schema_dtypes_and_fallback(tmp_path, monkeypatch):
+    monkeypatch.setenv("HP_MOTOR_CACHE_DIR", str(tmp_path / "cache"))
+    p = tmp_path / "events.csv"
+    p.write_text("ID;start;end;code;team;action;half;pos_x;pos_y\n1;5.21;5.21;1;;Pas;1;;\n", encoding="utf-8")
+    df = load_table(str(p))
+    assert df["code"].tolist() == ["1"] and df["pos_x"].dtype == "float64"
+
+    # blank int cell: schema read fails, inferred read matches the python engine
+    p.write_text("ID;start;end;code;team;action;half;pos_x;pos_y\n1;5.21;5.2;a;b;c;;1;2\n", encoding="utf-8")
+    assert load_table(str(p)).equals(pd.read_csv(p, sep=";", engine="python"))
@@ -0,0 +1,159 @@
+import json
+import subprocess
+import sys
+
+from hp_motor.match_pack import MatchPack, PhaseSummary, run_match_pack, run_match_packs, tag_phases
+
+EVENTS = """team,event_type,t_game_sec,x,end_x
+A,pass,1.0,20,30
+A,pass,2.5,30,75
+B,interception,4.0,40,
+B,pass,5.0,40,60
+A,pressure,6.0,,
+B,shot,9.0,90,
+"""
+
+
+def _pack(tmp_path, name="m1"):
+    root = tmp_path / name
+    root.mkdir()
+    (root / "events.csv").write_text(EVENTS, encoding="utf-8")
+    return root
+
+
+def test_in_memory_run_matches_written_outputs(tmp_path):
+    written = run_match_pack(_pack(tmp_path, "a"), window_sec=[5, 10], step_sec=1)
+    assert written.steps == {"phase_tagger": "OK", "tempo": "OK", "brief": "OK"}
+    out = tmp_path / "a" / "out"
+    assert json.loads((out / "phase_summary.json").read_text(encoding="utf-8")) == written.phase_summary
+    assert json.loads((out / "module_health.json").read_text(encoding="utf-8")) == written.health
+
+    root = _pack(tmp_path, "b")
+    mem = run_match_pack(root, write=False, window_sec=[5, 10], step_sec=1)
+    assert not (root / "out").exists() and not (root / "context_vector.json").exists()
+    assert mem.phase_summary == written.phase_summary
+    assert mem.tempo_series == written.tempo_series
+    assert {s["window_sec"] for s in mem.tempo_series} == {5, 10}
+    assert mem.brief["claims"] == written.brief["claims"]
+
+
+def test_stop_and_many_packs(tmp_path):
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    pack = MatchPack(empty, write=False)
+    assert tag_phases(pack) == "STOP"
+
+    recs = run_match_packs([_pack(tmp_path), empty], workers=1)
+    assert [r["status"] for r in recs] == ["OK", "STOP"]
+    assert recs[1]["steps"] == {"phase_tagger": "STOP"}
+
+
+def test_phase_bitmasks_render_like_the_row_tagger(tmp_path):
+    from hp_motor.match_pack.phase_tagger import LIMIT, P_ATT_TRANS, P_PROGRESSION, TAG
+
+    root = tmp_path / "m"
+    root.mkdir()
+    (root / "events.csv").write_text(
+        "team,event_type,t_game_sec,x,end_x\nA,pass,1,50,52\nA,pass,2,30,75\nA,pass,3,70,\n", encoding="utf-8"
+    )
+    pack = run_match_pack(root, write=False, n_trans=0)
+    tl = pack.timeline
+    assert tl.phase.tolist() == [P_ATT_TRANS, P_PROGRESSION, P_PROGRESSION]
+    assert tl.tags[0] == TAG["phase:att_trans_low"] | TAG["window:regain"] | TAG["prog"]
+    assert tl.limits.tolist() == [0, 0, LIMIT["no_xy"]]
+    assert [(r["evidence_tags"], r["limits"], r["phase_confidence"]) for r in pack.phase_rows] == [
+        ("phase:att_trans_low;window:regain;prog:dx=2.0>=thresh", "", 0.45),
+        ("z:own_third;ez:att_third;entry_proxy", "", 0.6),
+        ("phase:progression_low;prog:no_xy;cap:no_xy", "no_xy", 0.35),
+    ]
+
+
+def test_phase_summary_streams_and_merges(tmp_path):
+    pack = MatchPack(_pack(tmp_path), write=False)
+    tag_phases(pack)
+    rows = pack.phase_rows
+    chunked = PhaseSummary()
+    for i in range(0, len(rows), 4):
+        chunk = rows[i:i + 4]
+        chunked.add_arrays([r["team"] for r in chunk], [r["phase"] for r in chunk], [r["phase_confidence"] for r in chunk])
+    assert chunked.to_dict()["by_team"] == pack.phase_summary["by_team"]
+    assert PhaseSummary.from_state(json.loads(json.dumps(chunked.state()))).to_dict() == chunked.to_dict()
+
+    both = PhaseSummary().add_rows(rows).merge(PhaseSummary().add_rows(rows)).to_dict()["by_team"]
+    for team, s in pack.phase_summary["by_team"].items():
+        assert both[team]["total_events"] == 2 * s["total_events"]
+        assert {ph: v["per_100_events"] for ph, v in both[team]["phases"].items()} == \
+            {ph: v["per_100_events"] for ph, v in s["phases"].items()}
+
+
+def test_phase_summary_unknown_team_chunks_match_rows():
+    teams = ["A", None, "", None, "B", ""]
+    phases = ["P1", "P2", "P2", "P1", "P1", "P2"]
+    conf = [0.1, 0.25, 0.35, 0.5, 0.9, 0.2]
+    rows = [{"team": t, "phase": p, "phase_confidence": c} for t, p, c in zip(teams, phases, conf)]
+    expected = PhaseSummary().add_rows(rows).to_dict()
+    assert PhaseSummary().add_arrays(teams, phases, conf).to_dict() == expected
+    chunked = PhaseSummary().add_arrays(teams[:3], phases[:3], conf[:3]).add_arrays(teams[3:], phases[3:], conf[3:])
+    assert chunked.to_dict() == expected
+    assert list(expected["by_team"]) == ["A", "UNKNOWN_TEAM", "B"]
+    assert expected["by_team"]["UNKNOWN_TEAM"]["total_events"] == 4
+
+
+def test_row_engine_without_numpy_matches_arrays(tmp_path, monkeypatch):
+    from hp_motor.match_pack import phase_tagger
+
+    arrays = MatchPack(_pack(tmp_path, "arrays"), write=False)
+    tag_phases(arrays)
+    expected = arrays.phase_rows  # rendered before numpy is hidden
+    monkeypatch.setattr(phase_tagger, "np", None)
+    rows = MatchPack(_pack(tmp_path, "rows"), write=False)
+    tag_phases(rows)
+    assert isinstance(rows.timeline, phase_tagger.RowTimeline)
+    assert rows.phase_rows == expected
+    assert rows.phase_summary == arrays.phase_summary
+
+
+def test_step13_14_imports_stay_stdlib():
+    code = (
+        "import sys; from hp_motor.match_pack import MatchPack, render_brief, tempo_moments; "
+        "print(sorted(m for m in ('numpy', 'pandas') if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_cli_import_stays_stdlib():
+    # run.sh calls `python -m hp_motor.cli match-pack` on python-only installs
+    code = (
+        "import sys; import hp_motor.cli; "
+        "print(sorted(m for m in ('numpy', 'pandas', 'yaml') if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_termux_bundle_runs_standalone(tmp_path):
+    import os
+    import zipfile
+
+    from tools.build_termux_bundle import BUNDLE, bundle_files
+
+    with zipfile.ZipFile(BUNDLE) as z:
+        assert {n: z.read(n) for n in z.namelist()} == bundle_files()  # rebuilt with the tree
+        z.extractall(tmp_path / "bundle")
+    root = tmp_path / "bundle"
+    (root / "MATCH_PACK").mkdir()
+    (root / "MATCH_PACK" / "events.csv").write_text(EVENTS, encoding="utf-8")
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONPATH"}
+
+    def run(*args):
+        # -S: no site-packages (python-only Termux install; no editable hp_motor either)
+        return subprocess.run([sys.executable, "-S", *args], cwd=root, env=env, capture_output=True, text=True)
+
+    for script in ("STEP12_PHASE_TAGGER_MVP.py", "STEP13_TEMPO_MOMENTS.py", "STEP14_BRIEF_V2_RENDER.py"):
+        out = run(script, "--match-pack", "MATCH_PACK")
+        assert out.returncode == 0, out.stderr
+    assert (root / "MATCH_PACK" / "out" / "brief_L3.json").exists()
+    out = run("-m", "hp_motor.cli", "match-pack", "--match-pack", "MATCH_PACK")
+    assert out.returncode == 0, out.stderr
+    assert (root / "MATCH_PACK" / "out" / "phase_summary.json").exists()
@@ -0,0 +1,93 @@
+from hp_motor.ingestion.event_table import EventTable
+from hp_motor.metrics.factory import COUNT_DECLARATIONS, compute_raw_metrics, count_declarations, count_metric_ids
+from hp_motor.metrics.formula import FormulaContext, compile_formula, compile_registry, evaluate_registry
+from hp_motor.metrics.kernel import MaskKernel
+from hp_motor.metrics.validator import validate_metrics
+from hp_motor.segmentation.possessions import possession_table
+from hp_motor.segmentation.sequences import sequence_table
+
+
+def test_fused_kernel_counts_and_shares_predicates():
+    events = [
+        {"event_type": "Pass", "outcome": "Incomplete", "start_x": 10, "end_x": 40},
+        {"event_type": "pass", "start_x": 10, "end_x": "bad"},
+        {"event_type": "Shot saved"},
+        {"event_type": "dribble", "outcome": "lost"},
+        {"event_type": "dispossessed"},
+        {},
+    ]
+    out = compute_raw_metrics(events)["metrics"]
+    assert {k: v["value"] for k, v in out.items()} == {
+        "M_PASS_COUNT": 2, "M_PROG_PASS_COUNT": 1, "M_SHOT_COUNT": 1, "M_TURNOVER_COUNT": 3,
+    }
+    assert list(out) == count_metric_ids()
+
+    k = MaskKernel(EventTable.from_records(events), params={"threshold": 15.0})
+    is_pass = ("==", "event_type", "pass")
+    assert k.count(COUNT_DECLARATIONS["M_PROG_PASS_COUNT"]) == 1
+    assert k.mask(is_pass) is k.mask(("==", "event_type", "pass"))  # memoized, shared by declarations
+
+
+def test_registry_count_formulas_agree_with_their_declarations():
+    # a core count either runs its registry text as written or is marked code-defined
+    reg = compile_registry()
+    assert reg.code_defined == {"M_TURNOVER_COUNT"}
+    for mid, node in COUNT_DECLARATIONS.items():
+        plan = reg.plans[mid]
+        assert (plan.agg, plan.source) == ("COUNT", "events")
+        assert plan.where == node or mid in reg.code_defined, mid
+        assert count_declarations()[mid] == node
+
+
+def test_registry_formulas_compile_once_and_evaluate_grouped():
+    plans = compile_registry()
+    assert not plans.errors
+    assert compile_registry() is plans  # cached per registry version
+    # the registry text compiles as written; the reported count keeps the built-in predicate
+    assert plans.plans["M_TURNOVER_COUNT"].where == (
+        "or", ("in", "outcome", frozenset({"fail", "lost"})), ("in", "event_type", frozenset({"turnover", "dispossessed"}))
+    )
+    assert count_declarations()["M_TURNOVER_COUNT"] == COUNT_DECLARATIONS["M_TURNOVER_COUNT"]
+
+    events = [
+        {"team_id": "A", "event_type": "pass", "start_x": 0, "end_x": 20},
+        {"team_id": "A", "event_type": "shot"},
+        {"team_id": "B", "event_type": "pass", "start_x": 50, "end_x": 55},
+    ]
+    ctx = FormulaContext(events, params={"threshold": 15.0})
+    f = compile_formula("RATIO(COUNT(pass WHERE end_x - start_x >= threshold), COUNT(pass))")
+    assert f.evaluate(ctx) == 0.5
+    assert f.evaluate(ctx, group_by="team") == {"A": 1.0, "B": 0.0}
+    assert compile_formula("SUM(end_x - start_x WHERE event_type == 'PASS')").evaluate(ctx) == 25.0
+
+
+def test_evaluate_registry_matches_reported_counts_and_validates():
+    events = [
+        {"team_id": "A", "possession_id": 1, "event_type": "pass", "outcome": "incomplete", "start_x": 0, "end_x": 30},
+        {"team_id": "A", "possession_id": 1, "event_type": "shot"},
+        {"team_id": "B", "possession_id": 2, "event_type": "carry", "outcome": "failed"},
+    ]
+    possessions = possession_table(events)
+    sequences = sequence_table(events, possessions)
+    raw = compute_raw_metrics(events)
+    reg = evaluate_registry(events, sequences=sequences, possessions=possessions)
+    assert reg["M_TURNOVER_COUNT"] == raw["metrics"]["M_TURNOVER_COUNT"]["value"] == 2
+    assert all(reg[mid] == p["value"] for mid, p in raw["metrics"].items())
+    assert reg["M_SEQUENCE_LENGTH"] == 1.5  # sequences of 2 and 1 events
+    # the SegmentTable path and span objects give the same values
+    assert evaluate_registry(events, sequences=sequences.to_list(), possessions=possessions.to_list()) == reg
+    assert "M_SEQUENCE_LENGTH" not in evaluate_registry(events)
+
+    by_team = evaluate_registry(events, sequences=sequences, group_by="team")
+    assert by_team["M_TURNOVER_COUNT"] == {"A": 1, "B": 1}
+    assert by_team["M_SEQUENCE_LENGTH"] == {"A": 2.0, "B": 1.0}
+    assert evaluate_registry(events, sequences=sequences.to_list(), group_by="team") == by_team
+    assert evaluate_registry(events, sequences=sequences, group_by="possession")["M_SHOT_COUNT"] == {1: 1, 2: 0}
+
+    meta = {"columns_present": raw["meta"]["columns_present"]}
+    validated, flags = validate_metrics(raw, meta, registry_values=reg)
+    assert not [f for f in flags if f.startswith(("formula_mismatch", "formula_error"))]
+    assert validated["metrics"]["M_TURNOVER_COUNT"]["status"] == "OK"
+    validated, flags = validate_metrics(raw, meta, registry_values=dict(reg, M_SHOT_COUNT=0))
+    assert "formula_mismatch:M_SHOT_COUNT" in flags
+    assert validated["metrics"]["M_SHOT_COUNT"]["reason"] == "registry_formula_mismatch"
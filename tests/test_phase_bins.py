@@ -0,0 +1,32 @@
+import pandas as pd
+
+from hp_motor.segmentation.phase_bins import BIN_COLS, phase_bins, rollup
+
+
+def test_phase_bins_grid_switches_and_rollup():
+    events = pd.DataFrame({
+        "event_id": [1, 2, 3, 4, 5, 6],
+        "half": [1, 1, 1, 1, 1, 2],
+        "t_start": [1.0, 2.0, 3.0, 7.0, 8.0, 1.0],
+        "team_name": ["A", "B", "A", "A", "A", None],
+        "action_label": ["Goal", "foul", "x", "goal ", None, "goal"],
+    })
+    res = phase_bins(events, {"goal"}, {"foul"}, resolutions=[5.0, 60.0])
+    fine = res[5.0]
+    assert list(fine.columns) == BIN_COLS
+    assert fine[["bin", "team_name", "event_count", "mom_sum", "switch_count", "teams_active"]].values.tolist() == [
+        [0.0, "A", 2, 1, 2, 2],
+        [0.0, "B", 1, -1, 2, 2],
+        [5.0, "A", 2, 1, 0, 1],
+        [5.0, "B", 0, 0, 0, 1],  # team without events still gets its row
+    ]
+    assert fine["phase_label_v7"].tolist() == ["attack", "defence", "attack", "transition"]
+
+    minute = res[60.0]
+    assert minute[["team_name", "event_count", "switch_count"]].values.tolist() == [["A", 4, 2], ["B", 1, 2]]
+
+    up = rollup(fine, seconds=60, sw_min=1, mom_def_b_max=None)
+    assert up[["team_name", "bin", "event_count", "mom_sum", "switch_count"]].values.tolist() == [
+        ["A", 0, 4, 2, 2], ["B", 0, 1, -1, 2],
+    ]
+    assert "phase_label_v7_1m" in up.columns
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from hp_motor.segmentation.phase_tagger import _infer_row, tag_phases
+
+
+def _frame():
+    return pd.DataFrame({
+        "event_type": ["pass", "Shot", "tackle", "pass", "carry", "corner", None, "pass"],
+        "outcome": ["complete", "saved", None, "failed", "lost", "complete", "out", np.nan],
+        "minute": [0, 0, 0, 1, 1, 2, 2, 3],
+        "second": [1, 5, 7, 0, 3, 0, 30, 0],
+        "possession_id": ["p1", "p1", "p2", "p2", "p3", "p3", "p4", "p4"],
+        "team_id": ["A", "A", "B", "B", "A", "A", "B", "B"],
+        "start_x": [10.0, 90.0, 50.0, 60.0, None, 100.0, 20.0, 115.0],
+        "end_x": [30.0, None, np.nan, 80.0, 40.0, "bad", None, 118.0],
+    })
+
+
+def test_vectorized_phases_match_row_rules():
+    out = tag_phases(_frame())["phase_id"].tolist()
+
+    ref = _frame()
+    ref["_t"] = ref["minute"] * 60.0 + ref["second"]
+    prev = ref["possession_id"].shift(1)
+    ref["_poss_changed"] = (ref["possession_id"] != prev) & prev.notna()
+    ref["_dt"] = (ref["_t"] - ref["_t"].shift(1)).fillna(9999)
+    expected = ref.apply(_infer_row, axis=1).tolist()
+
+    assert out == expected
+    assert "P6_POS_TRANSITION" in out and "P3_FINALIZATION" in out
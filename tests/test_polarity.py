@@ -0,0 +1,28 @@
+import json
+
+import pandas as pd
+import pytest
+
+from hp_motor.semantics.polarity import SUBSTRING, load_polarity, polarity_index
+
+
+def test_exact_and_substring_modes():
+    labels = pd.Series(["Goal ", "foul", "own goal", "foul goal", None, 3, "goal"])
+    exact = polarity_index({"goal"}, {"foul", "goal"})
+    assert exact.score(labels).tolist() == [1, -1, 0, 0, 0, 0, 1]
+    sub = polarity_index({"goal"}, {"foul"}, mode=SUBSTRING)
+    assert sub.score(labels).tolist() == [1, -1, 1, 1, 0, 0, 1]
+    assert sub.score([]).tolist() == []
+    with pytest.raises(ValueError):
+        polarity_index({"goal"}, set(), mode="fuzzy")
+
+
+def test_load_polarity_is_cached_per_dictionary_hash(tmp_path):
+    d = {"force_positive": ["Goal"], "force_negative": ["faul"], "neutral": ["x"]}
+    a, b = tmp_path / "a.json", tmp_path / "b.json"
+    a.write_text(json.dumps(d), encoding="utf-8")
+    b.write_text(json.dumps(d), encoding="utf-8")
+    idx = load_polarity(a)
+    assert load_polarity(b) is idx  # same content, one compile
+    assert idx is polarity_index(["goal "], ["FAUL"])
+    assert idx.score(pd.Series(["goal", "Faul", "x"])).tolist() == [1, -1, 0]
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+from hp_motor.ingest.loader import load_table
+from hp_motor.ingestion.loaders import load_events
+from hp_motor.ingestion.sportscode import CORE_COLS
+
+XML = """<?xml version="1.0" encoding="UTF-8"?>
+<file><ALL_INSTANCES>
+  <instance><ID>1</ID><start>5.21</start><end>5.21</end><code>Start of the 1st half</code>
+    <label><group>Team</group><text>None</text></label>
+    <label><group>Action</group><text>Start of the 1st half</text></label>
+    <label><group>Half</group><text>1</text></label>
+    <label><group>pos_x</group><text>None</text></label></instance>
+  <instance><ID>2</ID><start>5.21</start><end>11.21</end>
+    <code>20. Ilkay Gundogan (567726) - Paslar adresi bulanlar</code>
+    <label><group>Team</group><text>Galatasaray (29205)</text></label>
+    <label><group>Action</group><text>Paslar  adresi bulanlar</text></label>
+    <label><group>Half</group><text>1</text></label>
+    <label><group>pos_x</group><text>52.43</text></label>
+    <label><group>pos_y</group><text>34.24</text></label></instance>
+</ALL_INSTANCES></file>
+"""
+
+
+def test_xml_export_streams_core_rows(tmp_path, monkeypatch):
+    monkeypatch.setenv("HP_MOTOR_CACHE_DIR", str(tmp_path / "cache"))
+    p = tmp_path / "match.xml"
+    p.write_text(XML, encoding="utf-8")
+
+    rows = load_events(Path(p))
+    assert [list(r) for r in rows] == [CORE_COLS, CORE_COLS]
+    assert rows[0]["team_name"] is None and rows[0]["pos_x"] is None
+    assert rows[0]["action_label"] == "start of the 1st half"
+    assert rows[1]["team_name"] == "Galatasaray" and rows[1]["team_id"] == 29205
+    assert rows[1]["player_id"] == 567726 and rows[1]["action_label"] == "paslar adresi bulanlar"
+
+    df = load_table(str(p))
+    assert list(df.columns) == CORE_COLS and df["pos_y"].tolist()[1] == 34.24
+
+
+def test_convert_frame_matches_row_conversion(tmp_path):
+    import pandas as pd
+
+    from hp_motor.ingestion.sportscode import RAW_COLS, convert_files, convert_frame, core_row
+
+    raw = pd.DataFrame([
+        ["1", "5.21", "5.21", "Start of the 1st half", None, "Start of the 1st half", "1", None, None],
+        ["2", "5.21", "11.21", "20. A B (567726) - Paslar", "Galatasaray (29205)", "Paslar", "1", "52.43", "34.24"],
+        ["3", "-0.5", "x", "no code", "Team", None, "nan", "1e500", " 7 "],
+    ], columns=RAW_COLS)
+    expected = pd.DataFrame([core_row(r) for r in raw.to_dict("records")])
+    got = convert_frame(raw)
+    assert got.to_csv(index=False) == expected.to_csv(index=False)
+
+    # ids past the int64 range are kept exact, not wrapped
+    big = raw.iloc[:2].copy()
+    big.loc[0, "ID"] = "99999999999999999999"
+    big["team"] = ["Galatasaray (29205)", "Galatasaray (9223372036854775808)"]
+    got = convert_frame(big)
+    assert got["event_id"].tolist() == [10**20, 2]
+    assert got["team_id"].tolist() == [29205, 2**63]
+    assert got.to_csv(index=False) == pd.DataFrame([core_row(r) for r in big.to_dict("records")]).to_csv(index=False)
+
+    src = tmp_path / "m.csv"
+    raw.to_csv(src, index=False, sep=";")
+    assert convert_files([(src, tmp_path / "out" / "m_core.csv")], workers=1) == [(3, 13)]
@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from hp_motor.ingestion.loaders import iter_event_chunks
+from hp_motor.ingestion.normalizers import normalize_events
+from hp_motor.metrics.factory import compute_raw_metrics
+from hp_motor.pipeline_single import iter_match_metrics
+from hp_motor.segmentation.possessions import PossessionSegmenter, iter_possessions, possession_table, segment_possessions
+from hp_motor.segmentation.segment_table import SEQUENCE, SegmentTable
+from hp_motor.segmentation.sequences import SequenceSegmenter, segment_sequences, sequence_table
+
+
+def _write_two_matches(tmp_path):
+    base = json.loads(Path("tests/fixtures/events_min.json").read_text(encoding="utf-8"))
+    events = base + [dict(e, match_id="m2") for e in base]
+    p = tmp_path / "season.jsonl"
+    p.write_text("\n".join(json.dumps(e) for e in events), encoding="utf-8")
+    return p, events
+
+
+def test_chunks_never_span_matches(tmp_path):
+    p, _ = _write_two_matches(tmp_path)
+    chunks = list(iter_event_chunks(p, chunk_size=2))
+    assert [(c.match_id, len(c.table), c.offset, c.last) for c in chunks] == [
+        ("m1", 2, 0, False), ("m1", 2, 2, False), ("m1", 1, 4, True),
+        ("m2", 2, 0, False), ("m2", 2, 2, False), ("m2", 1, 4, True),
+    ]
+
+
+def test_streamed_match_metrics_equal_full_load(tmp_path):
+    p, events = _write_two_matches(tmp_path)
+    out = list(iter_match_metrics(p, chunk_size=2))
+    assert [o["match_id"] for o in out] == ["m1", "m2"]
+
+    full = normalize_events([e for e in events if e["match_id"] == "m1"])
+    assert out[0]["metrics_raw"] == compute_raw_metrics(full)
+    assert out[0]["events_summary"]["n_possessions"] == len(segment_possessions(full))
+
+    tables = [c.table for c in iter_event_chunks(p, chunk_size=3, group_by_match=False)]
+    assert list(iter_possessions(tables)) == segment_possessions(normalize_events(events))
+
+
+def test_stateful_segmenters_resume_from_checkpoint():
+    events = normalize_events(json.loads(Path("tests/fixtures/events_min.json").read_text(encoding="utf-8")) * 2)
+    possessions = segment_possessions(events)
+    sequences = segment_sequences(events, possessions)
+
+    ps, ss = PossessionSegmenter(), SequenceSegmenter()
+    got_p, got_s = ps.extend(events[:4]), ss.extend(events[:4])
+    ps = PossessionSegmenter.from_state(json.loads(json.dumps(ps.state())))
+    ss = SequenceSegmenter.from_state(json.loads(json.dumps(ss.state())))
+    for e in events[4:]:
+        got_p += ps.feed(e)
+        got_s += ss.feed(e)
+    assert got_p + ps.flush() == possessions
+    assert got_s + ss.flush() == sequences
+
+
+def test_segment_tables_materialize_lazily():
+    events = normalize_events(json.loads(Path("tests/fixtures/events_min.json").read_text(encoding="utf-8")) * 2)
+    possessions = segment_possessions(events)
+    sequences = segment_sequences(events, possessions)
+
+    pt = possession_table(events)
+    st = sequence_table(events, pt)
+    assert st.starts.dtype == np.int32 and len(st) == len(sequences)
+    assert st.sequence_ids() == [s.sequence_id for s in sequences]
+    assert st[-1] == sequences[-1] and list(pt) == possessions
+
+    out = SegmentTable(SEQUENCE, capacity=1)
+    seg = SequenceSegmenter(out=out)
+    assert seg.extend(events) == [] and seg.flush() == []
+    assert out.to_list() == sequences
@@ -0,0 +1,78 @@
+import os
+
+import pandas as pd
+import pytest
+
+from hp_motor.ingest import table_cache
+from hp_motor.ingest.loader import load_table
+
+
+def test_table_cache_reuses_and_invalidates(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setenv("HP_MOTOR_CACHE_DIR", str(tmp_path / "cache"))
+    hashed = []
+    sha256 = table_cache._sha256
+    monkeypatch.setattr(table_cache, "_sha256", lambda path: hashed.append(path) or sha256(path))
+
+    p = tmp_path / "t.csv"
+    p.write_text("a;b\n1;x\n", encoding="utf-8")
+    first = load_table(str(p))
+    assert len(hashed) == 1
+    assert len(list((tmp_path / "cache" / "tables").iterdir())) == 2  # stamp + sidecar
+
+    again = load_table(str(p))
+    assert again.equals(first) and again is not first
+    assert len(hashed) == 1  # untouched file: served from the sidecar without hashing
+
+    p.write_text("a;b\n2;y\n", encoding="utf-8")
+    st = p.stat()
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert load_table(str(p))["a"].tolist() == [2]
+    assert len(list((tmp_path / "cache" / "tables").iterdir())) == 2  # old sidecar removed
+
+
+def test_table_cache_evicts_replaced_sidecars(tmp_path, monkeypatch):
+    # sidecar format stubbed (no pyarrow needed): csv text under the .feather name
+    monkeypatch.setenv("HP_MOTOR_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(table_cache, "_has_pyarrow", lambda: True)
+    monkeypatch.setattr(table_cache, "_write", lambda df, stem: df.to_csv(stem.with_suffix(".feather"), index=False) or stem.with_suffix(".feather"))
+    monkeypatch.setattr(table_cache, "_read", lambda data: pd.read_csv(data))
+    root = tmp_path / "cache" / "tables"
+
+    def rewrite(p, text):
+        p.write_text(text, encoding="utf-8")
+        st = p.stat()
+        os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    p, twin = tmp_path / "t.csv", tmp_path / "twin.csv"
+    p.write_text("a;b\n1;x\n", encoding="utf-8")
+    twin.write_text("a;b\n1;x\n", encoding="utf-8")
+    load_table(str(p))
+    load_table(str(twin))
+    assert len(list(root.glob("*.feather"))) == 1  # same content, one shared sidecar
+
+    rewrite(p, "a;b\n2;y\n")
+    assert load_table(str(p))["a"].tolist() == [2]
+    assert len(list(root.glob("*.feather"))) == 2  # twin still uses the old one
+    assert load_table(str(twin))["a"].tolist() == [1]
+
+    rewrite(twin, "a;b\n3;z\n")
+    assert load_table(str(twin))["a"].tolist() == [3]
+    assert len(list(root.glob("*.feather"))) == 2  # unused sidecar removed
+    assert len(list(root.glob("*.json"))) == 2
+
+
+def test_table_cache_never_writes_pickle(tmp_path, monkeypatch):
+    monkeypatch.setenv("HP_MOTOR_CACHE_DIR", str(tmp_path / "cache"))
+    p = tmp_path / "t.csv"
+    p.write_text("a;b\n1;x\n", encoding="utf-8")
+
+    monkeypatch.setattr(table_cache, "_has_pyarrow", lambda: False)
+    assert load_table(str(p))["a"].tolist() == [1]
+    assert not (tmp_path / "cache" / "tables").exists()
+
+    # a frame Feather cannot round-trip is read but not cached
+    monkeypatch.setattr(table_cache, "_has_pyarrow", lambda: True)
+    monkeypatch.setattr(table_cache, "_write", lambda df, stem: None)
+    assert load_table(str(p))["a"].tolist() == [1]
+    assert not list((tmp_path / "cache" / "tables").glob("*"))
@@ -0,0 +1,28 @@
+from hp_motor.semantics.tagger import FazIndex, build_6faz_index, tag_metric
+
+
+def _scan(name, idx):
+    # the linear-scan semantics tag_metric must keep
+    n = " ".join(str(name).strip().lower().split())
+    if n in idx:
+        return idx[n]
+    hits = [v for k, v in idx.items() if k and (k in n or n in k)]
+    return hits[0] if len(hits) == 1 else {"phase_id": None, "metric_role": None, "raw": None}
+
+
+def test_indexed_tag_metric_matches_scan():
+    mapj = {
+        "pairings": [
+            {"phase_id": "P1", "anchor_metric": "Progressive passes; Final third entries", "success_validators": "xG"},
+            {"phase_id": "P2", "functional_enablers": "Passes accurate / Shots"},
+        ]
+    }
+    idx = build_6faz_index(mapj)
+    assert isinstance(idx, FazIndex)
+    names = ["progressive passes", "Progressive Passes per 90", "passes", "third", "xg chain",
+             "shots on target", "", "zzz", "final third entries accurate"]
+    for name in names:
+        assert tag_metric(name, idx) == _scan(name, dict(idx)), name
+
+    idx["key passes"] = {"phase_id": "P3", "metric_role": "anchor", "raw": "Key passes"}  # drops the memo
+    assert tag_metric("key passes into box", idx)["phase_id"] == "P3"
@@ -7,3 +7,10 @@ def load_polarity_dict(path: str):
     neg = set([str(x).strip().lower() for x in d.get("force_negative", [])])
     neu = set([str(x).strip().lower() for x in d.get("neutral", [])])
     return pos, neg, neu, d
+
+def read_csv_cached(path: str, **kwargs):
+    # pd.read_csv(path, **kwargs) through the on-disk parsed-table cache (hp_motor.ingest.table_cache)
+    import pandas as pd
+    from hp_motor.ingest.table_cache import cached_frame
+    kind = "read_csv:" + repr(sorted(kwargs.items()))
+    return cached_frame(path, kind, lambda p: pd.read_csv(p, **kwargs))
@@ -1,11 +1,11 @@
 import os
-import pandas as pd
+from tools._shared import read_csv_cached
 
 CORE = "data/processed/city_gs_events_core.csv"
 OUT = "artifacts/registry/city_gs_action_labels.csv"
 
 def main():
-    df = pd.read_csv(CORE)
+    df = read_csv_cached(CORE)
     df = df.dropna(subset=["team_name"]).copy()
 
     # basic registry
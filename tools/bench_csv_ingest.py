@@ -0,0 +1,65 @@
+"""
+Benchmark: CSV -> normalized events, per-event dicts vs the compiled projection plan.
+
+  python tools/bench_csv_ingest.py --rows 300000
+"""
+import argparse
+import csv
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from hp_motor.ingestion.loaders import load_events, read_csv_table
+from hp_motor.ingestion.normalizers import normalize_events
+
+HEADER = ["match_id", "team_id", "player_id", "period", "minute", "second", "event_type", "outcome",
+          "possession_id", "start_x", "start_y", "end_x", "end_y", "xg", "body_part"]
+EVENT_TYPES = ["Pass", "Shot", "Carry", "Tackle", "Interception", "Pressure", "Clearance"]
+
+
+def write_csv(path: Path, rows: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(HEADER)
+        for i in range(rows):
+            t = i * 95 * 60 // rows
+            w.writerow([
+                "m1", rng.choice("AB"), f"p{rng.randint(1, 22)}", 1 + 2 * i // rows, t // 60, t % 60,
+                rng.choice(EVENT_TYPES), rng.choice(["Complete", "Incomplete", ""]), i // 8,
+                f"{rng.uniform(0, 120):.2f}", f"{rng.uniform(0, 80):.2f}",
+                f"{rng.uniform(0, 120):.2f}", f"{rng.uniform(0, 80):.2f}",
+                f"{rng.random():.3f}", rng.choice(["left", "right", "head"]),
+            ])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=300_000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as td:
+        path = Path(td) / "events.csv"
+        write_csv(path, args.rows)
+        print(f"rows={args.rows:,}")
+
+        t0 = time.perf_counter()
+        slow = normalize_events(load_events(path))
+        t_slow = time.perf_counter() - t0
+        print(f"dict rows : {t_slow:.3f}s")
+
+        t0 = time.perf_counter()
+        fast = read_csv_table(path)
+        t_fast = time.perf_counter() - t0
+        print(f"plan      : {t_fast:.3f}s")
+
+    same = fast.to_records() == slow
+    print(f"identical : {same}")
+    print(f"speedup   : {t_slow / t_fast:.1f}x")
+    if not same:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: ingest.loader.load_table CSV engines on data/raw/city_gs.csv scaled up
+(body rows repeated) to season size.
+
+  python -m tools.bench_load_table --scale 38
+"""
+import argparse
+import io
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from hp_motor.ingest.loader import read_csv_fast
+
+SRC = Path("data/raw/city_gs.csv")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--src", default=str(SRC))
+    ap.add_argument("--scale", type=int, default=38, help="maç sayısı (sezon ~38)")
+    args = ap.parse_args()
+
+    head, body = Path(args.src).read_bytes().split(b"\n", 1)
+    if not body.endswith(b"\n"):
+        body += b"\n"
+    data = head + b"\n" + body * args.scale
+    print(f"scale={args.scale}  bytes={len(data):,}")
+
+    runs = {
+        "python": lambda: pd.read_csv(io.BytesIO(data), sep=";", encoding="utf-8", engine="python"),
+        "c": lambda: pd.read_csv(io.BytesIO(data), sep=";", encoding="utf-8", float_precision="round_trip"),
+        "fast_path": lambda: read_csv_fast(data),
+    }
+    try:
+        import pyarrow  # noqa: F401
+        runs["pyarrow"] = lambda: pd.read_csv(io.BytesIO(data), sep=";", encoding="utf-8", engine="pyarrow")
+    except ImportError:
+        print("pyarrow    : not installed, skipped")
+
+    out = {}
+    for name, fn in runs.items():
+        t0 = time.perf_counter()
+        out[name] = fn()
+        dt = time.perf_counter() - t0
+        print(f"{name:<10} : {dt:.3f}s  rows={len(out[name]):,}")
+        out[name + "_t"] = dt
+
+    same = out["fast_path"].equals(out["python"])
+    print(f"identical : {same}")
+    print(f"speedup   : {out['python_t'] / out['fast_path_t']:.1f}x (fast_path vs python)")
+    if not same:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: vectorized tag_phases vs the row-wise DataFrame.apply rules.
+
+  python tools/bench_phase_tagger.py --rows 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from hp_motor.segmentation.phase_tagger import _infer_row, tag_phases
+from hp_motor.segmentation.set_piece_state import tag_set_piece_state
+
+EVENT_TYPES = ["pass", "shot", "carry", "dribble", "tackle", "interception", "pressure",
+               "clearance", "ball_loss", "touch", "recovery", "corner", "free_kick", "throw_in"]
+OUTCOMES = ["complete", "incomplete", "failed", "lost", "out", "won", "success"]
+
+
+def make_frame(rows: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    t = np.sort(rng.integers(0, 95 * 60, size=rows))
+    poss = np.cumsum(rng.random(rows) < 0.12)
+    sx = rng.uniform(0, 120, size=rows)
+    ex = np.where(rng.random(rows) < 0.2, np.nan, rng.uniform(0, 120, size=rows))
+    return pd.DataFrame({
+        "event_type": rng.choice(EVENT_TYPES, size=rows),
+        "outcome": rng.choice(OUTCOMES, size=rows),
+        "minute": t // 60,
+        "second": t % 60,
+        "possession_id": poss.astype(str),
+        "team_id": np.where(poss % 2 == 0, "A", "B"),
+        "start_x": sx,
+        "end_x": ex,
+    })
+
+
+def rowwise(df: pd.DataFrame) -> pd.Series:
+    # the pre-vectorization pandas path
+    df = tag_set_piece_state(df)
+    df["_t"] = df["minute"].astype(float) * 60.0 + df["second"].astype(float)
+    df["_prev_poss"] = df["possession_id"].shift(1)
+    df["_prev_t"] = df["_t"].shift(1)
+    df["_poss_changed"] = (df["possession_id"] != df["_prev_poss"]) & df["_prev_poss"].notna()
+    df["_dt"] = (df["_t"] - df["_prev_t"]).fillna(9999)
+    return df.apply(_infer_row, axis=1)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--skip-rowwise", action="store_true", help="only time the vectorized path")
+    args = ap.parse_args()
+
+    base = make_frame(args.rows)
+    print(f"rows={len(base):,}")
+
+    t0 = time.perf_counter()
+    fast = tag_phases(base.copy())["phase_id"]
+    t_fast = time.perf_counter() - t0
+    print(f"vectorized: {t_fast:.3f}s")
+
+    if args.skip_rowwise:
+        return
+
+    t0 = time.perf_counter()
+    slow = rowwise(base.copy())
+    t_slow = time.perf_counter() - t0
+    print(f"row-wise  : {t_slow:.3f}s")
+
+    same = fast.tolist() == slow.tolist()
+    print(f"identical : {same}")
+    print(f"speedup   : {t_slow / t_fast:.1f}x")
+    if not same:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
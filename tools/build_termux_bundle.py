@@ -0,0 +1,77 @@
+"""
+Rebuild hp_motor_termux_bootstrap.zip from the repo.
+
+The STEP12-14 scripts are thin wrappers over hp_motor.match_pack, so the bundle ships
+that package (stdlib-only; numpy / pandas are optional there) next to them. README.txt
+in the bundle is the Termux section of the repo README.txt. Entries are written in a
+fixed order with a fixed timestamp, so an unchanged tree rebuilds the same archive.
+
+  python tools/build_termux_bundle.py            # rewrite the zip
+  python tools/build_termux_bundle.py --check    # exit 1 if the zip is out of date
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import zipfile
+from pathlib import Path
+from typing import Dict
+
+ROOT = Path(__file__).resolve().parents[1]
+BUNDLE = ROOT / "hp_motor_termux_bootstrap.zip"
+
+FILES = [
+    "STEP12_PHASE_TAGGER_MVP.py",
+    "STEP13_TEMPO_MOMENTS.py",
+    "STEP14_BRIEF_V2_RENDER.py",
+    "alias_map.example.json",
+    "run.sh",
+    "hp_motor/__init__.py",
+    "hp_motor/cli.py",
+]
+PACKAGES = ["hp_motor/match_pack"]
+
+_README_END = "========================\nREPORTS RELEASE CHECKLIST"
+_DATE = (2026, 1, 28, 23, 56, 56)
+
+
+def bundle_files(root: Path = ROOT) -> Dict[str, bytes]:
+    """Archive name -> content, in archive order."""
+    readme = (root / "README.txt").read_text(encoding="utf-8")
+    out = {"README.txt": (readme.split(_README_END, 1)[0].rstrip() + "\n").encode("utf-8")}
+    for rel in FILES:
+        out[rel] = (root / rel).read_bytes()
+    for pkg in PACKAGES:
+        for p in sorted((root / pkg).glob("*.py")):
+            out[p.relative_to(root).as_posix()] = p.read_bytes()
+    return out
+
+
+def build(path: Path = BUNDLE, root: Path = ROOT) -> Path:
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        for name, data in bundle_files(root).items():
+            info = zipfile.ZipInfo(name, date_time=_DATE)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = (0o755 if name.endswith(".sh") else 0o644) << 16
+            z.writestr(info, data)
+    return path
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--check", action="store_true", help="compare the committed zip with the tree")
+    args = ap.parse_args()
+    if args.check:
+        with zipfile.ZipFile(BUNDLE) as z:
+            current = {n: z.read(n) for n in z.namelist()}
+        if current != bundle_files():
+            print(f"OUT OF DATE: {BUNDLE.name} (run python tools/build_termux_bundle.py)")
+            return 1
+        print(f"OK: {BUNDLE.name} matches the tree")
+        return 0
+    print(f"OK: wrote {build()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,56 +1,24 @@
 import os
-import pandas as pd
 import matplotlib.pyplot as plt
 
-from tools._shared import load_polarity_dict
+from hp_motor.semantics.polarity import load_polarity
+from tools._shared import read_csv_cached
 DICT_PATH = "tools/dicts_city_gs.json"
 
 SRC = "data/processed/city_gs_events_core.csv"
 OUT_DIR = "artifacts/momentum"
 BIN_MIN = 5.0  # minutes
 
-POSITIVE = {
-    "paslar adresi bulanlar",
-    "playing in set-piece attacks",
-    "successful pass",
-    "goal",
-    "shot on target",
-}
-
-NEGATIVE = {
-    "incomplete passes forward",
-    "incomplete passes",
-    "isabetsiz paslar",
-}
-
-def score_action(label, POS, NEG):
-    if not isinstance(label, str):
-        return 0
-    l = label.strip().lower()
-    if l in POS:
-        return 1
-    if l in NEG:
-        return -1
-    return 0
-    l = label.lower()
-    for p in POSITIVE:
-        if p in l:
-            return 1
-    for n in NEGATIVE:
-        if n in l:
-            return -1
-    return 0
-
 def main():
-    POS, NEG, NEU, META = load_polarity_dict(DICT_PATH)
-    df = pd.read_csv(SRC)
+    polarity = load_polarity(DICT_PATH)
+    df = read_csv_cached(SRC)
 
     # basic guards
     assert "t_start" in df.columns
     assert "team_name" in df.columns
     assert "action_label" in df.columns
 
-    df["score"] = df["action_label"].apply(lambda x: score_action(x, POS, NEG))
+    df["score"] = polarity.score(df["action_label"])
 
     # time binning
     df["bin"] = (df["t_start"] // BIN_MIN) * BIN_MIN
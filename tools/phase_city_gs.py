@@ -1,6 +1,7 @@
 import os
-import pandas as pd
 import matplotlib.pyplot as plt
+from hp_motor.semantics.polarity import SUBSTRING, polarity_index
+from tools._shared import read_csv_cached
 
 SRC = "data/processed/city_gs_events_core.csv"
 OUT_DIR = "artifacts/phase"
@@ -20,20 +21,8 @@ NEGATIVE = {
     "isabetsiz paslar",
 }
 
-def score_action(label):
-    if not isinstance(label, str):
-        return 0
-    l = label.lower()
-    for p in POSITIVE:
-        if p in l:
-            return 1
-    for n in NEGATIVE:
-        if n in l:
-            return -1
-    return 0
-
 def main():
-    df = pd.read_csv(SRC)
+    df = read_csv_cached(SRC)
 
     # Guards
     for c in ["t_start", "team_name", "action_label", "event_id"]:
@@ -50,7 +39,7 @@ def main():
     df["bin"] = (df["t_start"] // BIN_MIN) * BIN_MIN
 
     # Momentum score per event
-    df["mom_evt"] = df["action_label"].apply(score_action)
+    df["mom_evt"] = polarity_index(POSITIVE, NEGATIVE, mode=SUBSTRING).score(df["action_label"])
 
     # Possession proxy: count switches within each bin (team changes)
     # switch = current team != previous team (within same half+bin)
@@ -1,12 +1,12 @@
 import os
-import pandas as pd
 import matplotlib.pyplot as plt
+from tools._shared import read_csv_cached
 
 SRC_V3 = "artifacts/phase/city_gs_phase_5min_v3.csv"
 OUT_DIR = "artifacts/phase"
 
 def main():
-    df = pd.read_csv(SRC_V3)
+    df = read_csv_cached(SRC_V3)
 
     low_poss = df["possession_share_proxy"].quantile(0.40)
     high_poss = df["possession_share_proxy"].quantile(0.60)
@@ -1,40 +1,18 @@
 import os
-import pandas as pd
 import matplotlib.pyplot as plt
 
-SRC_V3 = "artifacts/phase/city_gs_phase_5min_v3.csv"
-OUT_DIR = "artifacts/phase"
+from hp_motor.segmentation.phase_bins import phase_bins
+from tools._shared import load_polarity_dict, read_csv_cached
 
-ATT_HIGH = 0.65
-DEF_LOW  = 0.35
-MOM_POS  = 1
-MOM_NEG  = -1
+DICT_PATH = "tools/dicts_city_gs.json"
+CORE = "data/processed/city_gs_events_core.csv"
+OUT_DIR = "artifacts/phase"
+BIN_SEC = 5.0
 
 def main():
-    df = pd.read_csv(SRC_V3)
-
-    # (half,bin) bazında iki takım da aktif mi?
-    both = df.groupby(["half","bin"])["event_count"].apply(lambda s: int((s>0).sum()))
-    both = both.reset_index().rename(columns={"event_count":"teams_active"})
-    df = df.merge(both, on=["half","bin"], how="left")
-
-    def phase_v7(r):
-        share = float(r["possession_share_proxy"])
-        mom   = float(r["mom_sum"])
-        sw    = int(r["switch_count"])
-        ta    = int(r.get("teams_active", 0) or 0)
-
-        # Attack
-        if (share >= ATT_HIGH) or (mom >= MOM_POS and share >= 0.50):
-            return "attack"
-
-        # Defence: low possession AND (neg momentum OR both-active + at least one switch)
-        if (share <= DEF_LOW) and (mom <= MOM_NEG or (ta == 2 and sw >= 1)):
-            return "defence"
-
-        return "transition"
-
-    df["phase_label_v7"] = df.apply(phase_v7, axis=1)
+    POS, NEG, NEU, META = load_polarity_dict(DICT_PATH)
+    # v3 metrics + v7 labels straight from core events (no v3 csv round-trip)
+    df = phase_bins(read_csv_cached(CORE), POS, NEG, resolutions=[BIN_SEC])[BIN_SEC]
 
     os.makedirs(OUT_DIR, exist_ok=True)
     out_csv = os.path.join(OUT_DIR, "city_gs_phase_5min_v7.csv")
@@ -3,7 +3,8 @@ import argparse
 import pandas as pd
 import matplotlib.pyplot as plt
 
-from tools._shared import load_polarity_dict
+from hp_motor.semantics.polarity import load_polarity
+from tools._shared import read_csv_cached
 DICT_PATH = "tools/dicts_city_gs.json"
 
 CORE_DEFAULT = "data/processed/city_gs_events_core.csv"
@@ -11,24 +12,6 @@ PHASE_DEFAULT = "artifacts/phase/city_gs_phase_5min.csv"
 LABEL_DEFAULT = "phase_label"
 
 
-def score_action(label, POS, NEG):
-    if not isinstance(label, str):
-        return 0
-    l = label.strip().lower()
-    if l in POS:
-        return 1
-    if l in NEG:
-        return -1
-    return 0
-    l = label.lower()
-    for p in POSITIVE:
-        if p in l:
-            return 1
-    for n in NEGATIVE:
-        if n in l:
-            return -1
-    return 0
-
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--core", default=CORE_DEFAULT)
@@ -37,13 +20,13 @@ def main():
     ap.add_argument("--outdir", default="artifacts/scorecard")
     args = ap.parse_args()
 
-    POS, NEG, NEU, META = load_polarity_dict(DICT_PATH)
+    polarity = load_polarity(DICT_PATH)
 
     os.makedirs(args.outdir, exist_ok=True)
 
-    core = pd.read_csv(args.core)
+    core = read_csv_cached(args.core)
     core = core.dropna(subset=["team_name"]).copy()
-    core["score"] = core["action_label"].apply(lambda x: score_action(x, POS, NEG))
+    core["score"] = polarity.score(core["action_label"])
 
     # match duration proxy
     dur = core.groupby("half")["t_start"].max().fillna(0).to_dict()
@@ -62,7 +45,7 @@ def main():
     })
     summary["pass_eff_proxy"] = summary["pos_actions"] / (summary["pos_actions"] + summary["neg_actions"]).replace(0, 1)
 
-    ph = pd.read_csv(args.phase)
+    ph = read_csv_cached(args.phase)
 
     # possession mean
     poss = ph.groupby("team_name")["possession_share_proxy"].mean().reset_index()
@@ -1,6 +1,8 @@
 import os
 import pandas as pd
 import matplotlib.pyplot as plt
+from hp_motor.semantics.polarity import SUBSTRING, polarity_index
+from tools._shared import read_csv_cached
 
 CORE = "data/processed/city_gs_events_core.csv"
 PHASE = "artifacts/phase/city_gs_phase_5min.csv"
@@ -20,22 +22,10 @@ NEGATIVE = {
     "isabetsiz paslar",
 }
 
-def score_action(label):
-    if not isinstance(label, str):
-        return 0
-    l = label.lower()
-    for p in POSITIVE:
-        if p in l:
-            return 1
-    for n in NEGATIVE:
-        if n in l:
-            return -1
-    return 0
-
 def main():
-    core = pd.read_csv(CORE)
+    core = read_csv_cached(CORE)
     core = core.dropna(subset=["team_name"]).copy()
-    core["score"] = core["action_label"].apply(score_action)
+    core["score"] = polarity_index(POSITIVE, NEGATIVE, mode=SUBSTRING).score(core["action_label"])
 
     # match duration proxy (max t_start per half)
     dur = core.groupby("half")["t_start"].max().fillna(0).to_dict()
@@ -56,7 +46,7 @@ def main():
     summary["pass_eff_proxy"] = summary["pos_actions"] / (summary["pos_actions"] + summary["neg_actions"]).replace(0, 1)
 
     # phase file aggregates (per team bins)
-    ph = pd.read_csv(PHASE)
+    ph = read_csv_cached(PHASE)
     # possession proxy average over bins
     poss = ph.groupby("team_name")["possession_share_proxy"].mean().reset_index()
     poss = poss.rename(columns={"possession_share_proxy":"possession_share_proxy_mean"})
@@ -1,5 +1,5 @@
 import json
-import pandas as pd
+from tools._shared import read_csv_cached
 
 SRC = "artifacts/registry/city_gs_action_labels.csv"
 OUT = "artifacts/registry/city_gs_polarity_suggest.json"
@@ -21,7 +21,7 @@ def has_any(s, kws):
     return any(k in s for k in kws)
 
 def main():
-    df = pd.read_csv(SRC)
+    df = read_csv_cached(SRC)
     df["label"] = df["action_label"].astype(str)
     df = df.sort_values("count", ascending=False).reset_index(drop=True)
 